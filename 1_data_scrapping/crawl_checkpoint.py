@@ -0,0 +1,325 @@
+"""SQLite checkpoint store for crawls: per-page status, exact resume, page claims
+
+One row per (product, page):
+
+    status      claimed (in flight) | done | empty | failed
+    reviews     reviews the page yielded
+    sha256      content hash of the page HTML (see page_store.py)
+    worker      who claimed / finished it
+    updated_at  unix time of the last change
+
+A page becomes done/empty only in the same step that persists its reviews
+(save_to_csv), so a crash re-fetches just the pages that were claimed but not
+yet saved. Claims are taken inside BEGIN IMMEDIATE transactions, so several
+scraper processes can walk the same page range and each page goes to exactly
+one of them; a claim older than `lease` seconds (its worker died) can be taken
+over. Claims of this host's workers whose process is gone (a crashed run;
+worker ids are hostname:pid) are dropped on startup, so a re-run on the same
+machine does not wait out their lease. lease_iter goes further for sharded
+crawls (sharded_crawl.py): live workers renew() their claims, and expired or
+failed pages anywhere in the range are re-claimed before new ones, so a dead
+worker's pages are crawled by the others.
+
+The same database carries each host's politeness budget across processes:
+one row per host with the unix time of its next free request slot and any
+Retry-After hold. claim_slot() reserves the next slot in a BEGIN IMMEDIATE
+transaction (see polite_fetch.SharedSlotLimiter), so N workers together send
+one scraper's request rate. Across machines this relies on their clocks
+being in sync (NTP).
+
+Usage:
+    python crawl_checkpoint.py           # status counts and resume page per product
+"""
+
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'crawl_state.sqlite')
+FINISHED = ('done', 'empty')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    product    TEXT    NOT NULL,
+    page       INTEGER NOT NULL,
+    status     TEXT    NOT NULL,
+    reviews    INTEGER NOT NULL DEFAULT 0,
+    sha256     TEXT,
+    worker     TEXT,
+    updated_at REAL    NOT NULL,
+    PRIMARY KEY (product, page)
+)
+"""
+
+HOST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS host_slots (
+    host          TEXT PRIMARY KEY,
+    next_slot     REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def worker_exited(worker):
+    """True if `worker` is a hostname:pid id of this host whose process no longer exists"""
+    host, _, pid = worker.rpartition(':')
+    # Other hosts can't be checked, and on Windows signal 0 is CTRL_C_EVENT
+    if host != socket.gethostname() or not pid.isdigit() or os.name == 'nt':
+        return False
+    if int(pid) == os.getpid():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass  # exists but belongs to another user
+    return False
+
+
+class CrawlCheckpoint:
+    def __init__(self, product, path=DEFAULT_DB, worker=None, lease=900, wal=True):
+        self.product = product
+        self.path = path
+        self.worker = worker or default_worker_id()
+        self.lease = lease  # seconds before another worker may take over a claim
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        # WAL needs shared memory between the processes, i.e. one host; on a shared
+        # (network) filesystem the rollback journal's file locks are what coordinate
+        self.db.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(SCHEMA)
+        self.db.execute(HOST_SCHEMA)
+        self.release_exited()
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction holding the database lock from the first read"""
+        with self._lock:
+            self.db.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.db
+            except BaseException:
+                self.db.execute('ROLLBACK')
+                raise
+            self.db.execute('COMMIT')
+
+    def claim(self, pages):
+        """Claim the given pages for this worker; returns those that were free, in input order"""
+        pages = [int(p) for p in pages]
+        if not pages:
+            return []
+        with self._transaction() as db:
+            now = time.time()
+            placeholders = ','.join('?' * len(pages))
+            rows = db.execute(
+                f"SELECT page, status, worker, updated_at FROM pages WHERE product = ? AND page IN ({placeholders})",
+                [self.product, *pages]).fetchall()
+            taken = {page: (status, worker, updated_at) for page, status, worker, updated_at in rows}
+
+            claimed = []
+            for page in pages:
+                row = taken.get(page)
+                if row is not None:
+                    status, worker, updated_at = row
+                    if status in FINISHED:
+                        continue
+                    if status == 'claimed' and worker != self.worker and updated_at > now - self.lease:
+                        continue
+                claimed.append(page)
+
+            db.executemany(
+                "INSERT OR REPLACE INTO pages (product, page, status, reviews, sha256, worker, updated_at) "
+                "VALUES (?, ?, 'claimed', 0, NULL, ?, ?)",
+                [(self.product, page, self.worker, now) for page in claimed])
+        return claimed
+
+    def claim_iter(self, pages, batch=1):
+        """Lazily claim pages `batch` at a time as the caller consumes them, skipping finished/foreign ones"""
+        pages = iter(pages)
+        while True:
+            chunk = list(islice(pages, batch))
+            if not chunk:
+                return
+            yield from self.claim(chunk)
+
+    def claim_stale(self, exclude=()):
+        """Claim the lowest page whose lease expired (dead worker) or that failed; None if there is none"""
+        with self._transaction() as db:
+            now = time.time()
+            rows = db.execute(
+                "SELECT page FROM pages WHERE product = ? AND (status = 'failed' OR "
+                "(status = 'claimed' AND worker != ? AND updated_at <= ?)) ORDER BY page LIMIT ?",
+                (self.product, self.worker, now - self.lease, len(exclude) + 1)).fetchall()
+            page = next((page for (page,) in rows if page not in exclude), None)
+            if page is not None:
+                db.execute("UPDATE pages SET status = 'claimed', worker = ?, updated_at = ? "
+                           "WHERE product = ? AND page = ?", (self.worker, now, self.product, page))
+        return page
+
+    def renew(self):
+        """Heartbeat: extend the lease on every page this worker holds"""
+        with self._transaction() as db:
+            db.execute("UPDATE pages SET updated_at = ? WHERE product = ? AND worker = ? AND status = 'claimed'",
+                       (time.time(), self.product, self.worker))
+
+    def active_workers(self):
+        """{worker: claimed pages} for workers whose leases have not expired"""
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT worker, COUNT(*) FROM pages WHERE product = ? AND status = 'claimed' AND updated_at > ? "
+                "GROUP BY worker", (self.product, time.time() - self.lease)).fetchall()
+        return dict(rows)
+
+    def lease_iter(self, pages, poll=5.0):
+        """claim_iter for shared work queues: expired/failed pages first, then new ones in order.
+
+        Once `pages` runs out, keeps polling while other workers hold live
+        leases, so pages a worker dies on are still picked up. Each page is
+        handed out at most once per call (a page that fails here is left to
+        the other workers or the next run).
+        """
+        tried = set()
+
+        def stale():
+            while True:
+                page = self.claim_stale(tried)
+                if page is None:
+                    return
+                tried.add(page)
+                yield page
+
+        for page in pages:
+            yield from stale()
+            if page in tried:
+                continue
+            for claimed in self.claim([page]):
+                tried.add(claimed)
+                yield claimed
+        while True:
+            yield from stale()
+            if not set(self.active_workers()) - {self.worker}:
+                return
+            time.sleep(poll)
+
+    def claim_slot(self, host, spacing, not_before=0.0):
+        """Reserve the host's next request slot for this worker; returns its unix time.
+
+        Slots are handed out at least `spacing` seconds apart across every
+        process sharing the database, and never before a Retry-After hold.
+        """
+        with self._transaction() as db:
+            now = time.time()
+            row = db.execute("SELECT next_slot, blocked_until FROM host_slots WHERE host = ?", (host,)).fetchone()
+            next_slot, blocked_until = row or (0.0, 0.0)
+            slot = max(now, next_slot, blocked_until, not_before)
+            db.execute("INSERT INTO host_slots (host, next_slot) VALUES (?, ?) "
+                       "ON CONFLICT (host) DO UPDATE SET next_slot = excluded.next_slot",
+                       (host, slot + spacing))
+        return slot
+
+    def block_host(self, host, until):
+        """Hold every worker's requests to `host` until unix time `until` (a Retry-After)"""
+        with self._transaction() as db:
+            db.execute("INSERT INTO host_slots (host, next_slot, blocked_until) VALUES (?, 0, ?) "
+                       "ON CONFLICT (host) DO UPDATE SET blocked_until = MAX(blocked_until, excluded.blocked_until)",
+                       (host, until))
+
+    def complete(self, results):
+        """Mark (page, review_count, sha256) results finished: done if it had reviews, else empty"""
+        if not results:
+            return
+        with self._transaction() as db:
+            now = time.time()
+            db.executemany(
+                "INSERT OR REPLACE INTO pages (product, page, status, reviews, sha256, worker, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(self.product, int(page), 'done' if count else 'empty', int(count), digest, self.worker, now)
+                 for page, count, digest in results])
+
+    def fail(self, page):
+        """Record a page that could not be fetched; it stays claimable"""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE pages SET status = 'failed', updated_at = ? WHERE product = ? AND page = ? AND worker = ?",
+                (time.time(), self.product, int(page), self.worker))
+
+    def release(self):
+        """Drop this worker's unfinished claims (clean shutdown / interrupt)"""
+        with self._transaction() as db:
+            db.execute("DELETE FROM pages WHERE product = ? AND worker = ? AND status = 'claimed'",
+                       (self.product, self.worker))
+
+    def release_exited(self):
+        """Drop the unfinished claims of this host's exited workers; returns those worker ids"""
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT DISTINCT worker FROM pages WHERE product = ? AND status = 'claimed' AND worker LIKE ?",
+                (self.product, f"{socket.gethostname()}:%")).fetchall()
+            exited = [worker for (worker,) in rows if worker_exited(worker)]
+            db.executemany("DELETE FROM pages WHERE product = ? AND worker = ? AND status = 'claimed'",
+                           [(self.product, worker) for worker in exited])
+        return exited
+
+    def seed(self, resume_page):
+        """Record pages before resume_page as done, for crawls started before this database existed"""
+        with self._transaction() as db:
+            db.executemany(
+                "INSERT OR IGNORE INTO pages (product, page, status, reviews, sha256, worker, updated_at) "
+                "VALUES (?, ?, 'done', 0, NULL, 'legacy', ?)",
+                [(self.product, page, time.time()) for page in range(1, resume_page)])
+
+    def has_history(self):
+        row = self.db.execute("SELECT 1 FROM pages WHERE product = ? LIMIT 1", (self.product,)).fetchone()
+        return row is not None
+
+    def resume_page(self, start=1):
+        """First page >= start that is not finished (exact: gaps left by failures are revisited)"""
+        finished = self.db.execute(
+            f"SELECT page FROM pages WHERE product = ? AND page >= ? AND status IN {FINISHED} ORDER BY page",
+            (self.product, start))
+        page = start
+        for (done_page,) in finished:
+            if done_page != page:
+                break
+            page += 1
+        return page
+
+    def counts(self, worker=None):
+        """{status: (pages, reviews)} for this product, or one worker's pages (safe to poll from another thread)"""
+        query = "SELECT status, COUNT(*), SUM(reviews) FROM pages WHERE product = ?"
+        params = (self.product,)
+        if worker is not None:
+            query += " AND worker = ?"
+            params += (worker,)
+        with self._lock:
+            rows = self.db.execute(query + " GROUP BY status", params).fetchall()
+        return {status: (pages, reviews or 0) for status, pages, reviews in rows}
+
+    def close(self):
+        self.db.close()
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DB
+    if not os.path.exists(path):
+        print(f"No checkpoint database at {path}")
+        sys.exit(0)
+    db = sqlite3.connect(path)
+    for (product,) in db.execute("SELECT DISTINCT product FROM pages ORDER BY product").fetchall():
+        checkpoint = CrawlCheckpoint(product, path)
+        counts = checkpoint.counts()
+        summary = ', '.join(f"{status}={pages}" for status, (pages, _) in sorted(counts.items()))
+        reviews = sum(r for _, r in counts.values())
+        print(f"{product}: {summary}; {reviews} reviews; resume at page {checkpoint.resume_page()}")
+        checkpoint.close()
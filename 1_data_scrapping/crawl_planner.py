@@ -0,0 +1,58 @@
+"""Plan a crawl from the product's review count instead of probing for the end
+
+Every review page shows the product's total ("6,583 Reviews"), and Flipkart
+lists 10 reviews per page, so the first page fetched is enough to know the
+last page. Past the last page Flipkart keeps serving the final page's reviews,
+so a page whose reviews fingerprint the same as the page before also marks the
+end, without waiting for 5 empty pages.
+"""
+
+import hashlib
+import math
+
+from review_extractor import find_review_count
+
+REVIEWS_PER_PAGE = 10
+# One extra page absorbs reviews posted while the crawl is running; if it is
+# past the end it repeats the last page and is caught by the fingerprint check
+MARGIN_PAGES = 1
+
+
+class CrawlPlan:
+    def __init__(self, total_reviews, per_page=REVIEWS_PER_PAGE, margin=MARGIN_PAGES):
+        self.total_reviews = total_reviews
+        self.last_page = max(1, math.ceil(total_reviews / per_page)) + margin
+
+    @classmethod
+    def from_html(cls, html):
+        """Plan from any review page of the product, or None if it shows no count"""
+        total = find_review_count(html)
+        return cls(total) if total else None
+
+    def __repr__(self):
+        return f"CrawlPlan(total_reviews={self.total_reviews}, last_page={self.last_page})"
+
+
+def planned_pages(page_range, get_plan):
+    """Walk page_range, dropping pages past the plan's last page once a plan is known.
+
+    get_plan is called per page, so a plan found by an early fetch bounds the
+    pages queued after it. Forward ranges stop there; reverse ranges skip ahead.
+    """
+    for page in page_range:
+        plan = get_plan()
+        if plan is not None and page > plan.last_page:
+            if page_range.step > 0:
+                return
+            continue
+        yield page
+
+
+def review_fingerprint(reviews):
+    """Hash of a page's reviews (rating, title, text), or None for a page without any"""
+    if not reviews:
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    for review in reviews:
+        h.update(f"{review['rating']}\x1f{review['title']}\x1f{review['review_text']}\x1e".encode('utf-8'))
+    return h.hexdigest()
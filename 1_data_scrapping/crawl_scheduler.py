@@ -0,0 +1,202 @@
+"""Crawl several registered products in one process over one keep-alive pool
+
+Each product (see products.py) gets its own scraper and a crawl thread;
+every session mounts the same HTTPAdapter, so all products reuse one pool of
+keep-alive connections.
+
+All products on a host are paced by that host's one shared rate controller
+(polite_fetch.shared_limiter), starting from the slowest page_delay among
+them: the site sees the load of a single scraper however many products are
+tracked. Interleaving products hides each one's parse/save time behind the
+others' waits rather than adding requests.
+
+Output files stay in each product's folder whatever the working directory.
+Ctrl+C stops every crawl after its current page and saves what was fetched.
+
+Usage:
+    python crawl_scheduler.py                          # every registered product
+    python crawl_scheduler.py iphone15 iqoo_z10 --workers 2
+    python crawl_scheduler.py --telemetry              # per-page stage timings (crawl_telemetry.py)
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+
+from crawl_checkpoint import CrawlCheckpoint
+from crawl_telemetry import TELEMETRY_FILENAME, CrawlTelemetry
+from page_store import PageStore
+from flipkart_scraper import FlipkartScraper
+from polite_fetch import PoliteSession, shared_limiter
+from products import PRODUCTS
+
+
+class ProductCrawl:
+    """One product's scraper and the outcome of its crawl thread"""
+
+    def __init__(self, product, scraper):
+        self.product = product
+        self.scraper = scraper
+        self.start_counts = scraper.checkpoint.counts()
+        self.total = None  # reviews in the product's CSV once finished
+        self.error = None
+        self.seconds = 0.0
+        self.thread = None
+        # Waited on instead of Thread.join, which Ctrl+C can leave returning early
+        self.finished = threading.Event()
+
+    def progress(self):
+        """(pages, reviews) finished by this run so far"""
+        counts = self.scraper.checkpoint.counts()
+        pages = reviews = 0
+        for status in ('done', 'empty'):
+            now_pages, now_reviews = counts.get(status, (0, 0))
+            old_pages, old_reviews = self.start_counts.get(status, (0, 0))
+            pages += now_pages - old_pages
+            reviews += now_reviews - old_reviews
+        return pages, reviews
+
+
+class CrawlScheduler:
+    def __init__(self, products, workers=1, delay=None,
+                 workdir=None, checkpoint_path=None, page_store=None, telemetry=False):
+        """products: Product entries to crawl together.
+
+        workers: pages in flight per product. delay: (min, max) starting
+        spacing of each host's controller instead of its products' slowest
+        page_delay.
+        workdir / checkpoint_path / page_store redirect all output (benchmarks
+        and tests); by default each product writes into its own folder.
+        telemetry: write each product's per-page timings to its folder.
+        """
+        self.workers = workers
+        # One pool for every session: a connection per page in flight per product
+        pool_size = max(10, len(products) * workers)
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.page_store = page_store or PageStore()
+        self.crawls = []
+        self.seconds = 0.0
+        host_delays = {}
+        for product in products:
+            host_delays[product.host] = max(host_delays.get(product.host, product.page_delay), product.page_delay)
+        for product in products:
+            limiter = shared_limiter(product.host, *(delay or host_delays[product.host]))
+            session = PoliteSession(rate_limiter=limiter, adapter=self.adapter)
+            product_dir = os.path.join(workdir, product.folder) if workdir else product.directory
+            os.makedirs(product_dir, exist_ok=True)
+            scraper = FlipkartScraper(product, session=session, workdir=product_dir)
+            scraper.page_store = self.page_store  # one index writer for the whole process
+            if checkpoint_path:
+                scraper.checkpoint.close()
+                scraper.checkpoint = CrawlCheckpoint(product.key, checkpoint_path)
+            if telemetry:
+                scraper.telemetry = CrawlTelemetry(product.key, os.path.join(product_dir, TELEMETRY_FILENAME))
+            self.crawls.append(ProductCrawl(product, scraper))
+
+    def _crawl(self, crawl):
+        scraper = crawl.scraper
+        started = time.monotonic()
+        scraper.log_progress("=" * 60)
+        scraper.log_progress(f"Scheduler crawl started ({len(self.crawls)} products in this process)")
+        try:
+            start_page = scraper.resume_page()
+            scraper.scrape_reviews(crawl.product.url, max_pages=crawl.product.max_pages,
+                                   start_page=start_page, workers=self.workers)
+            crawl.total = scraper.finish_crawl()
+        except Exception as e:
+            crawl.error = e
+            scraper.log_progress(f"Fatal error: {str(e)}")
+            if scraper.writer is not None:
+                scraper.writer.close()  # pages already handed over still get written
+        finally:
+            # Unsaved in-flight pages go back to the pool for the next run
+            scraper.checkpoint.release()
+            if scraper.telemetry is not None:
+                scraper.telemetry.close()
+            crawl.seconds = time.monotonic() - started
+            crawl.finished.set()
+
+    def status_line(self):
+        parts = []
+        for crawl in self.crawls:
+            pages, reviews = crawl.progress()
+            state = '' if not crawl.finished.is_set() else (' failed' if crawl.error else ' done')
+            parts.append(f"{crawl.product.key} {pages}p/{reviews}r{state}")
+        return ' | '.join(parts)
+
+    def run(self, status_every=30, verbose=False, out=None):
+        """Crawl every product to the end (or Ctrl+C); returns the ProductCrawl list.
+
+        The scrapers' own per-page console output is muted unless verbose;
+        they still log to simple_save.txt in their folders. A status line per
+        product goes to `out` every status_every seconds.
+        """
+        out = out or sys.stdout
+        started = time.monotonic()
+        with open(os.devnull, 'w') as devnull:
+            with contextlib.redirect_stdout(sys.stdout if verbose else devnull):
+                for crawl in self.crawls:
+                    crawl.thread = threading.Thread(target=self._crawl, args=(crawl,),
+                                                    name=f"crawl-{crawl.product.key}", daemon=True)
+                    crawl.thread.start()
+                try:
+                    next_status = time.monotonic() + status_every
+                    for crawl in self.crawls:
+                        while not crawl.finished.wait(timeout=min(1.0, status_every)):
+                            if time.monotonic() >= next_status:
+                                print(f"[{time.monotonic() - started:6.0f}s] {self.status_line()}", file=out)
+                                next_status += status_every
+                except KeyboardInterrupt:
+                    print("\n⚠ Interrupted! Finishing current pages and saving...", file=out)
+                    for crawl in self.crawls:
+                        crawl.scraper.stop.set()
+                    for crawl in self.crawls:
+                        crawl.finished.wait()
+        self.seconds = time.monotonic() - started
+        return self.crawls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl several products in one process")
+    parser.add_argument('products', nargs='*',
+                        help=f"products to crawl: {', '.join(sorted(PRODUCTS))} (default: all)")
+    parser.add_argument('--workers', type=int, default=1, help="pages in flight per product")
+    parser.add_argument('--telemetry', action='store_true',
+                        help=f"record per-page stage timings to each product's {TELEMETRY_FILENAME}")
+    parser.add_argument('--status-every', type=float, default=30, help="seconds between status lines")
+    parser.add_argument('--verbose', action='store_true', help="show every scraper's per-page output")
+    args = parser.parse_args()
+    unknown = sorted(set(args.products) - set(PRODUCTS))
+    if unknown:
+        parser.error(f"unknown products: {', '.join(unknown)}")
+
+    products = [PRODUCTS[key] for key in (args.products or sorted(PRODUCTS))]
+    print("=" * 60)
+    print("FLIPKART CRAWL SCHEDULER")
+    print("=" * 60)
+    print(f"Products: {', '.join(p.key for p in products)} "
+          f"({args.workers} in flight each, one shared budget per host)\n")
+
+    scheduler = CrawlScheduler(products, workers=args.workers, telemetry=args.telemetry)
+    crawls = scheduler.run(status_every=args.status_every, verbose=args.verbose)
+
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}")
+    total_pages = 0
+    for crawl in crawls:
+        pages, reviews = crawl.progress()
+        total_pages += pages
+        outcome = f"error: {crawl.error}" if crawl.error else f"{crawl.total} reviews in {crawl.scraper.csv_path}"
+        print(f"{crawl.product.key}: {pages} pages, {reviews} new reviews in {crawl.seconds:.0f}s -> {outcome}")
+    rate = total_pages * 60.0 / scheduler.seconds if scheduler.seconds else 0.0
+    print(f"\n⏱ Combined rate: {rate:.2f} pages/min across {len(crawls)} products")
+
+
+if __name__ == '__main__':
+    main()
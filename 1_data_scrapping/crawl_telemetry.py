@@ -0,0 +1,359 @@
+"""Per-page crawl telemetry: where each page's time went, as JSON lines and Prometheus metrics
+
+Every page a scraper finishes gets one record:
+
+    wait       time spent waiting for the rate controller's next slot
+    dns        name resolution for new connections (0 on a reused keep-alive connection)
+    connect    TCP connect + TLS handshake for new connections
+    ttfb       request sent -> response headers, minus dns/connect
+    download   response headers -> body read
+    parse      HTML -> review dicts, minus the cleaning inside it
+    clean      PII scrubbing of the accepted cards' titles and bodies
+    dedup      cross-page dedup (review index, near-duplicate index)
+    save       waiting to hand the page to the background writer (slow disk)
+    bytes, reviews, retries, status
+
+Retried requests add up into the page's record. Timings are collected
+through a thread-local "current page" so the layers that do the work
+(PoliteSession, the pooled connections, the scraper's parse step) record into
+it without being handed anything; with no page active they do nothing. Under
+--parse-processes parsing and cleaning happen in worker processes and are
+not recorded here (the pipeline prints its own per-stage report).
+
+Records go to a JSON-lines file through a buffered writer (one open file,
+flushed every FLUSH_EVERY pages and on close); a Prometheus textfile with
+per-stage quantiles over the last WINDOW pages and running totals is
+rewritten atomically at every flush, for node_exporter's textfile collector.
+
+Summary of one or more telemetry files (default: every product's):
+    python crawl_telemetry.py
+    python crawl_telemetry.py iphone15/crawl_telemetry.jsonl --by status
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+STAGES = ('wait', 'dns', 'connect', 'ttfb', 'download', 'parse', 'clean', 'dedup', 'save')
+COUNTERS = ('bytes', 'retries')
+# What an operator wants to know: which of these a page spends its time in
+STAGE_GROUPS = {
+    'politeness': ('wait',),
+    'network': ('dns', 'connect', 'ttfb', 'download'),
+    'parse': ('parse', 'clean', 'dedup'),
+    'I/O': ('save',),  # backpressure from review_writer.BackgroundWriter
+}
+TELEMETRY_FILENAME = 'crawl_telemetry.jsonl'
+FLUSH_EVERY = 20  # pages
+WINDOW = 1000  # pages the Prometheus quantiles are computed over
+QUANTILES = (0.5, 0.95)
+
+_local = threading.local()
+
+
+class PageTiming:
+    """Accumulated stage seconds and counters of one page"""
+
+    __slots__ = ('page', 'started', 'stages', 'counts')
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.time()
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.counts = dict.fromkeys(COUNTERS, 0)
+
+    def add(self, stage, seconds):
+        self.stages[stage] += seconds
+
+    def count(self, name, n=1):
+        self.counts[name] += n
+
+    def record(self, product, status, reviews):
+        stages = dict(self.stages)
+        # ttfb comes from response.elapsed and parse from around extraction: both include the inner stages
+        stages['ttfb'] = max(0.0, stages['ttfb'] - stages['dns'] - stages['connect'])
+        stages['parse'] = max(0.0, stages['parse'] - stages['clean'])
+        return {'ts': round(self.started, 3), 'product': product, 'page': self.page, 'status': status,
+                **{stage: round(seconds, 6) for stage, seconds in stages.items()},
+                **self.counts, 'reviews': reviews}
+
+
+def current():
+    """The PageTiming active in this thread, or None"""
+    return getattr(_local, 'timing', None)
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Add the time spent in the block to the current page's `name` stage"""
+    timing = current()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
+
+
+def count_event(name, n=1):
+    """Bump a counter (bytes, retries) of the current page"""
+    timing = current()
+    if timing is not None:
+        timing.count(name, n)
+
+
+def record_response(response, seconds):
+    """PoliteSession hook: split one request's time into ttfb and download, count its bytes"""
+    timing = current()
+    if timing is None:
+        return
+    ttfb = response.elapsed.total_seconds()
+    timing.add('ttfb', ttfb)
+    timing.add('download', max(0.0, seconds - ttfb))
+    timing.count('bytes', len(response.content))
+
+
+class _TimedConnectionMixin:
+    """Times name resolution and connection setup into the current page, if there is one"""
+
+    def _new_conn(self):
+        timing = current()
+        if timing is None:
+            return super()._new_conn()
+        started = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(self._dns_host, self.port, type=socket.SOCK_STREAM)[0][4][0]
+        except OSError:
+            address = None  # let urllib3 resolve it and raise its own error
+        self._dns_seconds = time.perf_counter() - started
+        timing.add('dns', self._dns_seconds)
+        if address is None:
+            return super()._new_conn()
+        # Connect to the address just resolved; TLS and Host still use the hostname
+        dns_host = self._dns_host
+        self._dns_host = address
+        try:
+            return super()._new_conn()
+        except OSError:
+            self._dns_host = dns_host
+            return super()._new_conn()  # every address, as without telemetry
+        finally:
+            self._dns_host = dns_host
+
+    def connect(self):
+        timing = current()
+        if timing is None:
+            return super().connect()
+        self._dns_seconds = 0.0
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            timing.add('connect', time.perf_counter() - started - self._dns_seconds)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+def instrument_adapter(adapter):
+    """Make an HTTPAdapter's new connections report dns/connect time (idempotent)"""
+    # A new dict: the default one is urllib3's module-level table
+    adapter.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool,
+                                                  'https': TimedHTTPSConnectionPool}
+    return adapter
+
+
+def percentile(values, q):
+    """Linear-interpolated quantile of a non-empty sorted list"""
+    position = (len(values) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+class CrawlTelemetry:
+    """One product's per-page records: buffered JSON lines plus a Prometheus textfile"""
+
+    def __init__(self, product, path=TELEMETRY_FILENAME, prom_path=None, flush_every=FLUSH_EVERY):
+        self.product = product
+        self.path = path
+        self.prom_path = prom_path or f"{os.path.splitext(path)[0]}.prom"
+        self.flush_every = flush_every
+        self._file = open(path, 'a', encoding='utf-8', buffering=1 << 16)
+        self._lock = threading.Lock()
+        self._open = {}  # page -> PageTiming, from first fetch until finish()
+        self._unflushed = 0
+        self.recent = {name: deque(maxlen=WINDOW) for name in STAGES}
+        self.totals = {name: 0.0 for name in STAGES}
+        self.counters = {'pages': {}, 'bytes': 0, 'retries': 0, 'reviews': 0}
+
+    def timing(self, page):
+        with self._lock:
+            timing = self._open.get(page)
+            if timing is None:
+                timing = self._open[page] = PageTiming(page)
+            return timing
+
+    @contextlib.contextmanager
+    def activate(self, page):
+        """Make this page's record the current one in this thread for the block"""
+        previous = current()
+        _local.timing = self.timing(page)
+        try:
+            yield _local.timing
+        finally:
+            _local.timing = previous
+
+    def finish(self, page, status, reviews=0):
+        """Write the page's record (status: done, empty, failed or repeat)"""
+        with self._lock:
+            timing = self._open.pop(page, None) or PageTiming(page)
+            record = timing.record(self.product, status, reviews)
+            self._file.write(json.dumps(record) + '\n')
+            for name in STAGES:
+                self.recent[name].append(record[name])
+                self.totals[name] += record[name]
+            pages = self.counters['pages']
+            pages[status] = pages.get(status, 0) + 1
+            self.counters['bytes'] += record['bytes']
+            self.counters['retries'] += record['retries']
+            self.counters['reviews'] += reviews
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._flush()
+        return record
+
+    def _flush(self):
+        self._file.flush()
+        self._unflushed = 0
+        self.write_prometheus()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def write_prometheus(self):
+        """Rewrite the textfile atomically: stage summaries over the last WINDOW pages and totals"""
+        label = f'product="{self.product}"'
+        lines = ['# HELP flipkart_crawl_stage_seconds Per-page time spent in each crawl stage',
+                 '# TYPE flipkart_crawl_stage_seconds summary']
+        for name in STAGES:
+            values = sorted(self.recent[name])
+            if values:
+                for q in QUANTILES:
+                    lines.append(f'flipkart_crawl_stage_seconds{{{label},stage="{name}",quantile="{q}"}} '
+                                 f'{percentile(values, q):.6f}')
+            lines.append(f'flipkart_crawl_stage_seconds_sum{{{label},stage="{name}"}} {self.totals[name]:.6f}')
+            lines.append(f'flipkart_crawl_stage_seconds_count{{{label},stage="{name}"}} '
+                         f'{sum(self.counters["pages"].values())}')
+        lines += ['# HELP flipkart_crawl_pages_total Pages finished, by outcome',
+                  '# TYPE flipkart_crawl_pages_total counter']
+        for status, n in sorted(self.counters['pages'].items()):
+            lines.append(f'flipkart_crawl_pages_total{{{label},status="{status}"}} {n}')
+        for name, help_text in (('bytes', 'Response bytes downloaded'), ('retries', 'Request retries'),
+                                ('reviews', 'Reviews accepted')):
+            lines += [f'# HELP flipkart_crawl_{name}_total {help_text}',
+                      f'# TYPE flipkart_crawl_{name}_total counter',
+                      f'flipkart_crawl_{name}_total{{{label}}} {self.counters[name]}']
+        tmp = f"{self.prom_path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp, self.prom_path)
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush()
+            self._file.close()
+
+
+def load_records(paths):
+    frames = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            # A crash can leave a torn last line; skip anything that doesn't parse
+            rows = []
+            for line in f:
+                with contextlib.suppress(ValueError):
+                    rows.append(json.loads(line))
+        frames.append(pd.DataFrame(rows))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def summarize(records, by='product'):
+    """p50/p95/mean milliseconds and share of page time per stage, for each `by` group"""
+    rows = []
+    for key, group in records.groupby(by):
+        total = group[list(STAGES)].sum().sum()
+        for name in STAGES:
+            values = group[name] * 1000
+            rows.append({by: key, 'stage': name, 'pages': len(group),
+                         'p50_ms': round(values.quantile(0.5), 2), 'p95_ms': round(values.quantile(0.95), 2),
+                         'mean_ms': round(values.mean(), 2),
+                         'share_%': round(100 * group[name].sum() / total, 1) if total else 0.0})
+    return pd.DataFrame(rows)
+
+
+def bound_by(records):
+    """Stage group (politeness, network, parse, I/O) holding the largest share of page time"""
+    totals = {group: records[list(stages)].sum().sum() for group, stages in STAGE_GROUPS.items()}
+    return max(totals, key=totals.get), totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="p50/p95 per crawl stage from the scrapers' telemetry files")
+    parser.add_argument('files', nargs='*', help=f"telemetry files (default: every product's {TELEMETRY_FILENAME})")
+    parser.add_argument('--by', default='product', choices=['product', 'status'], help="group rows by")
+    args = parser.parse_args()
+
+    paths = args.files
+    if not paths:
+        from products import PRODUCTS
+        paths = [os.path.join(p.directory, TELEMETRY_FILENAME) for p in PRODUCTS.values()]
+        paths = [path for path in paths if os.path.exists(path)]
+    records = load_records(paths)
+    if records.empty:
+        print("No telemetry records found (run a scraper with --telemetry)")
+        return
+
+    print("=" * 60)
+    print("CRAWL TELEMETRY")
+    print("=" * 60)
+    print(f"{len(records)} pages from {len(paths)} files, "
+          f"{records['bytes'].sum() / 1e6:.1f} MB, {int(records['retries'].sum())} retries\n")
+    print(summarize(records, args.by).to_string(index=False))
+    print()
+    for product, group in records.groupby('product'):
+        group_name, totals = bound_by(group)
+        total = sum(totals.values())
+        shares = ', '.join(f"{name} {100 * seconds / total:.0f}%" for name, seconds in totals.items()) if total else '-'
+        print(f"{product}: {group_name}-bound ({shares})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,753 @@
+"""Flipkart review scraper engine shared by every tracked product
+
+One FlipkartScraper crawls one registered product (products.py): the URL,
+CSV name, columns and politeness delay come from the registry, everything
+else - fetching under the host's rate controller, parsing, PII cleaning,
+cross-page dedup, journaled saving, resume from the checkpoint database -
+is the same code for every product. Each product folder's simple_scraper.py
+runs main() for its product.
+
+Usage:
+    python flipkart_scraper.py iphone16 --workers 2
+    python flipkart_scraper.py iqoo_z10 --replay
+"""
+
+import argparse
+import requests
+import pandas as pd
+import time
+import re
+import os
+import sys
+import threading
+import contextlib
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, '2_dataset_final_folder'))
+import clean_names  # name rules and lexicon for the PII scrubber
+from review_index import ReviewKeyIndex, make_review_key
+from review_journal import ReviewJournal
+from review_writer import BackgroundWriter
+from review_extractor import find_state_reviews, find_structured_cards, iter_div_texts, make_soup, response_time
+from pii_scrubber import default_scrubber
+from polite_fetch import ConcurrentPageFetcher, PoliteSession, pages_per_minute, shared_limiter
+from page_store import PageStore, replay_pages
+from parse_pipeline import ParsePipeline
+from near_duplicates import NearDuplicateIndex
+from crawl_telemetry import TELEMETRY_FILENAME, CrawlTelemetry, count_event, stage
+from crawl_checkpoint import CrawlCheckpoint
+from crawl_planner import CrawlPlan, planned_pages, review_fingerprint
+from products import PRODUCTS
+from stream_scoring import DEFAULT_METHODS, METHOD_KEYS, StreamingScorer, print_report
+
+# Lines of a text card that are never its title or body
+NOISE_KEYWORDS = ['Certified Buyer', 'Verified Purchase', 'Report Abuse',
+                  'Permalink', 'Helpful', 'READ MORE', 'Review for Color',
+                  'Storage', 'ratings and', 'reviews', 'Flipkart Customer',
+                  'by', 'reviewed', 'writes', 'says', 'posted', 'ago',
+                  'month', 'months', 'week', 'weeks', 'day', 'days', 'year', 'years']
+NOISE_RE = re.compile('|'.join(map(re.escape, NOISE_KEYWORDS)))
+TIME_AGO_RE = re.compile(r'\d+\s*(month|week|day|year|hour)s?\s*ago', re.IGNORECASE)
+
+
+class OfflineParser:
+    """Picklable parser factory for replay and parse-pipeline workers.
+
+    Worker processes cache one parser per factory, so factories of the same
+    product compare (and hash) equal.
+    """
+
+    def __init__(self, product_key):
+        self.product_key = product_key
+
+    def __call__(self):
+        return FlipkartScraper.offline_parser(self.product_key)
+
+    def __eq__(self, other):
+        return isinstance(other, OfflineParser) and other.product_key == self.product_key
+
+    def __hash__(self):
+        return hash(self.product_key)
+
+
+class FlipkartScraper:
+    USER_AGENTS = [
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0'
+    ]
+    
+    def __init__(self, product, session=None, workdir=None, state_dir=None):
+        """product: a products.Product or its registry key"""
+        self.product = PRODUCTS[product] if isinstance(product, str) else product
+        # Paced by the host's shared rate controller (see polite_fetch.AdaptiveRateLimiter);
+        # crawl_scheduler.py passes its own so every product shares one connection pool
+        self.session = session or PoliteSession(rate_limiter=shared_limiter(self.product.host, *self.product.page_delay))
+        # Files are relative to the working directory when one is given (shards, benchmarks)
+        self.workdir = self.product.directory if workdir is None else workdir
+        self.csv_path = os.path.join(self.workdir, self.product.csv_filename)
+        self.current_ua_index = 0
+        self.reviews = []
+        self.progress_file = os.path.join(self.workdir, 'simple_save.txt')
+        self.last_successful_page = None
+        self.consecutive_empty = 0
+        # Checkpoints go to an append-only journal; leftover segments from a
+        # crashed run are merged back into the CSV before anything else reads it
+        self.journal = ReviewJournal(self.csv_path, columns=self.product.columns)
+        self.journal.compact()
+        self.total_in_file = self.journal.count()
+        self.network_errors = 0
+        # Dedup index is loaded once here and updated as reviews are accepted
+        self.review_index = ReviewKeyIndex(self.csv_path)
+        # The page store and checkpoint database are shared by every product; a
+        # state_dir keeps them elsewhere (benchmarks run in a scratch directory)
+        self.page_store = PageStore() if state_dir is None else PageStore(os.path.join(state_dir, 'page_store'))
+        self.page_digests = {}  # page -> content hash, filled by scrape_page
+        # Per-page status lives in the checkpoint database; pages fetched since
+        # the last save are (page, reviews, sha256) until their reviews are on disk
+        self.checkpoint = (CrawlCheckpoint(self.product.key) if state_dir is None else
+                           CrawlCheckpoint(self.product.key, os.path.join(state_dir, 'crawl_state.sqlite')))
+        self.unsaved_pages = []
+        # Set from the review count on the first page fetched; bounds the page range
+        self.crawl_plan = None
+        self.page_fingerprints = {}  # page -> review_fingerprint, to spot repeated pages
+        self.scorer = None  # StreamingScorer when --stream-score is on
+        self.near_duplicates = None  # NearDuplicateIndex when --near-dups is on
+        self.telemetry = None  # CrawlTelemetry when --telemetry is on
+        self.writer = None  # BackgroundWriter while scrape_reviews runs
+        self.shared_queue = False  # set by sharded_crawl.py: pages come from a work queue shared with other workers
+        self.stop = threading.Event()  # set (e.g. by crawl_scheduler.py) to end the crawl after the current page
+    
+    @classmethod
+    def offline_parser(cls, product_key):
+        """Instance for replay workers: parse_page only, no session, journal or CSV reads"""
+        parser = cls.__new__(cls)
+        parser.product = PRODUCTS[product_key]
+        parser.review_index = None  # replay dedups across pages itself
+        return parser
+        
+    def _get_last_successful_page(self):
+        """Last successful page from the progress log or last_page.txt (legacy resume, see CrawlCheckpoint.seed)"""
+        last_page = 0
+        try:
+            with open(self.progress_file, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+                # Search for last successful page from bottom up
+                for line in reversed(lines):
+                    if 'Page' in line and 'Found' in line and 'reviews' in line:
+                        # Extract page number from log like "Page 12: Found 8 reviews"
+                        match = re.search(r'Page (\d+):', line)
+                        if match:
+                            last_page = int(match.group(1))
+                            break
+        except OSError:
+            pass
+        # Older crawls also recorded it as LAST_SUCCESSFUL_PAGE=N
+        try:
+            with open(os.path.join(self.workdir, 'last_page.txt'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith('LAST_SUCCESSFUL_PAGE='):
+                        last_page = max(last_page, int(line.split('=')[1].strip()))
+        except (OSError, ValueError):
+            pass
+        return last_page
+    
+    def _calculate_resume_page(self, last_page):
+        """Calculate resume page: nearest previous number divisible by 5, then +1"""
+        if last_page == 0:
+            return 1
+        # Find nearest previous number divisible by 5
+        nearest_divisible_by_5 = (last_page // 5) * 5
+        # Start from next page after that checkpoint
+        return nearest_divisible_by_5 + 1
+    
+    def _extract_and_format_date(self, text, reference=None):
+        """Extract date from text - handles both relative dates and actual dates like 'Oct, 2024'
+
+        Relative dates are anchored to `reference` (the page's fetch time) when known.
+        """
+        from datetime import datetime
+        from dateutil.relativedelta import relativedelta
+        
+        # First, check for actual date format like "Oct, 2024" or "Jan 2025"
+        actual_date_pattern = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[,\s]+(\d{4})', text, re.IGNORECASE)
+        if actual_date_pattern:
+            month_str = actual_date_pattern.group(1)
+            year_str = actual_date_pattern.group(2)
+            return f"{month_str} {year_str}"
+        
+        # Look for relative date patterns like "3 months ago", "2 weeks ago"
+        month_pattern = re.search(r'(\d+)\s*months?\s*ago', text, re.IGNORECASE)
+        week_pattern = re.search(r'(\d+)\s*weeks?\s*ago', text, re.IGNORECASE)
+        day_pattern = re.search(r'(\d+)\s*days?\s*ago', text, re.IGNORECASE)
+        year_pattern = re.search(r'(\d+)\s*years?\s*ago', text, re.IGNORECASE)
+        
+        current_date = reference or datetime.now()
+        review_date = None
+        
+        if year_pattern:
+            years = int(year_pattern.group(1))
+            review_date = current_date - relativedelta(years=years)
+        elif month_pattern:
+            months = int(month_pattern.group(1))
+            review_date = current_date - relativedelta(months=months)
+        elif week_pattern:
+            weeks = int(week_pattern.group(1))
+            review_date = current_date - relativedelta(weeks=weeks)
+        elif day_pattern:
+            days = int(day_pattern.group(1))
+            review_date = current_date - relativedelta(days=days)
+        
+        if review_date:
+            # Format as "Jan 2026" or "Nov 2025" (month and year only)
+            return review_date.strftime('%b %Y')
+        
+        return None
+    
+    def _get_headers(self):
+        """Rotate user agents to avoid blocking"""
+        self.current_ua_index = (self.current_ua_index + 1) % len(self.USER_AGENTS)
+        return {
+            'User-Agent': self.USER_AGENTS[self.current_ua_index],
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        }
+    
+    def log_progress(self, message):
+        """Log progress to text file"""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with open(self.progress_file, 'a', encoding='utf-8') as f:
+            f.write(f"[{timestamp}] {message}\n")
+        
+    def clean_text(self, text):
+        """Remove emojis, extra spaces, noise, names, phone numbers, dates and locations from text"""
+        # One fused scan for every kind of personal data (see pii_scrubber.py)
+        return default_scrubber(clean_names).scrub(text).text
+    
+    def _timing(self, page):
+        """Make this page's telemetry record current in this thread (no-op without --telemetry)"""
+        if self.telemetry is None or page is None:
+            return contextlib.nullcontext()
+        return self.telemetry.activate(page)
+    
+    def _finish_timing(self, page, status, reviews):
+        if self.telemetry is not None:
+            self.telemetry.finish(page, status, len(reviews or ()))
+    
+    def scrape_page(self, url, page=None):
+        """Fetch and parse a single page (None if it could not be fetched or parsed)"""
+        with self._timing(page):
+            fetched = self.fetch_page(url, page)
+            if fetched is None:
+                return None
+            try:
+                if page is None:
+                    return self.parse_page(*fetched)
+                with stage('parse'):
+                    reviews = self.extract_page(*fetched)
+                return self._accept_parsed(page, reviews)
+            except Exception as e:
+                self.log_progress(f"Unexpected error: {str(e)}")
+                print(f"❌ Error: {str(e)[:50]}")
+                return None
+    
+    def _accept_parsed(self, page, reviews):
+        """Caller-side step for a parsed page: fingerprint it, then drop reviews seen before (or nearly copied)"""
+        with self._timing(page), stage('dedup'):
+            # Fingerprint before the cross-page dedup, which empties a repeated page
+            self.page_fingerprints[page] = review_fingerprint(reviews)
+            reviews = self._accept_new(reviews)
+            if self.near_duplicates is not None:
+                reviews = self.near_duplicates.filter_new(reviews)
+            return reviews
+    
+    def fetch_page(self, url, page=None):
+        """Fetch (and store) a single page with retry logic: (html, fetched_at), or None if it could not be fetched"""
+        with self._timing(page):
+            max_retries = 5
+            for attempt in range(max_retries):
+                try:
+                    headers = self._get_headers()
+                    response = self.session.get(url, headers=headers, timeout=30)
+                    response.raise_for_status()
+                    self.network_errors = 0  # Reset on success
+                    fetched_at = response_time(response.headers)
+                    if self.crawl_plan is None:
+                        self.crawl_plan = CrawlPlan.from_html(response.text)
+                    if page is not None:
+                        # Keep the raw HTML so extraction changes can be replayed offline
+                        self.page_digests[page] = self.page_store.put(self.product.key, page, url, response.text, fetched_at)
+                    return response.text, fetched_at
+                
+                except requests.exceptions.RequestException as e:
+                    self.network_errors += 1
+                    if attempt < max_retries - 1:
+                        count_event('retries')
+                        # The rate controller has already backed off (and honours Retry-After),
+                        # so the retry just waits for its next slot
+                        rate = self.session.rate_limiter.per_minute()
+                        self.log_progress(f"Network error on attempt {attempt+1}/{max_retries}. Retrying at {rate:.1f} req/min... Error: {str(e)[:100]}")
+                        print(f"⚠ Network error (#{self.network_errors}), retrying at {rate:.1f} req/min...")
+                        # Rotate user agent on retry
+                        self._get_headers()
+                    else:
+                        self.log_progress(f"Failed after {max_retries} attempts: {str(e)}")
+                        print(f"❌ Error: Network failure after {max_retries} retries")
+                        return None
+                except Exception as e:
+                    self.log_progress(f"Unexpected error: {str(e)}")
+                    print(f"❌ Error: {str(e)[:50]}")
+                    return None
+        
+            return None
+    
+    def _valid_card(self, title, review_text):
+        """The review-card rules; run on the raw fields and again once they are cleaned"""
+        # Check for personal names or identifiers in text
+        name_indicators = ['flipkart customer', 'certified buyer', 'by ', 'reviewed by']
+        has_name_indicator = any(indicator in title.lower() or indicator in review_text.lower() 
+                                for indicator in name_indicators)
+        
+        # Check if title is a person name (2+ capitalized words)
+        is_person_name_title = bool(re.match(r'^[A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?$', title))
+        
+        # Validate - reject if contains name indicators or title is a name
+        return (3 < len(title) < 150 and
+                15 < len(review_text) < 1000 and
+                not title.replace(' ', '').replace(',', '').isdigit() and
+                not has_name_indicator and
+                not is_person_name_title)
+    
+    def _build_review(self, rating, title, review_text, full_text, fetched_at=None, date=None, city=None):
+        """Review dict for one accepted card whose title/text are already cleaned
+
+        DOM cards carry their raw full text; state reviews (full_text None) their exact date and city.
+        """
+        if full_text is not None:
+            # City and date come from the raw full text (cleaning strips them)
+            city = default_scrubber(clean_names).city(full_text)
+            date = self._extract_and_format_date(full_text, fetched_at)
+        return {
+            'rating': int(rating),
+            'title': title,
+            'review_text': review_text,
+            'date': date if date else 'N/A',
+            'city': city if city else 'N/A'
+        }
+    
+    def _parse_text_cards(self, soup):
+        """Fallback: pick review cards out of div text with line heuristics"""
+        # Nested divs repeat the same lines, so each distinct line is classified once per page
+        is_content = {}
+        
+        # Every div's text comes from one traversal of the page
+        for div in iter_div_texts(soup):
+            # Cheap checks on the precomputed text range before joining anything
+            if div.text_length('\n') < 20 or div.first_char not in '12345':
+                continue
+            
+            text = div.get_text(separator='\n')
+            lines = [l.strip() for l in text.split('\n') if l.strip()]
+            
+            # Look for pattern: rating on first line, title on second, review text after
+            if len(lines) < 3:
+                continue
+            rating = lines[0][0]
+            
+            # Skip if this looks like a summary (has "ratings and" or multiple reviews)
+            full_text = ' '.join(lines)
+            if 'ratings and' in full_text or 'User reviews sorted' in full_text:
+                continue
+            
+            # Get title (usually second line or part after rating)
+            title_candidates = []
+            review_candidates = []
+            
+            for i, line in enumerate(lines[1:], 1):
+                content = is_content.get(line)
+                if content is None:
+                    # Skip noise lines and lines with time patterns (e.g., "3 months ago")
+                    content = is_content[line] = (len(line) > 5 and not NOISE_RE.search(line) and
+                                                  not TIME_AGO_RE.search(line))
+                
+                if content:
+                    if i == 1 or (not title_candidates and len(line) < 100):
+                        title_candidates.append(line)
+                    else:
+                        review_candidates.append(line)
+            
+            if title_candidates and review_candidates:
+                yield rating, title_candidates[0], ' '.join(review_candidates), full_text, None, None
+    
+    def parse_page(self, html, fetched_at=None):
+        """Extract new reviews from one page of HTML"""
+        return self._accept_new(self.extract_page(html, fetched_at))
+    
+    def extract_page(self, html, fetched_at=None):
+        """Every valid review on one page of HTML, deduped within the page only"""
+        columns = self.product.columns
+        # Cards are (rating, title, text, full_text, date, city), title and text still raw
+        # Strategy 1: embedded JSON state - exact fields, the DOM is never parsed
+        state_reviews = find_state_reviews(html, fetched_at)
+        if state_reviews is not None:
+            cards = [(r['rating'], r['title'], r['review_text'], None, r['date'], r['city']) for r in state_reviews]
+        else:
+            soup = make_soup(html)
+            # Strategy 2: known review-card markup; Strategy 3: text heuristic over all divs
+            cards = [(card['rating'], card['title'], card['review_text'], card['full_text'].replace('\n', ' '), None, None)
+                     for card in find_structured_cards(soup) if card['rating'] is not None]
+            if not cards:
+                cards = self._parse_text_cards(soup)
+        # Every strategy goes through the same checks and the same scrubber.
+        # The cheap checks on the raw card come first: most candidates (wrapper
+        # divs holding a whole page of cards) never reach the scrubber
+        cards = [card for card in cards if self._valid_card(card[1], card[2])]
+        # Clean the accepted titles and bodies in one batch each; cleaning only
+        # shortens them, so the rules are checked once more on the result
+        scrubber = default_scrubber(clean_names)
+        with stage('clean'):
+            titles = [scrubbed.text for scrubbed in scrubber.scrub_many(card[1] for card in cards)]
+            bodies = [scrubbed.text for scrubbed in scrubber.scrub_many(card[2] for card in cards)]
+        reviews = (self._build_review(rating, title, body, full_text, fetched_at, date, city)
+                   for (rating, _, _, full_text, date, city), title, body in zip(cards, titles, bodies)
+                   if self._valid_card(title, body))
+        
+        page_reviews = []
+        seen_reviews = set()
+        for review in reviews:
+            review_key = make_review_key(review['rating'], review['title'], review['review_text'])
+            if review_key not in seen_reviews:
+                seen_reviews.add(review_key)
+                # Only the product's CSV columns travel on (not every product keeps date and city)
+                page_reviews.append({column: review[column] for column in columns})
+        
+        return page_reviews
+    
+    def _accept_new(self, reviews):
+        """Drop reviews already in the CSV (or accepted from an earlier page) and record the rest"""
+        if self.review_index is None:
+            return reviews
+        new_reviews = []
+        for review in reviews:
+            review_key = make_review_key(review['rating'], review['title'], review['review_text'])
+            if self.review_index.add(review_key):
+                new_reviews.append(review)
+        return new_reviews
+    
+    def resume_page(self):
+        """Exact resume point from the checkpoint database (seeded once from the log for older crawls)"""
+        if not self.checkpoint.has_history():
+            self.checkpoint.seed(self._calculate_resume_page(self._get_last_successful_page()))
+        return self.checkpoint.resume_page()
+    
+    def finish_crawl(self):
+        """Save what is still in memory and compact the journal; returns the reviews in the CSV"""
+        self.save_to_csv()
+        return self.journal.compact()
+    
+    def _page_url(self, base_url, page):
+        if page == 1:
+            return base_url
+        return f"{base_url}&page={page}" if '?' in base_url else f"{base_url}?page={page}"
+    
+    def scrape_reviews(self, base_url, max_pages=100, start_page=1, reverse=False, workers=1, parse_processes=0):
+        if reverse:
+            self.log_progress(f"Starting REVERSE scrape from page {start_page} down to 1")
+            print(f"Starting REVERSE scrape from page {start_page} down to 1... Target: {start_page} pages\n")
+            page_range = range(start_page, 0, -1)
+        else:
+            self.log_progress(f"Starting scrape from page {start_page} to {max_pages}")
+            print(f"Starting scrape from page {start_page} to {max_pages}... Target: {max_pages - start_page + 1} pages\n")
+            page_range = range(start_page, max_pages + 1)
+        
+        page_count = 0
+        # Pages are claimed as they are queued: finished pages and pages another
+        # worker holds are skipped, so parallel runs over one range stay disjoint
+        # Once a fetched page reveals the review count, pages past the plan are never queued
+        pages = planned_pages(page_range, lambda: self.crawl_plan)
+        # Sharded crawls (sharded_crawl.py) also take over expired and failed pages from other workers
+        claim = self.checkpoint.lease_iter if self.shared_queue else self.checkpoint.claim_iter
+        page_urls = ((page, self._page_url(base_url, page)) for page in claim(pages))
+        
+        # Request spacing comes from the session's rate controller in both modes
+        pipeline = None
+        if parse_processes:
+            # Fetch threads hand the HTML to parser processes; dedup and saving stay here, in page order
+            pipeline = ParsePipeline(self.fetch_page, OfflineParser(self.product.key), workers, parse_processes,
+                                     method='extract_page')
+            results = pipeline.map(page_urls, self._accept_parsed)
+            self.log_progress(f"Pipeline mode: {workers} fetch threads, {pipeline.parse_workers} parse processes")
+        elif workers > 1:
+            # Keep several pages in flight so parsing/saving overlaps with the waits
+            results = ConcurrentPageFetcher(self.scrape_page, workers).map(page_urls)
+            self.log_progress(f"Concurrent mode: {workers} pages in flight, starting at {self.session.rate_limiter.per_minute():.1f} req/min")
+        else:
+            results = ((page, self.scrape_page(url, page)) for page, url in page_urls)
+        # Pages are persisted by a writer thread while fetching continues
+        self.writer = BackgroundWriter(self.write_batch)
+        session_total = 0
+        started = time.monotonic()
+        plan_logged = False
+        last_fingerprint = None
+        
+        for page, page_reviews in results:
+            if self.crawl_plan is not None and not plan_logged:
+                plan_logged = True
+                self.log_progress(f"Crawl plan: {self.crawl_plan.total_reviews} reviews listed -> last page {self.crawl_plan.last_page}")
+                print(f"🗺 {self.crawl_plan.total_reviews} reviews listed -> crawling up to page {self.crawl_plan.last_page}\n")
+            
+            if reverse:
+                print(f"[Page {page}/1] Fetching...", end=' ')
+            else:
+                print(f"[Page {page}/{self.crawl_plan.last_page if self.crawl_plan else max_pages}] Fetching...", end=' ')
+            
+            fingerprint = self.page_fingerprints.pop(page, None)
+            if fingerprint is not None and fingerprint == last_fingerprint:
+                # Past the last page Flipkart keeps serving the final page
+                self.writer.submit((page, 0, self.page_digests.pop(page, None)), [])
+                self.log_progress(f"STOPPING: Page {page} repeats the previous page's reviews (past the last page)")
+                print("⚠ Same reviews as the previous page - past the last page, stopping")
+                self._finish_timing(page, 'repeat', None)
+                break
+            if fingerprint is not None:
+                last_fingerprint = fingerprint
+            
+            if page_reviews is None or (fingerprint is None and self.crawl_plan is not None):
+                # Fetch failed, or a page inside the planned range came back blank: retry it next run
+                self.checkpoint.fail(page)
+                status = 'failed'
+            else:
+                # Blocks only while the writer is a full queue behind (backpressure)
+                with self._timing(page), stage('save'):
+                    self.writer.submit((page, len(page_reviews), self.page_digests.pop(page, None)), page_reviews)
+                status = 'done' if page_reviews else 'empty'
+            
+            if page_reviews:
+                session_total += len(page_reviews)
+                if self.scorer is not None:
+                    # Cleaned and scored on the consumer thread while the next fetch waits
+                    self.scorer.submit(page_reviews)
+                self.last_successful_page = page
+                self.consecutive_empty = 0
+                self.log_progress(f"Page {page}: Found {len(page_reviews)} reviews (Session total: {session_total})")
+                print(f"✓ Found {len(page_reviews)} reviews (Total: {session_total})")
+            else:
+                self.consecutive_empty += 1
+                self.log_progress(f"Page {page}: No reviews found (Consecutive empty: {self.consecutive_empty})")
+                print("⚠ No reviews found")
+                
+                # Stop if 5 consecutive pages have no reviews
+                if self.consecutive_empty >= 5:
+                    self.log_progress(f"STOPPING: 5 consecutive pages with no reviews. Last successful: Page {self.last_successful_page}")
+                    print(f"\n⚠ Stopping: 5 consecutive pages with no reviews")
+                    print(f"Last successful page: {self.last_successful_page}")
+                    self._finish_timing(page, status, page_reviews)
+                    break
+            
+            page_count += 1
+            
+            # Saving happens on the writer thread; every 5 pages just report progress
+            if page_count % 5 == 0:
+                self.log_progress(f"Progress checkpoint: page {page}. Writer: {self.writer.report()}. Total reviews in file: {self.total_in_file}")
+                self.log_progress(f"Rate controller: {self.session.rate_limiter.snapshot()}")
+                print(f"\n📊 Progress at page {page}. Total in file: {self.total_in_file}\n")
+            self._finish_timing(page, status, page_reviews)
+            if self.stop.is_set():
+                self.log_progress(f"STOPPING: stop requested after page {page}")
+                break
+        
+        results.close()
+        if pipeline is not None:
+            self.log_progress(f"Pipeline: {pipeline.report()}")
+            print(f"\n🔧 Pipeline: {pipeline.report()}")
+        rate = pages_per_minute(page_count, started)
+        self.log_progress(f"Crawl rate: {rate:.2f} pages/min over {page_count} pages ({workers} in flight)")
+        print(f"\n⏱ Crawl rate: {rate:.2f} pages/min ({workers} in flight)")
+        
+        # Final save: drains the writer's queue, then anything left in memory
+        writer = self.writer
+        saved_count = self.save_to_csv()
+        self.log_progress(f"Writer: {writer.report()}")
+        print(f"💾 Writer: {writer.report()}")
+        self.log_progress(f"Final save completed. Total reviews: {saved_count}")
+        
+        return self.total_in_file
+    
+    def replay(self, output=None, processes=None):
+        """Re-extract every stored page of this product across CPU cores, without the network"""
+        output = output or os.path.join(self.workdir, self.product.replay_filename)
+        entries = self.page_store.pages(self.product.key)
+        if not entries:
+            print(f"⚠ No stored pages for {self.product.key} in {self.page_store.root}")
+            return 0
+        
+        started = time.monotonic()
+        reviews = []
+        seen_reviews = set()
+        for entry, page_reviews in replay_pages(self.page_store, entries, OfflineParser(self.product.key), processes):
+            # Cross-page dedup in page order, as the live crawl's review index does
+            for review in page_reviews:
+                review_key = make_review_key(review['rating'], review['title'], review['review_text'])
+                if review_key not in seen_reviews:
+                    seen_reviews.add(review_key)
+                    reviews.append(review)
+        
+        # Same dedup the journal applies when it compacts into the CSV
+        df = pd.DataFrame(reviews, columns=self.product.columns).drop_duplicates(subset=['title', 'review_text'], keep='first')
+        df.to_csv(output, index=False, encoding='utf-8')
+        
+        elapsed = time.monotonic() - started
+        self.log_progress(f"Replay: {len(entries)} stored pages -> {len(df)} reviews in {output} ({elapsed:.1f}s)")
+        print(f"✓ Replayed {len(entries)} pages in {elapsed:.1f}s -> {len(df)} reviews saved to {output}")
+        return len(df)
+    
+    def save_to_csv(self, filename=None):
+        """Checkpoint new reviews as a journal segment (compacted into the CSV past the threshold)"""
+        if self.writer is not None:
+            # Whatever was handed to the writer goes to disk first (also on Ctrl+C)
+            self.writer.close()
+            self.writer = None
+        reviews, pages = self.reviews, self.unsaved_pages
+        self.reviews, self.unsaved_pages = [], []
+        return self.write_batch(reviews, pages, filename)
+    
+    def write_batch(self, reviews, pages, filename=None):
+        """Persist one batch of reviews, then mark its pages finished (the writer thread's step)"""
+        journal = self.journal if filename is None else ReviewJournal(filename, columns=self.product.columns)
+            
+        if not reviews:
+            # Return current file count even if no new reviews
+            self.checkpoint.complete(pages)
+            return journal.count()
+        
+        # Keys of exactly this batch: pages still queued behind it have added theirs too
+        keys = [make_review_key(r['rating'], r['title'], r['review_text']) for r in reviews]
+        try:
+            journal.append(reviews)
+            # The segment is durable now, so these pages never need fetching again
+            self.checkpoint.complete(pages)
+            saved_count = journal.maybe_compact()
+            # Persist the batch's keys after the journal so the key file stays at least as new
+            self.review_index.flush(keys)
+            
+            self.total_in_file = saved_count
+            return saved_count
+            
+        except Exception as e:
+            # Nothing of this batch is in the key file; forget it in memory too, so a re-fetch is accepted
+            self.review_index.discard(keys)
+            self.log_progress(f"Error saving to CSV: {str(e)}")
+            print(f"❌ Error saving: {str(e)}")
+            return self.total_in_file
+
+
+def main(product_key=None):
+    """Crawl one product; the product folders' simple_scraper.py pass their own key"""
+    parser = argparse.ArgumentParser(description="Flipkart review scraper")
+    if product_key is None:
+        parser.add_argument('product', choices=sorted(PRODUCTS), help="registered product to crawl (see products.py)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="pages fetched concurrently under the same politeness budget (1 = sequential)")
+    parser.add_argument('--parse-processes', type=int, default=0,
+                        help="parse and clean pages on this many processes fed by the fetch threads (0 = parse on the fetch threads)")
+    parser.add_argument('--replay', action='store_true',
+                        help="re-extract reviews from the stored raw pages instead of crawling")
+    parser.add_argument('--processes', type=int, default=None,
+                        help="parser processes for --replay (default: all CPU cores)")
+    parser.add_argument('--output', default=None,
+                        help="CSV written by --replay (default: <product>_reviews_replay.csv in its folder)")
+    parser.add_argument('--stream-score', action='store_true',
+                        help="clean and sentiment-score reviews while crawling (rows go to <product>_scores_stream.csv)")
+    parser.add_argument('--score-methods', nargs='+', choices=sorted(METHOD_KEYS), default=list(DEFAULT_METHODS),
+                        help="scorers for --stream-score (bert needs transformers and torch)")
+    parser.add_argument('--telemetry', action='store_true',
+                        help=f"record per-page stage timings to {TELEMETRY_FILENAME} and a Prometheus textfile (see crawl_telemetry.py)")
+    parser.add_argument('--near-dups', action='store_true',
+                        help="drop reviews that nearly copy one already saved (names, truncation; see near_duplicates.py)")
+    args = parser.parse_args()
+    product = PRODUCTS[product_key or args.product]
+    
+    if args.replay:
+        FlipkartScraper(product).replay(args.output, args.processes)
+        return
+    
+    print("="*60)
+    print("SIMPLE FLIPKART REVIEW SCRAPER")
+    print("="*60)
+    print(f"Product: {product.name}\n")
+    
+    scraper = FlipkartScraper(product)
+    scraper.log_progress("="*60)
+    if args.telemetry:
+        scraper.telemetry = CrawlTelemetry(product.key, os.path.join(scraper.workdir, TELEMETRY_FILENAME))
+    if args.near_dups:
+        scraper.near_duplicates = NearDuplicateIndex.from_csv(scraper.csv_path)
+        print(f"🔎 Near-duplicate index: {len(scraper.near_duplicates)} saved reviews")
+    scores_path = os.path.join(scraper.workdir, product.scores_filename)
+    if args.stream_score:
+        scraper.scorer = StreamingScorer(product.device, scores_path, args.score_methods)
+    
+    # Check for resume point: exact from the checkpoint database. Crawls from
+    # before the database existed seed it once from the old log-based estimate
+    resume_page = scraper.resume_page()
+    last_page = resume_page - 1
+    
+    if last_page > 0:
+        scraper.log_progress(f"Resuming scrape - Last successful page: {last_page}, Starting from: {resume_page}")
+        print(f"\nResuming from page {resume_page} (Last successful: {last_page})\n")
+    else:
+        scraper.log_progress(f"Starting fresh scrape - {product.device} reviews")
+        print("\nStarting fresh scrape...\n")
+    
+    try:
+        # max_pages is only a ceiling: the review count on the first page fetched sets the real last page,
+        # and a page repeating the previous one (past the end) stops the crawl at once
+        scraper.scrape_reviews(product.url, max_pages=product.max_pages, start_page=resume_page, reverse=False, workers=args.workers,
+                               parse_processes=args.parse_processes)
+        final_count = scraper.finish_crawl()
+        
+        if final_count > 0:
+            df = pd.read_csv(scraper.csv_path)
+            print(f"\n{'='*60}")
+            print(f"STATISTICS")
+            print(f"{'='*60}")
+            print(f"Total Reviews: {len(df)}")
+            print(f"\nRating Distribution:")
+            print(df['rating'].value_counts().sort_index())
+            print(f"{'='*60}")
+            scraper.log_progress(f"Scraping completed successfully. Total reviews: {len(df)}")
+        
+    except KeyboardInterrupt:
+        print("\n\n⚠ Interrupted! Saving progress...")
+        scraper.log_progress("Scraper interrupted by user")
+        scraper.save_to_csv()
+        saved_count = scraper.journal.compact()
+        scraper.log_progress(f"Progress saved. Total reviews: {saved_count}")
+        print(f"✓ Progress saved. Total in file: {saved_count}")
+    except Exception as e:
+        scraper.log_progress(f"Fatal error: {str(e)}")
+        print(f"Fatal error: {e}")
+    finally:
+        if scraper.writer is not None:
+            scraper.writer.close()  # pages already handed over still get written
+        # Unsaved in-flight pages go back to the pool for the next run
+        scraper.checkpoint.release()
+        if scraper.telemetry is not None:
+            scraper.telemetry.close()
+            print(f"📈 Telemetry: {scraper.telemetry.path} (summary: python crawl_telemetry.py)")
+        if scraper.near_duplicates is not None:
+            print(f"🔎 Near-duplicates: {scraper.near_duplicates.stats()}")
+            scraper.log_progress(f"Near-duplicates: {scraper.near_duplicates.stats()}")
+        if scraper.scorer is not None:
+            scraper.scorer.close()
+            print_report(scraper.scorer)
+            scraper.log_progress(f"Streaming scores: {scraper.scorer.scored} reviews -> {scores_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Near-duplicate review detection with MinHash signatures and LSH banding
+
+The scrapers' exact dedup (make_review_key, drop_duplicates on title +
+review_text) misses copies of one review that differ only by the reviewer
+name/city/date Flipkart appends, whitespace, or "... READ MORE" truncation,
+and the same reviews listed under several products (colour and storage
+variants, iPhone 15 vs iPhone 16 listings).
+
+Each review text is normalized (names, dates and the READ MORE tail
+removed, lowercased, punctuation dropped), cut to its first WINDOW
+characters so a truncated copy still matches the full one, and turned into
+character shingles. A MinHash signature of NUM_PERM values estimates the
+Jaccard similarity of two shingle sets; LSH splits the signature into bands
+and only reviews sharing a whole band are compared, so checking one review
+against the index costs a signature plus a few dict lookups, not a scan.
+
+Texts shorter than MIN_CHARS after normalization ("Nice phone") are never
+matched: identical one-liners from different buyers are not duplicates, and
+exact dedup already covers repeated pages.
+
+Used two ways:
+    * per review while crawling: scraper --near-dups keeps a NearDuplicateIndex
+      loaded from the product's CSV and drops near-copies as pages arrive;
+    * batch, across every product CSV (this script): reports the duplicate
+      clusters and, with --apply, removes all but the first copy.
+
+Usage:
+    python near_duplicates.py                         # report clusters across all products
+    python near_duplicates.py --threshold 0.7 --show 20
+    python near_duplicates.py --apply                 # drop near-copies within each product's CSV
+    python near_duplicates.py --apply --across-products
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, '2_dataset_final_folder'))
+import clean_names
+from pii_scrubber import default_scrubber
+from products import PRODUCTS
+
+NUM_PERM = 128
+SHINGLE = 5  # characters per shingle
+WINDOW = 300  # normalized characters compared; Flipkart truncates long reviews
+MIN_CHARS = 40
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_REPORT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'near_duplicate_clusters.csv')
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+READ_MORE_RE = re.compile(r'(?:\.\.\.)?\s*READ\s*MORE\b.*$', re.IGNORECASE | re.DOTALL)
+NON_WORD_RE = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(text):
+    """Comparison form of a review: no names, dates or READ MORE tail; lowercase words only"""
+    if not isinstance(text, str):
+        return ''
+    text = READ_MORE_RE.sub('', text)
+    text = default_scrubber(clean_names).scrub(text).text
+    text = NON_WORD_RE.sub(' ', text.lower()).strip()
+    return text[:WINDOW]
+
+
+def choose_bands(threshold, num_perm):
+    """(bands, rows): the most rows per band that still make a pair at `threshold` a candidate 95% of the time"""
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= 0.95:
+            return bands, rows
+    return num_perm, 1
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of review texts; ids are whatever the caller passes to add()"""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        # Universal hashing family (a*x + b) mod p, as in datasketch
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.bands, self.rows = choose_bands(threshold, num_perm)
+        self._buckets = [{} for _ in range(self.bands)]  # band -> {band bytes: [id, ...]}
+        self._signatures = {}  # id -> signature
+        self.checked = 0
+        self.dropped = 0
+        self.check_seconds = 0.0
+
+    def signature(self, text):
+        """MinHash signature of a review text, or None if it is too short to compare"""
+        norm = normalize(text)
+        if len(norm) < MIN_CHARS:
+            return None
+        shingles = {norm[i:i + SHINGLE] for i in range(len(norm) - SHINGLE + 1)}
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        permuted = ((hashes[:, None] * self._a + self._b) % MERSENNE_PRIME) & MAX_HASH
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [signature[i * rows:(i + 1) * rows].tobytes() for i in range(self.bands)]
+
+    def similarity(self, sig_a, sig_b):
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.count_nonzero(sig_a == sig_b)) / self.num_perm
+
+    def query(self, text=None, signature=None):
+        """[(id, similarity)] of indexed reviews at or above the threshold, best first"""
+        if signature is None:
+            signature = self.signature(text)
+        if signature is None:
+            return []
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(key, ()))
+        matches = []
+        for candidate in candidates:
+            score = self.similarity(signature, self._signatures[candidate])
+            if score >= self.threshold:
+                matches.append((candidate, score))
+        return sorted(matches, key=lambda m: -m[1])
+
+    def add(self, review_id, text=None, signature=None):
+        """Index one review; returns its signature (None if too short to index)"""
+        if signature is None:
+            signature = self.signature(text)
+        if signature is None:
+            return None
+        self._signatures[review_id] = signature
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(key, []).append(review_id)
+        return signature
+
+    def check_and_add(self, review_id, text):
+        """Best (id, similarity) match already indexed, or None after indexing this review as new"""
+        started = time.perf_counter()
+        signature = self.signature(text)
+        matches = self.query(signature=signature)
+        if not matches and signature is not None:
+            self.add(review_id, signature=signature)
+        self.checked += 1
+        self.check_seconds += time.perf_counter() - started
+        return matches[0] if matches else None
+
+    def filter_new(self, reviews):
+        """The scrapers' per-page step: drop reviews that nearly copy one already indexed"""
+        kept = []
+        for review in reviews:
+            if self.check_and_add(len(self._signatures), review.get('review_text')) is None:
+                kept.append(review)
+            else:
+                self.dropped += 1
+        return kept
+
+    @classmethod
+    def from_csv(cls, csv_path, threshold=DEFAULT_THRESHOLD):
+        """Index seeded with every review already in a scraper's CSV"""
+        index = cls(threshold)
+        try:
+            texts = pd.read_csv(csv_path, usecols=['review_text'])['review_text']
+        except (FileNotFoundError, pd.errors.EmptyDataError, ValueError):
+            return index
+        for text in texts:
+            index.add(len(index._signatures), text)
+        return index
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def stats(self):
+        per_check = self.check_seconds * 1e6 / self.checked if self.checked else 0.0
+        return (f"{len(self)} indexed, {self.checked} checked, {self.dropped} near-duplicates dropped, "
+                f"{per_check:.0f} µs per check")
+
+
+def find_clusters(df, threshold=DEFAULT_THRESHOLD):
+    """Group near-duplicate rows of df (a review_text column, any index).
+
+    Returns one row per member of a cluster of two or more, in df order:
+    cluster, the member's index label, and its similarity to the cluster's
+    first row (which is the copy a dedup keeps).
+    """
+    index = NearDuplicateIndex(threshold)
+    parent = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    signatures = {}
+    for position, text in enumerate(df['review_text']):
+        signature = index.signature(text)
+        parent[position] = position
+        if signature is None:
+            continue
+        signatures[position] = signature
+        for match, _ in index.query(signature=signature):
+            root_a, root_b = find(match), find(position)
+            if root_a != root_b:
+                # The earlier row stays the root, so it is the copy kept
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+        index.add(position, signature=signature)
+
+    members = {}
+    for position in signatures:
+        members.setdefault(find(position), []).append(position)
+    rows = []
+    labels = df.index
+    for cluster, (root, group) in enumerate(sorted((r, g) for r, g in members.items() if len(g) > 1)):
+        for position in group:
+            rows.append({'cluster': cluster, 'row': labels[position],
+                         'similarity': round(index.similarity(signatures[root], signatures[position]), 3)})
+    return pd.DataFrame(rows, columns=['cluster', 'row', 'similarity'])
+
+
+def product_csvs():
+    """(product key, CSV path) of every registered product that has a CSV"""
+    found = []
+    for product in PRODUCTS.values():
+        if os.path.exists(product.csv_path):
+            found.append((product.key, product.csv_path))
+    return found
+
+
+def load_reviews(csvs):
+    frames = []
+    for key, path in csvs:
+        df = pd.read_csv(path)
+        frames.append(pd.DataFrame({'product': key, 'csv_row': df.index, 'rating': df.get('rating'),
+                                    'title': df.get('title'), 'review_text': df['review_text']}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def apply_dedup(csvs, reviews, clusters, across_products):
+    """Rewrite each CSV without the non-first members of its clusters; returns rows dropped per product"""
+    members = clusters.join(reviews[['product', 'csv_row']], on='row')
+    if not across_products:
+        # Only copies of a review inside the same product's CSV count
+        members = members.assign(first=members.groupby(['cluster', 'product'])['row'].transform('min'))
+    else:
+        members = members.assign(first=members.groupby('cluster')['row'].transform('min'))
+    drop = members[members['row'] != members['first']]
+
+    dropped = {}
+    for key, path in csvs:
+        rows = drop.loc[drop['product'] == key, 'csv_row']
+        if rows.empty:
+            continue
+        df = pd.read_csv(path)
+        tmp = f"{path}.tmp"
+        df.drop(index=rows).to_csv(tmp, index=False, encoding='utf-8')
+        os.replace(tmp, path)
+        dropped[key] = len(rows)
+    return dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate reviews across the product CSVs")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="estimated Jaccard similarity at which two reviews are duplicates")
+    parser.add_argument('--report', default=DEFAULT_REPORT, help="CSV listing every cluster member")
+    parser.add_argument('--show', type=int, default=10, help="largest clusters printed")
+    parser.add_argument('--apply', action='store_true',
+                        help="rewrite the CSVs keeping only the first copy of each cluster")
+    parser.add_argument('--across-products', action='store_true',
+                        help="with --apply, also drop copies of a review already in an earlier product")
+    args = parser.parse_args()
+
+    csvs = product_csvs()
+    reviews = load_reviews(csvs)
+    started = time.perf_counter()
+    clusters = find_clusters(reviews, args.threshold)
+    seconds = time.perf_counter() - started
+
+    print("=" * 60)
+    print("NEAR-DUPLICATE REVIEWS")
+    print("=" * 60)
+    print(f"{len(reviews)} reviews from {len(csvs)} products, threshold {args.threshold}, "
+          f"{seconds:.1f}s ({seconds * 1e6 / max(len(reviews), 1):.0f} µs per review)")
+
+    if clusters.empty:
+        print("No near-duplicate clusters found")
+        return
+    report = clusters.join(reviews, on='row').drop(columns='row')
+    report.to_csv(args.report, index=False, encoding='utf-8')
+
+    sizes = report.groupby('cluster').size()
+    products_per_cluster = report.groupby('cluster')['product'].nunique()
+    print(f"{len(sizes)} clusters, {int((sizes - 1).sum())} redundant copies "
+          f"({int((products_per_cluster > 1).sum())} clusters span products) -> {args.report}")
+    for cluster in sizes.sort_values(ascending=False, kind='stable').index[:args.show]:
+        members = report[report['cluster'] == cluster]
+        print(f"\nCluster {cluster} ({len(members)} copies):")
+        for member in members.itertuples():
+            print(f"  [{member.product} row {member.csv_row}, {member.rating}★, sim {member.similarity:.2f}] "
+                  f"{str(member.review_text)[:80]}")
+
+    if args.apply:
+        dropped = apply_dedup(csvs, reviews, clusters, args.across_products)
+        print(f"\n✅ Removed {sum(dropped.values())} near-duplicate rows: "
+              + (', '.join(f"{key} {n}" for key, n in dropped.items()) or 'none'))
+
+
+if __name__ == '__main__':
+    main()
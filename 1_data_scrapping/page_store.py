@@ -0,0 +1,143 @@
+"""Content-addressed store of raw review-page HTML, plus offline replay
+
+Every fetched page is kept gzip-compressed under its SHA-256, so a page that
+comes back byte-identical is stored once:
+
+    page_store/objects/ab/ab12...ef.html.gz
+    page_store/index.jsonl      one line per fetch: product, page, url, sha256, fetched_at
+
+The index is append-only; the newest line for a (product, page) wins. Replay
+re-runs a scraper's parse_page over the stored pages on a process pool, with
+no network at all, so extraction changes can be re-applied to a whole corpus
+in seconds instead of re-crawling it.
+
+Usage:
+    python page_store.py                 # pages/bytes stored per product
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'page_store')
+
+
+class PageStore:
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, 'index.jsonl')
+        self._lock = threading.Lock()
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], f"{digest}.html.gz")
+
+    def put(self, product, page, url, html, fetched_at=None):
+        """Store one fetched page and index it; returns its content hash"""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=6))
+            os.replace(tmp_path, path)
+
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        entry = {
+            'product': product,
+            'page': int(page),
+            'url': url,
+            'sha256': digest,
+            'fetched_at': fetched_at.isoformat(),
+            'bytes': len(data),
+        }
+        # Blob first, then the index line, so every indexed hash is readable
+        with self._lock:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+        return digest
+
+    def get(self, digest):
+        return read_blob(self.blob_path(digest))
+
+    def entries(self, product=None):
+        """All index lines in write order (optionally for one product)"""
+        if not os.path.exists(self.index_path):
+            return []
+        entries = []
+        with open(self.index_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash
+                if product is None or entry['product'] == product:
+                    entries.append(entry)
+        return entries
+
+    def pages(self, product):
+        """Latest stored fetch of every page of a product, in page order"""
+        latest = {}
+        for entry in self.entries(product):
+            latest[entry['page']] = entry
+        return [latest[page] for page in sorted(latest)]
+
+    def summary(self):
+        """{product: (pages, stored fetches, uncompressed bytes of latest pages)}"""
+        latest, fetches = {}, {}
+        for entry in self.entries():
+            product = entry['product']
+            latest.setdefault(product, {})[entry['page']] = entry['bytes']
+            fetches[product] = fetches.get(product, 0) + 1
+        return {product: (len(pages), fetches[product], sum(pages.values()))
+                for product, pages in latest.items()}
+
+
+def read_blob(path):
+    with gzip.open(path, 'rb') as f:
+        return f.read().decode('utf-8')
+
+
+# One parser per worker process, built on first use from the scraper's factory
+_parsers = {}
+
+
+def _parse_blob(parser_factory, path, fetched_at):
+    parser = _parsers.get(parser_factory)
+    if parser is None:
+        parser = _parsers[parser_factory] = parser_factory()
+    fetched_at = datetime.fromisoformat(fetched_at) if fetched_at else None
+    return parser.parse_page(read_blob(path), fetched_at)
+
+
+def replay_pages(store, entries, parser_factory, workers=None, chunksize=4):
+    """Yield (entry, reviews) in entry order, parsing stored pages on `workers` processes.
+
+    parser_factory must be picklable (e.g. a classmethod of the scraper) and
+    return an object with parse_page(html, fetched_at). workers=1 parses in
+    this process.
+    """
+    parse = partial(_parse_blob, parser_factory)
+    paths = [store.blob_path(entry['sha256']) for entry in entries]
+    times = [entry.get('fetched_at') for entry in entries]
+    if workers == 1:
+        yield from zip(entries, map(parse, paths, times))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from zip(entries, pool.map(parse, paths, times, chunksize=chunksize))
+
+
+if __name__ == '__main__':
+    store = PageStore(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STORE_DIR)
+    summary = store.summary()
+    if not summary:
+        print(f"No pages stored in {store.root}")
+    for product, (pages, fetches, size) in sorted(summary.items()):
+        print(f"{product}: {pages} pages ({fetches} fetches), {size / 1e6:.1f} MB uncompressed")
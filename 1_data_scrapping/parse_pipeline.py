@@ -0,0 +1,155 @@
+"""Fetch -> parse/clean -> dedup/persist pipeline with parsing on a process pool
+
+Fetching is I/O and politeness waits; parsing a page (BeautifulSoup or the
+JSON state) and running the cleaning regexes is CPU. On the fetch threads
+the two contend for one interpreter lock, so once several pages are in
+flight parsing becomes the bottleneck. Here the stages are split:
+
+    fetch    thread pool; each fetched page's HTML is handed straight to
+    parse    a process pool, where the scraper's offline parser extracts and
+             cleans the reviews (one parser per worker process)
+    accept   the caller's thread, strictly in page order: cross-page dedup,
+             then the caller persists
+
+Every page the consumer receives, the depth of each stage is sampled, and
+the time the consumer spends blocked on the head-of-line page is split into
+"waiting for fetch" and "waiting for parse", so report() shows which stage
+bounds the crawl.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+# One parser per worker process, built on first use from the scraper's factory
+_parsers = {}
+
+
+def parse_html(parser_factory, method, html, fetched_at):
+    """Worker side: run parser.<method>(html, fetched_at) on this process's parser"""
+    parser = _parsers.get(parser_factory)
+    if parser is None:
+        parser = _parsers[parser_factory] = parser_factory()
+    return getattr(parser, method)(html, fetched_at)
+
+
+class StageStats:
+    """Queue depth samples and consumer wait time of one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.samples = 0
+        self.total_depth = 0
+        self.max_depth = 0
+        self.wait = 0.0  # seconds the consumer was blocked on this stage
+
+    def sample(self, depth):
+        self.samples += 1
+        self.total_depth += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    @property
+    def mean_depth(self):
+        return self.total_depth / self.samples if self.samples else 0.0
+
+
+class ParsePipeline:
+    def __init__(self, fetch_page, parser_factory, fetch_workers=4, parse_workers=None,
+                 method='parse_page', window=None):
+        """fetch_page(url, page) -> (html, fetched_at) or None runs on the fetch threads.
+
+        parser_factory must be picklable (e.g. a scraper's offline_parser
+        classmethod); its object's `method`(html, fetched_at) runs in the
+        worker processes. At most `window` pages are between claim and
+        consumer at once (default: enough to keep both pools busy).
+        """
+        self.fetch_page = fetch_page
+        self.parser_factory = parser_factory
+        self.method = method
+        self.fetch_workers = max(1, int(fetch_workers))
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.window = window or self.fetch_workers + 2 * self.parse_workers
+        self.stats = {name: StageStats(name) for name in ('fetch', 'parse', 'ready')}
+        self.accept_seconds = 0.0  # consumer time between pages: dedup + persist
+        self.errors = 0  # pages whose parse raised; yielded as failed fetches
+
+    def _sample(self, pending):
+        fetching = parsing = ready = 0
+        for _, fetch_future in pending:
+            if not fetch_future.done():
+                fetching += 1
+                continue
+            parse_future = fetch_future.result() if fetch_future.exception() is None else None
+            if parse_future is not None and not parse_future.done():
+                parsing += 1
+            else:
+                ready += 1
+        self.stats['fetch'].sample(fetching)
+        self.stats['parse'].sample(parsing)
+        self.stats['ready'].sample(ready)
+
+    def map(self, page_urls, accept=None):
+        """Yield (page, reviews) in input order for an iterable of (page, url) pairs.
+
+        reviews is None when the fetch or parse failed; otherwise accept(page, reviews)
+        (if given) runs here, in the caller's thread, before the page is
+        yielded. Closing the generator early cancels everything not started.
+        """
+        fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers)
+        parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+
+        def fetch_and_submit(url, page):
+            fetched = self.fetch_page(url, page)
+            if fetched is None:
+                return None
+            html, fetched_at = fetched
+            return parse_pool.submit(parse_html, self.parser_factory, self.method, html, fetched_at)
+
+        pending = deque()
+        page_urls = iter(page_urls)
+        try:
+            for page, url in islice(page_urls, self.window):
+                pending.append((page, fetch_pool.submit(fetch_and_submit, url, page)))
+            while pending:
+                self._sample(pending)
+                page, fetch_future = pending.popleft()
+                started = time.monotonic()
+                parse_future = fetch_future.result()
+                fetched = time.monotonic()
+                reviews = None
+                if parse_future is not None:
+                    try:
+                        reviews = parse_future.result()
+                    except Exception:
+                        self.errors += 1
+                self.stats['fetch'].wait += fetched - started
+                self.stats['parse'].wait += time.monotonic() - fetched
+
+                for next_page, next_url in islice(page_urls, 1):
+                    pending.append((next_page, fetch_pool.submit(fetch_and_submit, next_url, next_page)))
+                if reviews is not None and accept is not None:
+                    reviews = accept(page, reviews)
+                resumed = time.monotonic()
+                yield page, reviews
+                self.accept_seconds += time.monotonic() - resumed
+        finally:
+            # Fetch threads first: none of them may submit to a closed parse pool
+            fetch_pool.shutdown(wait=True, cancel_futures=True)
+            parse_pool.shutdown(wait=True, cancel_futures=True)
+
+    def bound_by(self):
+        """Stage the consumer waited on most: fetch, parse or accept (dedup/persist)"""
+        waits = {'fetch': self.stats['fetch'].wait, 'parse': self.stats['parse'].wait,
+                 'accept': self.accept_seconds}
+        return max(waits, key=waits.get)
+
+    def report(self):
+        parts = [f"{s.name} depth avg {s.mean_depth:.1f} max {s.max_depth}"
+                 + (f", waited {s.wait:.1f}s" if s.name != 'ready' else '')
+                 for s in self.stats.values()]
+        parts.append(f"dedup+persist {self.accept_seconds:.1f}s")
+        if self.errors:
+            parts.append(f"{self.errors} parse errors")
+        return f"{' | '.join(parts)} -> bound by {self.bound_by()}"
@@ -0,0 +1,229 @@
+"""Single-pass PII scrubber: reviewer names, cities, phone numbers and dates
+
+Personal data used to be removed by three separate chains of regex passes:
+the name/date rules of text_cleaner (applied one after another, each over the
+whole text), the scraper's _extract_city, and clean_names.strip_trailing_name.
+Here one scan finds all of it:
+
+  * the phone, date, byline, "Name Name , City" signature, capitalized-name
+    and ", City" patterns are fused into ONE alternation with a named group
+    per kind, so a single finditer over the raw review yields every span, its
+    kind and the city;
+  * the name gazetteer (by default the lexicon's names,
+    2_dataset_final_folder/lexicon_data/names.txt) is compiled into a
+    trie-shaped regex, the stdlib stand-in for an
+    Aho-Corasick automaton: a match follows one branch per character instead
+    of trying every name in turn. Reviewer names only ever close a review, so
+    it is run on the last kept tokens, not over the whole text, and 2-3
+    known names there are removed without further checks;
+  * otherwise those tokens go through the strip_trailing_name rules
+    (clean_names.trailing_name_tokens), and the kept text is tidied
+    (non-ASCII, symbols, comma artifacts, whitespace) once, on the output.
+
+The name rules live with the dataset layer's name cleaning
+(2_dataset_final_folder/clean_names.py) and are passed in: PIIScrubber and
+default_scrubber take that module (its lexicon, punctuation sets and
+trailing_name_tokens), so this module imports nothing from the dataset folder.
+
+scrub() returns the scrubbed text, the removed spans as (start, end, kind)
+offsets into the input, and the city; scrub_many/scrub_series do the same for
+a page or a whole column, and city() finds only the city.
+default_scrubber(name_rules) is the process-wide instance, built on first use
+(the gazetteer regex takes a moment to compile).
+
+Differences from the old chain, on purpose: "by <Name>" is only removed
+before whole capitalized words, and "from" no longer starts a byline (the old
+rule was case-insensitive and ate whole sentences after "from": "from
+android to apple ..."; what follows "from" is a brand or month far more often
+than a reviewer). Names are matched on the raw text, before emoji/symbol
+removal.
+
+Usage:
+    python pii_scrubber.py "Nice phone READ MORE Rahul Sharma , Pune District 9876543210"
+"""
+
+import os
+import re
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+import pandas as pd
+
+from text_cleaner import ARTIFACT_RULES, BASIC_RULES, DIGIT_RE, MONTHS
+
+Scrubbed = namedtuple('Scrubbed', 'text spans city')
+
+# Words never accepted as (part of) a city (the old scrapers' _extract_city noise list)
+CITY_NOISE = ('certified', 'buyer', 'verified', 'purchase', 'read', 'more', 'report', 'abuse', 'helpful',
+              'permalink', 'storage', 'color', 'customer', 'flipkart', 'review', 'rating', 'seller')
+CITY_NOISE_RE = re.compile('|'.join(CITY_NOISE), re.IGNORECASE)
+TIDY_RULES = BASIC_RULES + ARTIFACT_RULES
+CAPITALIZED = r'[A-Z][a-z]+'
+PLACE = CAPITALIZED + r'(?:\s+' + CAPITALIZED + r')*(?:\s+(?:District|Division|City))?'
+
+
+def trie_pattern(words):
+    """Regex matching exactly `words`, shaped as their prefix trie"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')' + ('?' if '' in node else '')
+
+    return emit(trie)
+
+
+def pii_pattern(remove_dates=True, digits=True, commas=True):
+    """The fused alternation; earlier alternatives win at the same position.
+
+    Kinds that need a digit or a comma are left out when the text has none,
+    so the scan does not try them at every word.
+    """
+    # Every kind but ", City" starts a word, so one \b in front rejects most positions at once
+    at_word_start = []
+    if commas:
+        # "FirstName LastName , City/District" (the reviewer's signature)
+        at_word_start.append(rf'(?P<signature>{CAPITALIZED}(?:\s+{CAPITALIZED}){{1,3}}\s*,\s*(?P<signature_city>{PLACE}))')
+    at_word_start += [
+        r'(?P<customer>(?i:Flipkart\s+Customer))',
+        rf'(?P<byline>(?i:reviewed\s+by|posted\s+by|by)\s+{CAPITALIZED}(?:\s+{CAPITALIZED})*\b)',
+    ]
+    if digits:
+        at_word_start += [r'(?P<phone>\d{10,}\b)', rf'(?P<date>(?i:{MONTHS})[,\s]+\d{{4}})']
+    if digits and remove_dates:
+        at_word_start.append(r'(?P<relative_date>\d+\s*(?i:months?|weeks?|days?|years?|hours?)\s*(?i:ago))')
+    at_word_start += [
+        rf'(?P<name>{CAPITALIZED}\s+{CAPITALIZED}(?:\s+{CAPITALIZED})?\b)',
+        r'(?P<caps>[A-Z][A-Z]+(?:\s+[A-Z]+)*\b)',
+    ]
+    pattern = r'\b(?:' + '|'.join(at_word_start) + ')'
+    if commas:
+        pattern += rf'|(?P<city>,\s*(?P<city_name>{PLACE})\s*$)'
+    return re.compile(pattern)
+
+
+class PIIScrubber:
+    def __init__(self, name_rules, names=None, remove_dates=True):
+        """name_rules: the clean_names module; names: the gazetteer (default: lexicon names that are not English words)"""
+        self.name_rules = name_rules
+        if names is None:
+            names = [n for n in name_rules.LEXICON.names if n not in name_rules.ENGLISH]
+        self.patterns = {(digits, commas): pii_pattern(remove_dates, digits, commas)
+                         for digits in (False, True) for commas in (False, True)}
+        self.gazetteer = re.compile(trie_pattern(names))
+
+    def _scan(self, text):
+        """(spans, city) from the fused pattern"""
+        spans = []
+        city = None
+        pattern = self.patterns[DIGIT_RE.search(text) is not None, ',' in text]
+        for match in pattern.finditer(text):
+            kind = match.lastgroup
+            spans.append((match.start(), match.end(), kind))
+            if kind == 'signature' or kind == 'city':
+                found = match.group(kind + '_city' if kind == 'signature' else 'city_name')
+                if len(found) > 2 and not CITY_NOISE_RE.search(found):
+                    city = found
+        return spans, city
+
+    def city(self, text):
+        """The city scrub() would report for `text`, without building the scrubbed text"""
+        return self._scan(text)[1]
+
+    def scrub(self, text):
+        """Scrubbed(text, spans, city) for one review; spans are (start, end, kind) in `text`"""
+        spans, city = self._scan(text)
+        name = self._trailing_name(text, spans)
+        if name:
+            spans.append(name)
+            spans.sort()
+        kept = []
+        pos = 0
+        for start, end, _ in spans:
+            kept.append(text[pos:start])
+            pos = end
+        kept.append(text[pos:])
+        cleaned = self._tidy(''.join(kept))
+        if name:
+            cleaned = cleaned.rstrip(self.name_rules.TAIL_PUNCT)
+        return Scrubbed(cleaned, spans, city)
+
+    def _tidy(self, text):
+        # For ASCII text the first basic rule only turns whitespace runs into
+        # spaces, which the final whitespace rule does anyway
+        for rule in TIDY_RULES[text.isascii():]:
+            if rule.applies(text):
+                text = rule.sub(rule.repl, text)
+        return text.strip()
+
+    def _trailing_name(self, text, spans):
+        """(start, end, kind) of 2-3 name tokens ending the kept text, else None"""
+        words = []
+        end = len(text)
+        # The last five kept tokens are enough for the rules; walk the gaps backwards
+        for start, stop, _ in reversed([(0, 0, None)] + spans):
+            need = 5 - len(words)
+            words[:0] = text[stop:end].rsplit(None, need)[-need:]
+            if len(words) == 5:
+                break
+            end = start
+        if len(words) < 3 or words[-1].endswith('...'):
+            return None
+
+        stop = spans[-1][1] if spans else 0
+        tail = text[stop:].rstrip()
+        token_punct = self.name_rules.TOKEN_PUNCT
+        for count in (3, 2):
+            names = tail.rsplit(None, count)[-count:]
+            if len(names) == count and len(words) > count and \
+                    all(self.gazetteer.fullmatch(w.lower().strip(token_punct)) for w in names):
+                kind = 'gazetteer'
+                break
+        else:
+            count = self.name_rules.trailing_name_tokens(words)
+            kind = 'trailing_name'
+            # A name is only removed whole: all its tokens in the last kept stretch
+            if not count or len(tail.rsplit(None, count)) < count:
+                return None
+        name = tail.rsplit(None, count)[-count:]
+        start = len(tail) - len(name[-1])
+        for word in reversed(name[:-1]):
+            start = tail.rindex(word, 0, start)
+        return stop + start, stop + len(tail), kind
+
+    def scrub_many(self, texts):
+        """Scrub a page's worth of strings"""
+        return [self.scrub(text) for text in texts]
+
+    def scrub_series(self, series):
+        """DataFrame(text, city, spans) for a column; non-strings pass through untouched"""
+        results = [self.scrub(value) if isinstance(value, str) else Scrubbed(value, [], None)
+                   for value in series]
+        return pd.DataFrame(results, index=series.index, columns=Scrubbed._fields)[['text', 'city', 'spans']]
+
+
+@lru_cache(maxsize=None)
+def default_scrubber(name_rules):
+    """The shared PIIScrubber for these name rules (gazetteer from their lexicon), compiled on first use"""
+    return PIIScrubber(name_rules)
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '2_dataset_final_folder'))
+    import clean_names
+    scrubber = default_scrubber(clean_names)
+    for arg in sys.argv[1:]:
+        result = scrubber.scrub(arg)
+        print(f"🧹 {result.text!r} (city: {result.city})")
+        for start, end, kind in result.spans:
+            print(f"   {kind:14s} {arg[start:end]!r}")
@@ -0,0 +1,255 @@
+"""Concurrent page fetching under a per-host politeness budget
+
+AdaptiveRateLimiter paces requests AIMD-style from what the server reports
+back; SharedSlotLimiter does the same while taking its request slots from a
+store shared by several processes (the sharded crawl's checkpoint database).
+PoliteSession waits on the limiter before every HTTP request (retries
+included) and feeds each outcome back to it, and ConcurrentPageFetcher keeps a
+few pages in flight on a thread pool while the caller parses/saves earlier
+pages.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from itertools import islice
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import crawl_telemetry
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """AIMD request pacing: speed up additively while the server is healthy, back off multiplicatively when it isn't.
+
+    * 2xx/3xx/404 with latency near the best seen -> rate += increase
+    * latency well above that baseline (server queueing) -> rate *= 0.9
+    * 429 / 503 and every other 4xx (403 is Flipkart's anti-bot block, 408 a
+      request the server gave up on) -> rate *= decrease, and nothing is sent
+      until Retry-After has passed
+    * other 5xx and connection errors -> rate *= 0.75
+
+    Requests are handed out as evenly spaced slots (1/rate apart, +-jitter),
+    so concurrent callers never burst. The rate stays within [min_rate, max_rate].
+    """
+
+    def __init__(self, rate, min_rate, max_rate, increase=None, decrease=0.5,
+                 slow_factor=2.0, jitter=0.2):
+        self.rate = float(rate)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase = float(increase) if increase else self.rate * 0.05
+        self.decrease = decrease
+        self.slow_factor = slow_factor
+        self.jitter = jitter
+        self.latency = None        # EWMA of response latency
+        self.base_latency = None   # best latency seen: the healthy baseline
+        self.throttled = 0         # pushback responses seen: 429, 503, 4xx but 404
+        self.errors = 0            # other 5xx + connection errors
+        self._next_slot = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_delay(cls, min_delay, max_delay, **kwargs):
+        """Start at the average of random.uniform(min_delay, max_delay) spacing.
+
+        Healthy servers can earn up to one request per min_delay / 2; under
+        pushback the spacing can stretch to 8x the starting one.
+        """
+        rate = 2.0 / (min_delay + max_delay)
+        return cls(rate, min_rate=rate / 8, max_rate=2.0 / min_delay, **kwargs)
+
+    def acquire(self):
+        """Block until this caller's slot; returns the seconds spent waiting"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot, self._blocked_until)
+            spacing = 1.0 / self.rate
+            if self.jitter:
+                spacing *= random.uniform(1 - self.jitter, 1 + self.jitter)
+            self._next_slot = slot + spacing
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return max(0.0, wait)
+
+    def _set_rate(self, rate):
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+
+    def record(self, status, latency, retry_after=None):
+        """Feed back one response: HTTP status, seconds it took, raw Retry-After header"""
+        with self._lock:
+            if status == 503 or (400 <= status < 500 and status != 404):
+                self.throttled += 1
+                self._set_rate(self.rate * self.decrease)
+                wait = parse_retry_after(retry_after)
+                if wait:
+                    self._blocked_until = max(self._blocked_until, time.monotonic() + wait)
+                return
+            if status >= 500:
+                self.errors += 1
+                self._set_rate(self.rate * 0.75)
+                return
+
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            if self.base_latency is None or latency < self.base_latency:
+                self.base_latency = latency
+            if self.latency > self.slow_factor * self.base_latency and self.latency > 0.5:
+                self._set_rate(self.rate * 0.9)
+            else:
+                self._set_rate(self.rate + self.increase)
+
+    def record_error(self):
+        """Feed back a request that failed without a response (timeout, reset, DNS)"""
+        with self._lock:
+            self.errors += 1
+            self._set_rate(self.rate * 0.75)
+
+    def per_minute(self):
+        return self.rate * 60.0
+
+    def snapshot(self):
+        """Current controller state, for logs and metrics"""
+        with self._lock:
+            return {
+                'rate_per_min': round(self.rate * 60.0, 2),
+                'spacing_s': round(1.0 / self.rate, 2),
+                'latency_s': round(self.latency, 3) if self.latency is not None else None,
+                'throttled': self.throttled,
+                'errors': self.errors,
+                'blocked_for_s': round(max(0.0, self._blocked_until - time.monotonic()), 1),
+            }
+
+
+class SharedSlotLimiter(AdaptiveRateLimiter):
+    """AdaptiveRateLimiter whose request slots come from a store shared across processes.
+
+    slots: object with claim_slot(host, spacing, not_before) -> unix time and
+    block_host(host, until), e.g. crawl_checkpoint.CrawlCheckpoint. Each
+    process still adapts its own rate to the responses it sees, but every
+    request takes the host's next slot from the store, so N processes send
+    what one would; a Retry-After seen by one of them holds off all of them.
+    """
+
+    def __init__(self, rate, min_rate, max_rate, slots=None, host=None, **kwargs):
+        super().__init__(rate, min_rate, max_rate, **kwargs)
+        self.slots = slots
+        self.host = host
+
+    def acquire(self):
+        with self._lock:
+            spacing = 1.0 / self.rate
+            if self.jitter:
+                spacing *= random.uniform(1 - self.jitter, 1 + self.jitter)
+            # This process's own Retry-After hold, in wall-clock time like the store's slots
+            not_before = time.time() + max(0.0, self._blocked_until - time.monotonic())
+        wait = self.slots.claim_slot(self.host, spacing, not_before) - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        return max(0.0, wait)
+
+    def record(self, status, latency, retry_after=None):
+        super().record(status, latency, retry_after)
+        wait = parse_retry_after(retry_after) if status == 503 or (400 <= status < 500 and status != 404) else None
+        if wait:
+            self.slots.block_host(self.host, time.time() + wait)
+
+
+# One controller per host for the whole process, so every product crawled
+# against the same site shares (and reacts to) one politeness budget
+_shared_limiters = {}
+_shared_lock = threading.Lock()
+
+
+def shared_limiter(host, min_delay, max_delay):
+    """The process-wide AdaptiveRateLimiter for a host (created from the first caller's delays)"""
+    with _shared_lock:
+        limiter = _shared_limiters.get(host)
+        if limiter is None:
+            limiter = _shared_limiters[host] = AdaptiveRateLimiter.from_delay(min_delay, max_delay)
+        return limiter
+
+
+class PoliteSession(requests.Session):
+    """requests.Session that waits on an optional rate limiter before each request and reports the outcome"""
+
+    def __init__(self, rate_limiter=None, pool_size=10, adapter=None):
+        super().__init__()
+        self.rate_limiter = rate_limiter
+        # Sessions given the same adapter share one keep-alive connection pool
+        adapter = adapter or HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        # New connections report DNS/connect time to the page being fetched (see crawl_telemetry)
+        crawl_telemetry.instrument_adapter(adapter)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, *args, **kwargs):
+        limiter = self.rate_limiter
+        if limiter is not None:
+            with crawl_telemetry.stage('wait'):
+                limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = super().request(*args, **kwargs)
+        except requests.exceptions.RequestException:
+            if limiter is not None:
+                limiter.record_error()
+            raise
+        latency = time.monotonic() - started
+        crawl_telemetry.record_response(response, latency)
+        if limiter is not None:
+            limiter.record(response.status_code, latency, response.headers.get('Retry-After'))
+        return response
+
+
+class ConcurrentPageFetcher:
+    """Run fetch_page(url, page) on a thread pool with at most `workers` pages in flight"""
+
+    def __init__(self, fetch_page, workers=4):
+        self.fetch_page = fetch_page
+        self.workers = max(1, int(workers))
+
+    def map(self, page_urls):
+        """Yield (page, result) in input order for an iterable of (page, url) pairs.
+
+        Closing the generator early (e.g. after too many empty pages) cancels
+        everything that has not started yet.
+        """
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        pending = deque()
+        page_urls = iter(page_urls)
+        try:
+            for page, url in islice(page_urls, self.workers):
+                pending.append((page, pool.submit(self.fetch_page, url, page)))
+            while pending:
+                page, future = pending.popleft()
+                result = future.result()
+                for next_page, next_url in islice(page_urls, 1):
+                    pending.append((next_page, pool.submit(self.fetch_page, next_url, next_page)))
+                yield page, result
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def pages_per_minute(pages, started):
+    elapsed = time.monotonic() - started
+    return pages * 60.0 / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,62 @@
+"""Registry of tracked products: review-listing URL, output files, columns, politeness
+
+Every product is crawled by the same engine (flipkart_scraper.py); an entry
+here is all that differs between them. Each folder's simple_scraper.py runs
+the engine on its own product, and crawl_scheduler.py crawls any number of
+registered products together in one process. Tracking another phone is one
+more entry here (and a folder for its CSV).
+"""
+
+import os
+
+SCRAPER_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+BASE_COLUMNS = ['rating', 'title', 'review_text']
+
+
+class Product:
+    def __init__(self, key, folder, name, device, url, max_pages, csv_filename,
+                 columns=BASE_COLUMNS, page_delay=(5, 10), host='www.flipkart.com'):
+        self.key = key  # page store / checkpoint key
+        self.folder = folder  # folder under 1_data_scrapping/ where its CSVs and logs live
+        self.name = name  # listing name shown by the scraper
+        self.device = device  # device name used by the sentiment analysis
+        self.url = url
+        self.max_pages = max_pages  # ceiling only; the listed review count sets the real last page
+        self.csv_filename = csv_filename
+        self.columns = list(columns)  # CSV columns; date and city are extracted for every product
+        self.page_delay = page_delay  # seconds between pages: starting spacing of the adaptive rate controller
+        self.host = host  # every product on this host shares one adaptive rate controller
+
+    @property
+    def directory(self):
+        return os.path.join(SCRAPER_ROOT, self.folder)
+
+    @property
+    def csv_path(self):
+        return os.path.join(self.directory, self.csv_filename)
+
+    @property
+    def replay_filename(self):
+        return self.csv_filename.replace('.csv', '_replay.csv')
+
+    @property
+    def scores_filename(self):
+        return f"{self.key}_scores_stream.csv"  # rows scored by --stream-score
+
+    def __repr__(self):
+        return f"Product({self.key!r}, folder={self.folder!r}, max_pages={self.max_pages})"
+
+
+PRODUCTS = {product.key: product for product in [
+    Product('iphone15', 'iphone15', "Apple iPhone 15 (Black, 128 GB)", 'iPhone 15',
+            "https://www.flipkart.com/apple-iphone-15-black-128-gb/product-reviews/itm6ac6485515ae4?pid=MOBGTAGPTB3VS24W&lid=LSTMOBGTAGPTB3VS24WKFODHL&marketplace=FLIPKART",
+            max_pages=949, csv_filename='iphone15_reviews.csv', page_delay=(5, 10)),
+    Product('iphone16', 'iphone16', "Apple iPhone 16 (Black, 128 GB)", 'iPhone 16',
+            "https://www.flipkart.com/apple-iphone-16-black-128-gb/product-reviews/itmb07d67f995271?pid=MOBH4DQFG8NKFRDY&lid=LSTMOBH4DQFG8NKFRDYKOOGZ6&marketplace=FLIPKART",
+            max_pages=10000, csv_filename='iphone16_reviews.csv',
+            columns=BASE_COLUMNS + ['date', 'city'], page_delay=(10, 15)),
+    Product('iqoo_z10', 'iqoo_zx10', "iQOO Z10 5G (Glacier Silver, 128 GB)", 'iQOO Z10',
+            "https://www.flipkart.com/iqoo-z10-5g-glacier-silver-128-gb/product-reviews/itm14d2be4da59ea?pid=MOBHDG7HR7BFNC4A&lid=LSTMOBHDG7HR7BFNC4AZKRLX8&marketplace=FLIPKART",
+            max_pages=250, csv_filename='iqoo_z10_reviews.csv', page_delay=(4, 8)),
+]}
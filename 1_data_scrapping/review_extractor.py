@@ -0,0 +1,292 @@
+"""Review extraction for Flipkart review pages
+
+Preferred path: the review payload embedded in the page's script state
+(window.__INITIAL_STATE__) is located and decoded once, giving exact rating,
+title, text, date and location without touching the DOM.
+
+Fallback path: single-pass review-card extraction.
+
+The old scrapers called div.get_text() on every <div> in the page, so the text
+of a deeply nested card was re-serialized once per ancestor. Here the document
+is walked once: every stripped text string is appended to one flat list, and
+each <div> only records the [start, end) range of strings it contains. Text is
+joined only for the few divs that pass the cheap checks (rating digit first,
+minimum length), which is all the line heuristics in the scrapers need.
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+from text_cleaner import basic_cleaner
+
+# lxml is much faster than the pure-Python parser; fall back if it's missing
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+TEXT_TYPES = (NavigableString, CData)
+
+# Known Flipkart review-card markup (same selectors the iQOO scraper used)
+CARD_CLASS_RE = re.compile(r'_2wzgFH|EPCmJX|_27M-vq|_1AtVbE')
+RATING_CLASS_RE = re.compile(r'_3LWZlK|XQDdHH|_1BLPMq')
+TITLE_CLASS_RE = re.compile(r'_2-N8zT|z9E0IG')
+TEXT_CLASS_RE = re.compile(r't-ZTKy|qwjRop|_11B6mJ')
+
+
+def make_soup(html):
+    return BeautifulSoup(html, HTML_PARSER)
+
+
+class DivText:
+    """Lazy view of one <div>'s text, equivalent to div.get_text(separator, strip=True)"""
+
+    __slots__ = ('_index', 'start', 'end')
+
+    def __init__(self, index, start, end):
+        self._index = index
+        self.start = start
+        self.end = end
+
+    @property
+    def first_char(self):
+        return self._index.strings[self.start][0] if self.end > self.start else ''
+
+    def text_length(self, separator=''):
+        """len(get_text(separator)) computed from prefix sums, without joining"""
+        count = self.end - self.start
+        if count == 0:
+            return 0
+        prefix = self._index.prefix
+        return prefix[self.end] - prefix[self.start] + len(separator) * (count - 1)
+
+    def get_text(self, separator=''):
+        return separator.join(self._index.strings[self.start:self.end])
+
+
+class DivTextIndex:
+    """One traversal of the document recording the text range of every <div>"""
+
+    def __init__(self, soup):
+        self.strings = []
+        self.prefix = [0]
+        self.spans = []
+        self._walk(soup)
+
+    def _walk(self, root):
+        strings, prefix, spans = self.strings, self.prefix, self.spans
+        stack = [(None, iter(root.children))]
+        while stack:
+            span_slot, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if span_slot is not None:
+                    spans[span_slot] = (spans[span_slot][0], len(strings))
+                continue
+            if isinstance(child, Tag):
+                slot = None
+                if child.name == 'div':
+                    slot = len(spans)
+                    spans.append((len(strings), len(strings)))
+                stack.append((slot, iter(child.children)))
+            elif type(child) in TEXT_TYPES:
+                text = child.strip()
+                if text:
+                    strings.append(text)
+                    prefix.append(prefix[-1] + len(text))
+
+    def __iter__(self):
+        for start, end in self.spans:
+            yield DivText(self, start, end)
+
+    def __len__(self):
+        return len(self.spans)
+
+
+def iter_div_texts(soup):
+    """Yield a DivText for every <div> in document order (same order as soup.find_all('div'))"""
+    return iter(DivTextIndex(soup))
+
+
+def _is_review_card(tag):
+    if tag.name != 'div':
+        return False
+    if tag.has_attr('data-review-id'):
+        return True
+    return any(CARD_CLASS_RE.search(c) for c in tag.get('class', ()))
+
+
+def find_structured_cards(soup):
+    """Return raw fields of review cards found via known markup, or [] if the markup isn't there.
+
+    Each card is a dict with the uncleaned 'rating' (int or None), 'title',
+    'review_text' and 'full_text' (all text in the card, newline-separated).
+    Cards carrying data-review-id take precedence over class-matched blocks.
+    """
+    blocks = soup.find_all(_is_review_card)
+    with_id = [b for b in blocks if b.has_attr('data-review-id')]
+    if with_id:
+        blocks = with_id
+
+    cards = []
+    for block in blocks:
+        rating = None
+        rating_tag = block.find('div', class_=RATING_CLASS_RE)
+        if rating_tag:
+            rating_text = rating_tag.get_text(strip=True)
+            if rating_text and rating_text[0] in '12345':
+                rating = int(rating_text[0])
+
+        title_tag = block.find('p', class_=TITLE_CLASS_RE)
+        review_tag = block.find('div', class_=TEXT_CLASS_RE)
+        cards.append({
+            'rating': rating,
+            'title': title_tag.get_text(strip=True) if title_tag else '',
+            'review_text': review_tag.get_text(strip=True) if review_tag else '',
+            'full_text': block.get_text(separator='\n', strip=True),
+        })
+    return cards
+
+
+# ─── Embedded JSON state ──────────────────────────────────────────────────────
+STATE_RE = re.compile(r'window\.__INITIAL_STATE__\s*=\s*')
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+ABS_DATE_RE = re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*[,\s]+(\d{4})\b', re.IGNORECASE)
+ISO_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-\d{2}')
+REL_DATE_RE = re.compile(r'(\d+)\s*(year|month|week|day|hour)s?\s*ago', re.IGNORECASE)
+
+
+# Header count ("6,583 Reviews", Indian digit grouping) or a count field in the state
+REVIEW_COUNT_RE = re.compile(r'(\d{1,3}(?:,\d{2,3})+|\d+)\s*(?:<[^>]*>\s*)*Reviews\b')
+STATE_COUNT_RE = re.compile(r'"(?:reviewCount|totalReviews|reviewsCount)"\s*:\s*"?(\d+)')
+
+
+def find_review_count(html):
+    """Total number of reviews the product page reports, or None"""
+    m = STATE_COUNT_RE.search(html) or REVIEW_COUNT_RE.search(html)
+    if not m:
+        return None
+    return int(m.group(1).replace(',', ''))
+
+
+def response_time(headers):
+    """Server time of a response from its Date header, or None"""
+    try:
+        return parsedate_to_datetime(headers['Date'])
+    except (KeyError, TypeError, ValueError, IndexError):
+        return None
+
+
+def normalize_text(text):
+    """Basic cleanup for JSON fields: ASCII only, single spaces, basic punctuation"""
+    return basic_cleaner.clean(str(text))
+
+
+def format_review_date(value, fetched_at=None):
+    """Return 'Mon YYYY' for an epoch, ISO or 'Mon, YYYY' value.
+
+    Relative values ('3 months ago') are resolved against the page's fetch
+    time only; without one they are left unresolved (None).
+    """
+    if isinstance(value, (int, float)) and value > 0:
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime('%b %Y')
+    if not isinstance(value, str):
+        return None
+
+    m = ABS_DATE_RE.search(value)
+    if m:
+        return f"{m.group(1).capitalize()} {m.group(2)}"
+    m = ISO_DATE_RE.match(value.strip())
+    if m and 1 <= int(m.group(2)) <= 12:
+        return f"{MONTHS[int(m.group(2)) - 1]} {m.group(1)}"
+
+    m = REL_DATE_RE.search(value)
+    if m and fetched_at is not None:
+        n, unit = int(m.group(1)), m.group(2).lower()
+        months = {'year': 12 * n, 'month': n}.get(unit, 0)
+        days = {'week': 7 * n, 'day': n}.get(unit, 0)
+        ts = fetched_at.timestamp() - days * 86400
+        base = datetime.fromtimestamp(ts, tz=timezone.utc)
+        total = base.year * 12 + base.month - 1 - months
+        return f"{MONTHS[total % 12]} {total // 12}"
+    return None
+
+
+def load_page_state(html):
+    """Decode the embedded window.__INITIAL_STATE__ object, or None if absent/broken"""
+    m = STATE_RE.search(html)
+    if not m:
+        return None
+    try:
+        state, _ = json.JSONDecoder().raw_decode(html, m.end())
+    except ValueError:
+        return None
+    return state
+
+
+def _iter_review_values(state):
+    """Yield every dict in the state tree that looks like a review payload"""
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if node.get('type') == 'ReviewValue' or {'rating', 'title', 'text'} <= node.keys():
+                yield node
+                continue
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def _location_city(location):
+    if isinstance(location, dict):
+        return location.get('city') or location.get('state')
+    if isinstance(location, str):
+        return location.split(',')[0].strip() or None
+    return None
+
+
+def find_state_reviews(html, fetched_at=None):
+    """Reviews from the embedded JSON state, in page order.
+
+    Returns None when the page has no usable state (caller should fall back to
+    the DOM path), otherwise a list of dicts with 'rating', 'title',
+    'review_text', 'date' ('Mon YYYY' or None) and 'city' (or None). Title and
+    text are raw, like the DOM path's cards: the caller scrubs and validates both.
+    """
+    state = load_page_state(html)
+    if state is None:
+        return None
+
+    reviews = []
+    seen_ids = set()
+    for value in _iter_review_values(state):
+        review_id = value.get('id')
+        if review_id is not None:
+            if review_id in seen_ids:
+                continue
+            seen_ids.add(review_id)
+        try:
+            rating = int(float(value.get('rating')))
+        except (TypeError, ValueError):
+            continue
+        text = value.get('text') or value.get('reviewText') or ''
+        if not 1 <= rating <= 5 or not text:
+            continue
+        date_value = next((value[k] for k in ('created', 'createdAt', 'date', 'reviewDate') if value.get(k)), None)
+        city = _location_city(value.get('location'))
+        reviews.append({
+            'rating': rating,
+            'title': str(value.get('title') or ''),
+            'review_text': str(text),
+            'date': format_review_date(date_value, fetched_at),
+            'city': normalize_text(city) if city else None,
+        })
+    return reviews if reviews else None
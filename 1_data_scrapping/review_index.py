@@ -0,0 +1,100 @@
+"""Persistent dedup index for scraped Flipkart reviews"""
+
+import hashlib
+import os
+
+import pandas as pd
+
+
+def make_review_key(rating, title, review_text):
+    """Build the dedup key used by the scrapers: rating + first 30 chars of title and text"""
+    return f"{rating}_{str(title)[:30]}_{str(review_text)[:30]}"
+
+
+class ReviewKeyIndex:
+    """In-memory set of hashed review keys, loaded once and kept in sync with the CSV.
+
+    Keys are stored as 8-byte blake2b digests. The sidecar file (``<csv>.keys``)
+    is a flat append-only list of those digests, so a restart only has to read
+    it back instead of re-parsing the whole CSV. A key is added in memory when
+    its review is accepted, but only reaches the sidecar through flush(keys)
+    once that review is on disk: the sidecar never lists a review that is in
+    neither the CSV nor its journal.
+    """
+
+    DIGEST_SIZE = 8
+
+    def __init__(self, csv_filename, use_key_file=True):
+        self.csv_filename = csv_filename
+        self.key_file = f"{csv_filename}.keys" if use_key_file else None
+        self._digests = set()
+        self._load()
+
+    def _digest(self, key):
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=self.DIGEST_SIZE).digest()
+
+    def _key_file_is_fresh(self):
+        """Key file is usable if it exists and is not older than the CSV it mirrors"""
+        if not self.key_file or not os.path.exists(self.key_file):
+            return False
+        if not os.path.exists(self.csv_filename):
+            return True
+        return os.path.getmtime(self.key_file) >= os.path.getmtime(self.csv_filename)
+
+    def _load(self):
+        if self._key_file_is_fresh():
+            with open(self.key_file, 'rb') as f:
+                data = f.read()
+            size = self.DIGEST_SIZE
+            usable = len(data) - len(data) % size  # ignore a torn trailing write
+            self._digests = {data[i:i + size] for i in range(0, usable, size)}
+            return
+
+        self._digests = set(self._digest(k) for k in self._keys_from_csv())
+        if self.key_file:
+            self._rewrite_key_file()
+
+    def _keys_from_csv(self):
+        """Build keys for every stored review with column ops instead of iterrows()"""
+        try:
+            df = pd.read_csv(self.csv_filename, usecols=['rating', 'title', 'review_text'])
+        except (FileNotFoundError, pd.errors.EmptyDataError, ValueError):
+            return []
+        keys = (df['rating'].astype(str) + '_' +
+                df['title'].astype(str).str[:30] + '_' +
+                df['review_text'].astype(str).str[:30])
+        return keys.tolist()
+
+    def _rewrite_key_file(self):
+        tmp = f"{self.key_file}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(b''.join(self._digests))
+        os.replace(tmp, self.key_file)
+
+    def __contains__(self, key):
+        return self._digest(key) in self._digests
+
+    def __len__(self):
+        return len(self._digests)
+
+    def add(self, key):
+        """Record a key in memory; returns False if it was already present"""
+        digest = self._digest(key)
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        return True
+
+    def discard(self, keys):
+        """Forget keys whose reviews could not be written, so a re-fetch accepts them again"""
+        for key in keys:
+            self._digests.discard(self._digest(key))
+
+    def flush(self, keys):
+        """Append the keys of reviews that were just written to the sidecar file"""
+        if not self.key_file:
+            return
+        with open(self.key_file, 'ab') as f:
+            f.write(b''.join(self._digest(key) for key in keys))
+        # Bump mtime even when nothing was pending so a compacted CSV doesn't look newer
+        os.utime(self.key_file)
@@ -0,0 +1,114 @@
+"""Append-only review journal with compaction into the canonical CSV
+
+Each checkpoint writes only the new reviews as one segment file in
+``<csv stem>_journal/``. Compaction merges the canonical CSV and all segments,
+drops duplicates and atomically replaces the CSV, then removes the merged
+segments. A crash at any point leaves either the old CSV plus its segments or
+the new CSV (plus segments that re-merge as duplicates), so the journal itself
+is the recovery path and no ``*_backup.csv`` copies are needed.
+
+Usage (on-demand compaction):
+    python review_journal.py iphone16_reviews.csv
+"""
+
+import os
+import re
+import sys
+
+import pandas as pd
+
+SEGMENT_RE = re.compile(r'^segment_(\d{6})\.csv$')
+
+
+class ReviewJournal:
+    def __init__(self, csv_filename, columns=None, compact_threshold=20,
+                 dedup_subset=('title', 'review_text')):
+        self.csv_filename = csv_filename
+        self.journal_dir = os.path.splitext(csv_filename)[0] + '_journal'
+        self.columns = list(columns) if columns else None
+        self.compact_threshold = compact_threshold
+        self.dedup_subset = list(dedup_subset)
+        self._canonical_rows = self._count_rows(csv_filename)
+        self._journal_rows = sum(self._count_rows(p) for p in self.segments())
+
+    @staticmethod
+    def _count_rows(path):
+        """Count data rows without parsing the file into a DataFrame"""
+        try:
+            return max(0, len(pd.read_csv(path, usecols=[0])))
+        except (FileNotFoundError, pd.errors.EmptyDataError, ValueError):
+            return 0
+
+    def segments(self):
+        """Segment paths in write order"""
+        if not os.path.isdir(self.journal_dir):
+            return []
+        names = sorted(n for n in os.listdir(self.journal_dir) if SEGMENT_RE.match(n))
+        return [os.path.join(self.journal_dir, n) for n in names]
+
+    def _next_segment_path(self):
+        existing = self.segments()
+        seq = int(SEGMENT_RE.match(os.path.basename(existing[-1])).group(1)) + 1 if existing else 1
+        return os.path.join(self.journal_dir, f'segment_{seq:06d}.csv')
+
+    def count(self):
+        """Rows in the CSV plus rows still in the journal (journal rows are not yet deduped)"""
+        return self._canonical_rows + self._journal_rows
+
+    def append(self, reviews):
+        """Write one checkpoint segment; cost is proportional to len(reviews) only"""
+        if not reviews:
+            return None
+        os.makedirs(self.journal_dir, exist_ok=True)
+        df = pd.DataFrame(reviews, columns=self.columns)
+        path = self._next_segment_path()
+        tmp = path + '.tmp'
+        df.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+        self._journal_rows += len(df)
+        return path
+
+    def maybe_compact(self):
+        """Compact once the number of pending segments reaches the threshold"""
+        if len(self.segments()) >= self.compact_threshold:
+            return self.compact()
+        return self.count()
+
+    def read_all(self):
+        """Canonical CSV plus all pending segments, deduplicated"""
+        frames = []
+        for path in [self.csv_filename] + self.segments():
+            try:
+                frames.append(pd.read_csv(path))
+            except (FileNotFoundError, pd.errors.EmptyDataError):
+                continue
+        if not frames:
+            return pd.DataFrame(columns=self.columns)
+        combined = pd.concat(frames, ignore_index=True)
+        subset = [c for c in self.dedup_subset if c in combined.columns]
+        if subset:
+            combined = combined.drop_duplicates(subset=subset, keep='first')
+        return combined
+
+    def compact(self):
+        """Merge all segments into the canonical CSV and remove them"""
+        segments = self.segments()
+        if not segments:
+            return self.count()
+        combined = self.read_all()
+        tmp = self.csv_filename + '.tmp'
+        combined.to_csv(tmp, index=False)
+        os.replace(tmp, self.csv_filename)
+        for path in segments:
+            os.remove(path)
+        self._canonical_rows = len(combined)
+        self._journal_rows = 0
+        return self._canonical_rows
+
+
+if __name__ == '__main__':
+    for csv_filename in sys.argv[1:]:
+        journal = ReviewJournal(csv_filename)
+        pending = len(journal.segments())
+        total = journal.compact()
+        print(f"{csv_filename}: merged {pending} segments, {total} reviews")
@@ -0,0 +1,99 @@
+"""Background persistence for the scrapers: a bounded queue of pages and one writer thread
+
+The crawl loop used to keep every review since the last checkpoint in
+memory and, every 5 pages, stop to write them (and, past the compaction
+threshold, rewrite the whole CSV) before fetching on. Here the loop hands
+each finished page to BackgroundWriter.submit and moves on; the writer
+thread gathers up to `batch_pages` pages (or whatever arrived within
+`max_wait` seconds) and persists them with the scraper's write_batch, which
+writes the reviews first and only then marks the pages finished in the
+checkpoint database, so a crash re-fetches exactly the unwritten pages.
+
+Memory stays flat: at most `maxsize` queued pages plus one batch are held,
+however long the crawl. If the disk falls behind, a full queue blocks the
+crawl (backpressure) instead of buffering without limit; the time spent
+blocked is reported. close() writes everything still queued, so the
+scrapers' Ctrl+C path (save_to_csv) loses nothing that was fetched.
+"""
+
+import queue
+import threading
+import time
+
+
+class BackgroundWriter:
+    def __init__(self, write_batch, maxsize=8, batch_pages=5, max_wait=10.0):
+        """write_batch(reviews, pages) persists one batch; pages are (page, reviews, sha256) entries"""
+        self.write_batch = write_batch
+        self.batch_pages = batch_pages
+        self.max_wait = max_wait
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.pages = 0
+        self.reviews = 0
+        self.batches = 0
+        self.busy = 0.0  # seconds spent writing
+        self.blocked = 0.0  # seconds the crawl waited on a full queue
+        self.max_depth = 0
+        self.error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='review-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, entry, reviews):
+        """Queue one finished page; blocks while `maxsize` pages are waiting to be written"""
+        started = time.monotonic()
+        self.queue.put((entry, list(reviews or ())))
+        self.blocked += time.monotonic() - started
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def _next_batch(self):
+        """Block for one page, then take more until the batch is full or max_wait has passed"""
+        first = self.queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_pages:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        done = False
+        while not done:
+            batch, done = self._next_batch()
+            if not batch:
+                continue
+            entries = [entry for entry, _ in batch]
+            reviews = [review for _, page_reviews in batch for review in page_reviews]
+            started = time.monotonic()
+            try:
+                self.write_batch(reviews, entries)
+            except Exception as e:
+                # Keep draining: a failed write must never leave the crawl blocked on a full queue;
+                # its pages stay unfinished in the checkpoint and are fetched again next run
+                self.error = e
+            self.busy += time.monotonic() - started
+            self.batches += 1
+            self.pages += len(entries)
+            self.reviews += len(reviews)
+
+    def close(self):
+        """Write everything still queued and stop the thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(None)
+        self._thread.join()
+
+    def report(self):
+        line = (f"{self.pages} pages / {self.reviews} reviews in {self.batches} batches, "
+                f"writing {self.busy:.1f}s, crawl blocked {self.blocked:.1f}s, max queue {self.max_depth}")
+        if self.error is not None:
+            line += f", last error: {self.error}"
+        return line
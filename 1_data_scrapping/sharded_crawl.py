@@ -0,0 +1,205 @@
+"""Sharded crawling: N worker processes, on one or several machines, over a shared page queue
+
+Running two scrapers from opposite ends of the page range (reverse=True) by
+hand is replaced by a work queue: every worker claims pages from the same
+checkpoint database (crawl_checkpoint.py) under a lease it renews from a
+heartbeat thread. A worker that dies stops renewing; once its lease expires
+(--lease seconds) the other workers re-claim its pages, and pages that failed
+on one worker are retried by another.
+
+Each worker writes to its own shard: a private folder
+<shard dir>/<product>/<worker>/ holding that worker's CSV, journal, logs and
+telemetry, so workers never write the same file. `merge` folds every shard
+into the product's CSV through its review journal (the same dedup on
+title + review_text as every checkpoint) and removes the merged shards.
+
+Several machines: put the database and shard dir on a shared filesystem and
+pass --shared-fs, which switches SQLite from WAL (one host only) to the
+rollback journal, whose file locks work across NFS/SMB clients.
+
+All workers share one politeness budget per host: each request takes the
+host's next slot from the checkpoint database (polite_fetch.SharedSlotLimiter),
+so N workers together send one scraper's request rate, and a Retry-After seen
+by one holds off all of them. More workers hide each other's parse/save time
+and take over dead workers' pages; they do not add load on the site.
+
+Usage:
+    python sharded_crawl.py work iphone16 --processes 3          # 3 local workers
+    python sharded_crawl.py work iphone16 --db /mnt/crawl/state.sqlite --shard-dir /mnt/crawl/shards --shared-fs
+    python sharded_crawl.py status iphone16
+    python sharded_crawl.py merge iphone16                       # after the workers are done
+"""
+
+import argparse
+import contextlib
+import glob
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import threading
+
+import pandas as pd
+
+from crawl_checkpoint import DEFAULT_DB, FINISHED, CrawlCheckpoint, default_worker_id
+from flipkart_scraper import FlipkartScraper
+from polite_fetch import SharedSlotLimiter
+from products import PRODUCTS
+from review_journal import ReviewJournal
+
+DEFAULT_SHARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'shards')
+DEFAULT_LEASE = 120  # seconds without a heartbeat before a worker's pages are re-queued
+
+
+def shard_dirs(shard_root, product):
+    return sorted(d for d in glob.glob(os.path.join(shard_root, product.key, '*')) if os.path.isdir(d))
+
+
+class Heartbeat:
+    """Renews a worker's leases every `interval` seconds until stopped"""
+
+    def __init__(self, checkpoint, interval):
+        self.checkpoint = checkpoint
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='lease-heartbeat', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.checkpoint.renew()
+            except Exception:
+                pass  # a missed beat only shortens the lease; the next one retries
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(product_key, db_path, shard_root, lease, shared_fs=False, workers=1, verbose=False):
+    """One worker: claim leased pages until the range is done; returns (worker, pages, reviews)"""
+    product = PRODUCTS[product_key]
+    worker = default_worker_id()
+    workdir = os.path.join(shard_root, product.key, re.sub(r'[^\w.-]', '_', worker))
+    os.makedirs(workdir, exist_ok=True)
+
+    scraper = FlipkartScraper(product, workdir=workdir)
+    scraper.checkpoint.close()
+    scraper.checkpoint = CrawlCheckpoint(product.key, db_path, worker=worker, lease=lease, wal=not shared_fs)
+    scraper.shared_queue = True
+    # The host budget lives in the shared database, not in this process
+    scraper.session.rate_limiter = SharedSlotLimiter.from_delay(*product.page_delay, slots=scraper.checkpoint,
+                                                                host=product.host)
+    scraper.log_progress("=" * 60)
+    scraper.log_progress(f"Shard worker {worker} started (lease {lease}s, db {db_path})")
+    heartbeat = Heartbeat(scraper.checkpoint, lease / 3)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(sys.stdout if verbose else devnull):
+        try:
+            scraper.scrape_reviews(product.url, max_pages=product.max_pages,
+                                   start_page=scraper.resume_page(), workers=workers)
+            scraper.finish_crawl()
+        except KeyboardInterrupt:
+            scraper.log_progress("Shard worker interrupted")
+            scraper.finish_crawl()
+        finally:
+            heartbeat.stop()
+            # Unsaved claims go straight back to the queue instead of waiting out the lease
+            scraper.checkpoint.release()
+    finished = [counts for status, counts in scraper.checkpoint.counts(worker).items() if status in FINISHED]
+    scraper.checkpoint.close()
+    return worker, sum(pages for pages, _ in finished), sum(reviews for _, reviews in finished)
+
+
+def merge_shards(product, shard_root, keep=False):
+    """Fold every shard of a product into its CSV with the journal's dedup; returns (shard rows, total)"""
+    frames = []
+    merged = []
+    for directory in shard_dirs(shard_root, product):
+        shard_csv = os.path.join(directory, product.csv_filename)
+        # The shard's CSV plus any journal segments its worker had not compacted yet
+        df = ReviewJournal(shard_csv, columns=product.columns).read_all()
+        if not df.empty:
+            frames.append(df)
+        merged.append(directory)
+    shard_rows = sum(len(df) for df in frames)
+
+    journal = ReviewJournal(product.csv_path, columns=product.columns)
+    if frames:
+        combined = pd.concat(frames, ignore_index=True)
+        journal.append(combined.to_dict('records'))
+    total = journal.compact()
+    if not keep:
+        for directory in merged:
+            shutil.rmtree(directory)
+    return shard_rows, total
+
+
+def print_status(product, db_path, shard_root, shared_fs=False):
+    checkpoint = CrawlCheckpoint(product.key, db_path, wal=not shared_fs)
+    counts = checkpoint.counts()
+    summary = ', '.join(f"{status}={pages}" for status, (pages, _) in sorted(counts.items())) or 'no pages yet'
+    print(f"{product.key}: {summary}; resume at page {checkpoint.resume_page()}")
+    active = checkpoint.active_workers()
+    print(f"Live workers: {', '.join(f'{w} ({n} pages)' for w, n in sorted(active.items())) or 'none'}")
+    for directory in shard_dirs(shard_root, product):
+        csv_path = os.path.join(directory, product.csv_filename)
+        rows = ReviewJournal(csv_path).count()
+        print(f"  shard {os.path.basename(directory)}: {rows} reviews")
+    checkpoint.close()
+    return active
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded crawl over a shared page queue")
+    parser.add_argument('command', choices=['work', 'status', 'merge'])
+    parser.add_argument('product', choices=sorted(PRODUCTS))
+    parser.add_argument('--db', default=DEFAULT_DB, help="checkpoint database every worker shares")
+    parser.add_argument('--shard-dir', default=DEFAULT_SHARD_DIR, help="where each worker writes its shard")
+    parser.add_argument('--shared-fs', action='store_true',
+                        help="database on a network filesystem (workers on several machines)")
+    parser.add_argument('--lease', type=float, default=DEFAULT_LEASE,
+                        help="seconds without a heartbeat before a worker's pages are re-queued")
+    parser.add_argument('--processes', type=int, default=1, help="worker processes to start on this machine")
+    parser.add_argument('--workers', type=int, default=1, help="pages in flight per worker process")
+    parser.add_argument('--verbose', action='store_true', help="show the scrapers' per-page output")
+    parser.add_argument('--keep-shards', action='store_true', help="merge without deleting the shards")
+    parser.add_argument('--force', action='store_true', help="merge even while workers hold live leases")
+    args = parser.parse_args()
+    product = PRODUCTS[args.product]
+
+    if args.command == 'status':
+        print_status(product, args.db, args.shard_dir, args.shared_fs)
+        return
+
+    if args.command == 'merge':
+        active = print_status(product, args.db, args.shard_dir, args.shared_fs)
+        if active and not args.force:
+            print("⚠ Workers still hold live leases; merge after they finish (or pass --force)")
+            return
+        shard_rows, total = merge_shards(product, args.shard_dir, keep=args.keep_shards)
+        print(f"✅ Merged {shard_rows} shard reviews -> {total} reviews in {product.csv_filename}")
+        return
+
+    print(f"Starting {args.processes} shard worker(s) for {product.key} (lease {args.lease:.0f}s)")
+    worker_args = (product.key, args.db, args.shard_dir, args.lease, args.shared_fs, args.workers, args.verbose)
+    if args.processes == 1:
+        results = [run_worker(*worker_args)]
+    else:
+        with multiprocessing.Pool(args.processes) as pool:
+            try:
+                results = pool.starmap(run_worker, [worker_args] * args.processes)
+            except KeyboardInterrupt:
+                # Every worker got the Ctrl+C too: each saves its shard and releases its claims
+                pool.close()
+                pool.join()
+                raise
+    for worker, pages, reviews in results:
+        print(f"  {worker}: {pages} pages, {reviews} reviews")
+    print(f"\nNext: python sharded_crawl.py merge {product.key}" +
+          (f" --shard-dir {args.shard_dir}" if args.shard_dir != DEFAULT_SHARD_DIR else ''))
+
+
+if __name__ == '__main__':
+    main()
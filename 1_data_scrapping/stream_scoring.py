@@ -0,0 +1,200 @@
+"""Streaming scrape-to-score: reviews are cleaned and scored while the crawl runs
+
+Each page's accepted reviews are put on a bounded queue; one consumer thread
+strips trailing reviewer names (2_dataset_final_folder/clean_names.py) and
+scores them with the same VADER / BERT / keyword-proxy code as
+compare_methods_v2.py (3_sentimental_analysis/YS/sentiment_methods.py). The
+crawl spends most of its time waiting for the rate controller's next slot, so
+scoring happens inside those waits instead of in a separate pass afterwards.
+
+A full queue blocks the crawl (backpressure) rather than buffering without
+limit. Scored rows are appended to a CSV as they are produced, and running
+metrics per method (accuracy, macro-F1, RMSE, Pearson r against the star
+rating) are ready as soon as close() returns. Spearman's rho needs the whole
+ranking, so it is left to compare_methods_v2.py.
+"""
+
+import math
+import os
+import queue
+import sys
+import threading
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, '2_dataset_final_folder'))
+sys.path.insert(0, os.path.join(ROOT, '3_sentimental_analysis', 'YS'))
+from clean_names import strip_trailing_name
+from sentiment_methods import LABELS, METHODS, RUNNERS, rating_to_label, run_bert
+
+# CLI keys -> method names in sentiment_methods.METHODS
+METHOD_KEYS = {'vader': 'VADER', 'bert': 'BERT', 'wc': 'Word Cloud'}
+DEFAULT_METHODS = ('vader', 'wc')  # BERT is opt-in: it needs torch and a model download
+
+
+class RunningMetrics:
+    """Sums that give compare_methods_v2's per-method metrics without keeping the rows"""
+
+    def __init__(self):
+        self.n = 0
+        self.confusion = {}  # (true_label, predicted_label) -> count
+        self.sx = self.sy = self.sxx = self.syy = self.sxy = self.sse = 0.0
+
+    def update(self, df, label_col, rating_col):
+        valid = df[[label_col, rating_col, 'true_label', 'rating']].dropna()
+        if valid.empty:
+            return
+        for key, count in valid.groupby(['true_label', label_col]).size().items():
+            self.confusion[key] = self.confusion.get(key, 0) + int(count)
+        x = valid['rating'].to_numpy(dtype=float)
+        y = valid[rating_col].to_numpy(dtype=float)
+        self.n += len(valid)
+        self.sx += x.sum()
+        self.sy += y.sum()
+        self.sxx += (x * x).sum()
+        self.syy += (y * y).sum()
+        self.sxy += (x * y).sum()
+        self.sse += ((x - y) ** 2).sum()
+
+    def result(self):
+        if not self.n:
+            return {}
+        correct = sum(c for (t, p), c in self.confusion.items() if t == p)
+        # Macro-F1 over the labels present in truth or prediction (as sklearn does)
+        f1s = []
+        for label in {t for t, _ in self.confusion} | {p for _, p in self.confusion}:
+            tp = self.confusion.get((label, label), 0)
+            true_n = sum(c for (t, _), c in self.confusion.items() if t == label)
+            pred_n = sum(c for (_, p), c in self.confusion.items() if p == label)
+            f1s.append(2 * tp / (true_n + pred_n) if true_n + pred_n else 0.0)
+
+        n = self.n
+        cov = self.sxy - self.sx * self.sy / n
+        var_x = self.sxx - self.sx ** 2 / n
+        var_y = self.syy - self.sy ** 2 / n
+        pearson = cov / math.sqrt(var_x * var_y) if var_x > 0 and var_y > 0 else float('nan')
+        return {
+            'N': n,
+            'Accuracy': round(correct / n, 4),
+            'Macro_F1': round(sum(f1s) / len(f1s), 4),
+            'RMSE': round(math.sqrt(self.sse / n), 4),
+            'Pearson_r': round(pearson, 4),
+        }
+
+
+class StreamingScorer:
+    """Bounded queue of review pages with one background cleaning/scoring consumer"""
+
+    def __init__(self, device, output, methods=DEFAULT_METHODS, maxsize=8):
+        self.device = device
+        self.output = output
+        names = {METHOD_KEYS[m] for m in methods}
+        self.methods = [m for m in METHODS if m[0] in names]
+        self.metrics = {name: RunningMetrics() for name, _, _ in self.methods}
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.seen = set()  # (title, review_text), same key the journal dedups on
+        self.pages = 0
+        self.scored = 0
+        self.busy = 0.0  # seconds the consumer spent cleaning and scoring
+        self.blocked = 0.0  # seconds the crawl waited on a full queue
+        self.max_depth = 0
+        self.drain_seconds = 0.0  # time close() waited for the backlog after the crawl ended
+        self.error = None
+        self._write_header = not os.path.exists(output)
+        self._thread = threading.Thread(target=self._run, name='stream-scorer', daemon=True)
+        self._thread.start()
+
+    def submit(self, reviews):
+        """Queue one page's reviews; blocks while the consumer is `maxsize` pages behind"""
+        if not reviews:
+            return
+        started = time.monotonic()
+        self.queue.put(list(reviews))
+        self.blocked += time.monotonic() - started
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def _run(self):
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                return
+            started = time.monotonic()
+            try:
+                self.score_batch(batch)
+            except Exception as e:
+                # Keep draining: a scoring bug must never stall the crawl on a full queue
+                self.error = e
+            self.busy += time.monotonic() - started
+
+    def score_batch(self, reviews):
+        """Clean, score and record one page of reviews; returns the scored rows"""
+        df = pd.DataFrame(reviews)
+        if 'title' not in df.columns:
+            df['title'] = ''
+        keys = list(zip(df['title'], df['review_text']))
+        fresh = [key not in self.seen for key in keys]
+        self.seen.update(keys)
+        df = df[fresh].drop_duplicates(subset=['title', 'review_text']).copy()
+
+        df['review_text'] = df['review_text'].map(strip_trailing_name)
+        df = df[df['review_text'].fillna('').str.strip() != '']
+        df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+        df = df.dropna(subset=['rating'])
+        df['rating'] = df['rating'].astype(int).clip(1, 5)
+        df.insert(0, 'device', self.device)
+        df['true_label'] = df['rating'].apply(rating_to_label)
+        if df.empty:
+            return df
+
+        for name, label_col, rating_col in self.methods:
+            df = run_bert(df, progress=False) if name == 'BERT' else RUNNERS[name](df)
+            self.metrics[name].update(df, label_col, rating_col)
+
+        df.to_csv(self.output, mode='a', header=self._write_header, index=False, encoding='utf-8')
+        self._write_header = False
+        self.pages += 1
+        self.scored += len(df)
+        return df
+
+    def summary(self):
+        """Running metrics per method, as in compare_methods_v2's summary table"""
+        rows = []
+        for name, _, _ in self.methods:
+            result = self.metrics[name].result()
+            if result:
+                rows.append({'Method': name, 'Device': self.device, **result})
+        return pd.DataFrame(rows)
+
+    def label_counts(self):
+        """Predicted label counts per method so far"""
+        counts = {}
+        for name, _, _ in self.methods:
+            confusion = self.metrics[name].confusion
+            counts[name] = {label: sum(c for (_, p), c in confusion.items() if p == label) for label in LABELS}
+        return counts
+
+    def close(self):
+        """Score whatever is still queued, stop the consumer and return the summary"""
+        started = time.monotonic()
+        self.queue.put(None)
+        self._thread.join()
+        self.drain_seconds = time.monotonic() - started
+        return self.summary()
+
+
+def print_report(scorer):
+    """Console summary printed by the scrapers when a streaming crawl ends"""
+    print(f"\n{'='*60}")
+    print(f"STREAMING SENTIMENT ({scorer.device})")
+    print(f"{'='*60}")
+    print(f"Scored {scorer.scored} reviews from {scorer.pages} pages -> {scorer.output}")
+    print(f"Scoring time: {scorer.busy:.1f}s (crawl blocked {scorer.blocked:.1f}s on a full queue, "
+          f"{scorer.drain_seconds:.1f}s to drain at the end, max queue depth {scorer.max_depth})")
+    if scorer.error is not None:
+        print(f"⚠ Some pages were not scored: {scorer.error}")
+    summary = scorer.summary()
+    if not summary.empty:
+        print(summary.to_string(index=False))
+    print(f"{'='*60}")
@@ -1,6 +1,4 @@
 # -*- coding: utf-8 -*-
-import sys, io
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 """
 Clean reviewer names appended at the end of the 'text' column in CSV files.
 
@@ -14,7 +12,7 @@ space-separated with no punctuation. Examples:
 CONSERVATIVE APPROACH (avoids over-stripping):
   Strip only if the last 2 tokens satisfy ALL of:
     1. Both are alphabetic-only lowercase words (2-20 chars each)
-    2. Neither word is in a large English dictionary blocklist
+    2. Neither word is in the English dictionary (lexicon.py)
     3. The word just BEFORE the 2-token block either:
        a. ends with punctuation (.,!?:;), OR
        b. is itself a non-name token (content word)
@@ -23,147 +21,100 @@ CONSERVATIVE APPROACH (avoids over-stripping):
   
   We also handle 3-word names (e.g., "amit kumar singh") but require
   that the word before the 3-token block ends with punctuation.
+
+Files are streamed in chunks (bounded memory) from the raw inputs to cleaned
+outputs, never rewritten in place: by default every *_before_name_clean.csv
+next to this script is cleaned into the same name without the suffix. Several
+files are cleaned in parallel, and a file is skipped when its content hash,
+CLEANER_VERSION and the lexicon digest match the manifest in the output directory.
+
+Usage:
+    python clean_names.py                                  # raw exports -> iphone15.csv, ...
+    python clean_names.py "exports/*.csv" --output-dir cleaned --processes 4
+    python clean_names.py --force                          # ignore the manifest
 """
 
+import argparse
+import glob
+import hashlib
+import io
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import re
 import os
-import shutil
 
-# ── File paths ───────────────────────────────────────────────────────────────
-FILES = [
-    r"c:\Users\Simmon\Desktop\p3\ai_prediction_system_yash\2_dataset_final_folder\iphone15.csv",
-    r"c:\Users\Simmon\Desktop\p3\ai_prediction_system_yash\2_dataset_final_folder\iphone16.csv",
-    r"c:\Users\Simmon\Desktop\p3\ai_prediction_system_yash\2_dataset_final_folder\iqoo_z10.csv",
-]
+from lexicon import load_lexicon
+
+# ── Inputs / outputs ─────────────────────────────────────────────────────────
+HERE = os.path.dirname(os.path.abspath(__file__))
+RAW_SUFFIX = "_before_name_clean"    # raw exports carry this; their cleaned output drops it
+DEFAULT_INPUTS = [os.path.join(HERE, f"*{RAW_SUFFIX}.csv")]
+MANIFEST_NAME = ".clean_names_manifest.json"
+CHUNK_ROWS = 50_000
+# Bump whenever the name tests change: files whose content hash is unchanged are
+# only skipped while this and the lexicon digest match the manifest
+CLEANER_VERSION = 3
 
 TEXT_COL = "text"
 
-# ── Large English word set (any word here = NOT a name token) ─────────────────
-# Built from common English words that could appear at end of a review sentence.
-# The broader this is, the fewer false positives we get.
-ENGLISH = {
-    # function words
-    "a","an","the","of","in","on","at","to","for","with","by","as","from",
-    "is","are","was","were","be","been","being","have","has","had",
-    "do","does","did","will","would","could","should","may","might",
-    "shall","can","and","or","but","not","so","yet","nor","both",
-    "either","neither","than","that","this","these","those","which",
-    "who","what","when","where","why","how","if","because","although",
-    "though","while","after","before","since","until","unless","also",
-    "too","very","just","only","even","still","already","again",
-    "always","never","often","sometimes","here","there","up","down",
-    "out","about","over","under","between","through","during","without",
-    # pronouns
-    "i","me","my","myself","we","us","our","you","your",
-    "he","him","his","she","her","it","its","they","them","their",
-    # common review vocabulary — adjectives
-    "good","great","best","bad","poor","nice","fine","well","super",
-    "amazing","awesome","excellent","perfect","brilliant","terrible",
-    "horrible","worst","better","worse","okay","ok","beautiful",
-    "elegant","stylish","sleek","thin","thick","wide","narrow",
-    "small","large","big","huge","medium","mini","light","heavy",
-    "smooth","fast","slow","clean","crisp","sharp","clear","bright",
-    "dark","loud","quiet","strong","weak","cool","hot","warm","cold",
-    "solid","soft","hard","premium","budget","basic","simple","complex",
-    "advanced","modern","classic","traditional","innovative","creative",
-    "genuine","original","authentic","fake","normal","regular","special",
-    "standard","latest","new","old","first","last","next","same",
-    "different","similar","equal","unique","common","rare","average",
-    "ordinary","impressive","outstanding","remarkable","stunning",
-    "unbelievable","incredible","fantastic","fabulous","wonderful",
-    "disappointing","satisfied","happy","unhappy","glad","sad",
-    "excited","worried","confused","surprised","shocked","upset",
-    "pleased","annoyed","frustrated","angry","calm","relaxed",
-    "impressed","dissatisfied","disappointed","disappointed",
-    # common review vocabulary — nouns
-    "phone","mobile","camera","battery","display","screen","product",
-    "device","model","charger","box","package","packing","packaging",
-    "quality","price","money","value","cost","rate","rating","review",
-    "star","stars","point","points","performance","speed","design",
-    "color","colour","size","weight","build","feature","features",
-    "app","software","update","hardware","processor","chipset","chip",
-    "ram","storage","memory","gb","tb","mb","battery","charging",
-    "speaker","speakers","sound","audio","music","video","photo","pic",
-    "image","camera","lens","zoom","portrait","mode","night","ai",
-    "display","screen","refresh","rate","resolution","brightness",
-    "signal","network","wifi","bluetooth","nfc","sim","call","calls",
-    "data","internet","connectivity","reception","coverage",
-    "fingerprint","face","touch","sensor","button","usb","port",
-    "delivery","seller","buyer","service","support","warranty",
-    "return","replace","replacement","refund","exchange","repair",
-    "purchase","bought","buying","sell","sold","selling","order",
-    "experience","upgrade","downgrade","switch","switching","compare",
-    "comparison","advantage","disadvantage","weakness","strength",
-    "issue","problem","bug","glitch","crash","error","fix","solve",
-    "update","patch","version","ui","interface","settings","option",
-    "choice","decision","reason","purpose","condition","damage",
-    "scratch","seal","pack","open","close","box","bag","case","cover",
-    "deal","offer","sale","discount","cashback","emi","bank","offer",
-    # adverbs
-    "definitely","certainly","probably","possibly","likely","unlikely",
-    "unfortunately","fortunately","luckily","sadly","honestly",
-    "seriously","absolutely","completely","totally","exactly",
-    "truly","clearly","simply","mostly","nearly","almost","quite",
-    "anyway","however","therefore","moreover","besides","meanwhile",
-    "suddenly","immediately","eventually","finally","initially",
-    "currently","recently","already","still","yet","again","always",
-    "never","often","sometimes","usually","generally","typically",
-    "basically","essentially","primarily","mainly","mostly",
-    "especially","particularly","specifically","generally",
-    "incredibly","extremely","highly","strongly","deeply","truly",
-    "really","actually","overall","totally","purely","largely",
-    # verbs (base, past, present)
-    "take","takes","taken","give","given","come","came","look","looks",
-    "feel","feels","seem","seems","think","thought","know","want",
-    "use","used","using","need","get","got","go","went","see","saw",
-    "say","said","make","made","work","works","working","run","runs",
-    "charge","charges","support","show","shows","buy","bought","sell",
-    "sold","love","loved","like","liked","hate","hated","miss","want",
-    "try","tried","read","write","play","watch","listen","call",
-    "recommend","suggest","expect","hope","wish","believe","think",
-    "found","find","check","test","tested","compare","switch","turn",
-    "start","stop","open","close","send","receive","connect","set",
-    # numbers (written out)
-    "zero","one","two","three","four","five","six","seven","eight",
-    "nine","ten","hundred","thousand","lakh","crore",
-    # time
-    "day","days","month","months","week","weeks","year","years",
-    "hour","hours","minute","minutes","second","seconds",
-    "morning","afternoon","evening","night","today","yesterday",
-    "tomorrow","now","then","ago","since","during","before","after",
-    # brands / platforms
-    "apple","iphone","samsung","pixel","google","oneplus","motorola",
-    "realme","redmi","xiaomi","oppo","vivo","nokia","iqoo","poco",
-    "flipkart","amazon","meesho","myntra","snapdeal",
-    # miscellaneous
-    "thanks","thank","please","yes","no","ok","okay","wow","oh","ah",
-    "well","right","wrong","true","false","real","fake","safe","secure",
-    "promise","safety","trust","trusted","reliable","genuine",
-    "fast","processor","usage","regular","useful","useless","usage",
-    "steal","absolute","placement","felt","deal","details","clarity",
-    "option","advantage","detail","zero","offer","sale","paid","pay",
-    "condition","damage","scratch","return","repair","service",
-    "warranty","reason","purpose","choice","decision","strength",
-    "weakness","comparison","compare","upgrade","downgrade",
-    "satisfied","excited","worried","surprised","annoyed",
-    "processor","chipset","flagship","midrange","budget","lineup",
-    # short noise tokens that could look like names
-    "sk","jr","sr","mr","mrs","ms","dr","prof",
-}
+# ── English words (any word here = NOT a name token) ─────────────────────────
+# Served by the shared lexicon (lexicon.py): the hand-curated review vocabulary
+# (lexicon_data/english_core.txt) plus the SCOWL-derived dictionary
+# (english_scowl.txt, ~113k word forms) minus the name gazetteer. The broader
+# this is, the fewer false positives we get.
+LEXICON = load_lexicon()
+ENGLISH = LEXICON.english
 
 # ── Regex: a name-like token ─────────────────────────────────────────────────
 # All lowercase, letters only, length 2-20
 NAME_RE = re.compile(r'^[a-z]{2,20}$')
 
+TOKEN_PUNCT = ".,!?;:'\"()-"   # stripped from a token before the name test
+END_PUNCT = ".!?;,:"           # a token ending in one of these closes a sentence
+TAIL_PUNCT = " .,!?;:"         # trimmed from the text left after removing a name
+
 def is_name_token(word: str) -> bool:
-    w = word.lower().strip(".,!?;:'\"()-")
+    w = word.lower().strip(TOKEN_PUNCT)
     return bool(NAME_RE.match(w)) and w not in ENGLISH
 
 def ends_with_punct(token: str) -> bool:
     """True if token ends with sentence-ending punctuation."""
     return bool(re.search(r'[.!?;,:]$', token))
 
+def trailing_name_tokens(tokens) -> int:
+    """
+    How many of the last tokens (0, 2 or 3) form a reviewer name.
+    tokens may be just the last five of a longer text.
+    """
+    n = len(tokens)
+
+    if n < 4:
+        return 0  # too short, risky
+
+    # ── Try 3-token name block first (e.g. "amit kumar singh") ──────────────
+    if n >= 5:
+        t1, t2, t3 = tokens[-3], tokens[-2], tokens[-1]
+        if is_name_token(t1) and is_name_token(t2) and is_name_token(t3):
+            # Require the token before the 3-block to end with punctuation
+            if ends_with_punct(tokens[-4]):
+                return 3
+
+    # ── Try 2-token name block (e.g. "danish pasha", "sarath kumar") ────────
+    t1, t2 = tokens[-2], tokens[-1]
+    if is_name_token(t1) and is_name_token(t2):
+        # The word before the name block should be a content word OR end in punct
+        prev = tokens[-3]
+        prev_clean = prev.lower().strip(TOKEN_PUNCT)
+        if ends_with_punct(prev) or prev_clean in ENGLISH:
+            return 2
+
+    return 0
+
 def strip_trailing_name(text: str) -> str:
     """
     Strip a 2–3 word reviewer name from the end of text.
@@ -178,78 +129,250 @@ def strip_trailing_name(text: str) -> str:
     if text.endswith('...'):
         return text
 
-    tokens = text.split()
-    n = len(tokens)
+    name = trailing_name_tokens(text.rsplit(None, 4))
+    if name:
+        cleaned = ' '.join(text.split()[:-name]).rstrip(TAIL_PUNCT)
+        return cleaned if cleaned else text
+    return text
 
-    if n < 4:
-        return text  # too short, risky
 
-    # ── Try 3-token name block first (e.g. "amit kumar singh") ──────────────
-    if n >= 5:
-        t1, t2, t3 = tokens[-3], tokens[-2], tokens[-1]
-        if is_name_token(t1) and is_name_token(t2) and is_name_token(t3):
-            # Require the token before the 3-block to end with punctuation
-            prev = tokens[n - 4]
-            if ends_with_punct(prev):
-                cleaned = ' '.join(tokens[:n-3]).rstrip(' .,!?;:')
-                return cleaned if cleaned else text
+# ── Column version ───────────────────────────────────────────────────────────
+# The same rules over a whole column, on its Arrow buffers, once per distinct
+# text. A name token lowercases to [a-z]{2,20} after stripping TOKEN_PUNCT, and
+# only A-Z and the Kelvin sign lowercase into a-z, so one regex pass (RE2)
+# keeps just the texts whose last two tokens have that shape. Their last two
+# tokens, then the last four of the texts still in play, are split off, and
+# the distinct tokens go through one batched lexicon lookup. Arrow's
+# whitespace is Python's (str.split / str.strip), so tokens and rebuilt texts
+# agree with strip_trailing_name.
 
-    # ── Try 2-token name block (e.g. "danish pasha", "sarath kumar") ────────
-    if n >= 4:
-        t1, t2 = tokens[-2], tokens[-1]
-        if is_name_token(t1) and is_name_token(t2):
-            # The word before the name block should be a content word OR end in punct
-            prev = tokens[n - 3]
-            prev_clean = prev.lower().strip(".,!?;:'\"()-")
-            if ends_with_punct(prev) or prev_clean in ENGLISH:
-                cleaned = ' '.join(tokens[:n-2]).rstrip(' .,!?;:')
-                return cleaned if cleaned else text
+WHITESPACE = ''.join(ch for ch in map(chr, range(0x3001)) if ch.isspace())
+_SPACE = ''.join(f'\\x{{{ord(ch):x}}}' for ch in WHITESPACE)
+_NAME_SHAPE = f'[{re.escape(TOKEN_PUNCT)}]*[A-Za-z\\x{{212A}}]{{2,20}}[{re.escape(TOKEN_PUNCT)}]*'
+# At least three tokens, the last two name-shaped (texts are trimmed first)
+NAME_TAIL = f'[^{_SPACE}][{_SPACE}]+{_NAME_SHAPE}[{_SPACE}]+{_NAME_SHAPE}$'
+END_PUNCT_RE = f'[{re.escape(END_PUNCT)}]$'
+SPACE_RUN = f'[{_SPACE}]+'
+LAST_TOKENS = {n: f'(?:[{_SPACE}]+[^{_SPACE}]+){{{n}}}$' for n in (2, 3)}
 
-    return text
 
+def _token_rules(tokens: pa.Array):
+    """(name, punct, english) flags of every token, with the rules run once per distinct token"""
+    encoded = pc.dictionary_encode(tokens)
+    words = [token.lower().strip(TOKEN_PUNCT) for token in encoded.dictionary.to_pylist()]
+    english = ENGLISH.contains(words)  # one lexicon lookup for all of them
+    name = np.fromiter((bool(NAME_RE.match(w)) for w in words), bool, len(words)) & ~english
+    punct = pc.match_substring_regex(encoded.dictionary, END_PUNCT_RE).to_numpy(zero_copy_only=False)
+    codes = encoded.indices.to_numpy()
+    return name[codes], punct[codes], english[codes]
 
-def restore_from_backup(filepath: str):
-    backup = filepath.replace('.csv', '_before_name_clean.csv')
-    if os.path.exists(backup):
-        shutil.copy2(backup, filepath)
-        print(f"  Restored from backup.")
-    # else first run — no backup yet
 
+def _last_tokens(texts: pa.Array, k: int):
+    """(rows with at least k tokens, their last k tokens row by row, last first, and min(tokens, k + 1))"""
+    parts = pc.utf8_split_whitespace(texts, max_splits=k, reverse=True)
+    count = pc.list_value_length(parts).to_numpy()
+    rows = np.flatnonzero(count >= k)
+    count = count[rows]
+    last = np.cumsum(count)[:, None] - np.arange(1, k + 1)
+    return rows, parts.take(rows).flatten().take(last.ravel()), count
 
-def clean_csv(filepath: str):
-    print(f"\n{'='*60}")
-    print(f"Processing: {os.path.basename(filepath)}")
 
-    restore_from_backup(filepath)
-    df = pd.read_csv(filepath)
+def _name_sizes(texts: pa.Array) -> np.ndarray:
+    """trailing_name_tokens (0, 2 or 3) of every text in a trimmed Arrow string array"""
+    sizes = np.zeros(len(texts), dtype=np.int64)
+    # Both blocks need the last two tokens to be names: checked on a cheap split first
+    rows, tokens, _ = _last_tokens(texts, 2)
+    name, _, _ = _token_rules(tokens)
+    rows = rows[name.reshape(-1, 2).all(axis=1)]
 
-    if TEXT_COL not in df.columns:
-        print(f"  Column '{TEXT_COL}' not found -- skipping.")
-        return
+    # The last four tokens of the rest; [row, k] is the (k+1)-th from the end, count 5 means 5 or more
+    found, tokens, count = _last_tokens(texts.take(rows), 4)
+    rows = rows[found]
+    name, punct, english = (flags.reshape(-1, 4) for flags in _token_rules(tokens))
+    three = (count == 5) & name[:, 2] & punct[:, 3]
+    two = punct[:, 2] | english[:, 2]
+    sizes[rows] = np.where(three, 3, np.where(two, 2, 0))
+    return sizes
 
-    original = df[TEXT_COL].copy()
-    df[TEXT_COL] = df[TEXT_COL].apply(strip_trailing_name)
 
-    changed = (original != df[TEXT_COL]).sum()
-    print(f"  Rows modified: {changed} / {len(df)}")
+def _strip_names_arrow(texts: pa.Array) -> pa.Array:
+    """strip_trailing_name over an Arrow string array (nulls stay null)"""
+    encoded = pc.dictionary_encode(texts)
+    distinct = pc.utf8_trim_whitespace(encoded.dictionary)
+    tail = pc.and_(pc.match_substring_regex(distinct, NAME_TAIL), pc.invert(pc.ends_with(distinct, '...')))
+    rows = np.flatnonzero(tail.to_numpy(zero_copy_only=False))
+    sizes = _name_sizes(distinct.take(rows))
+    rows, sizes = rows[sizes > 0], sizes[sizes > 0]
 
-    mask = original != df[TEXT_COL]
-    for idx in df[mask].head(10).index:
-        print(f"    BEFORE: {original[idx]!r}")
-        print(f"    AFTER : {df.at[idx, TEXT_COL]!r}")
-        print()
+    # ' '.join(text.split()[:-n]).rstrip(TAIL_PUNCT), kept only when something is left
+    named = distinct.take(rows)
+    cut = pc.if_else(pa.array(sizes == 3), pc.replace_substring_regex(named, LAST_TOKENS[3], ''),
+                     pc.replace_substring_regex(named, LAST_TOKENS[2], ''))
+    cleaned = pc.utf8_rtrim(pc.replace_substring_regex(cut, SPACE_RUN, ' '), characters=TAIL_PUNCT)
+    kept = pc.not_equal(cleaned, '').to_numpy(zero_copy_only=False)
+    changed = np.zeros(len(distinct), dtype=bool)
+    changed[rows[kept]] = True  # rows ascend, the order replace_with_mask takes its values in
+    distinct = pc.replace_with_mask(distinct, pa.array(changed), cleaned.filter(pa.array(kept)))
+    return distinct.take(encoded.indices)
 
-    backup = filepath.replace('.csv', '_before_name_clean.csv')
-    shutil.copy2(filepath, backup)
-    print(f"  Backup saved: {os.path.basename(backup)}")
-    df.to_csv(filepath, index=False)
-    print(f"  Saved.")
 
+def strip_trailing_names(texts: pd.Series) -> pd.Series:
+    """strip_trailing_name over a whole column (non-string values pass through)"""
+    if isinstance(texts.dtype, pd.StringDtype) and texts.dtype.storage == 'pyarrow':
+        array = pa.array(texts)
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        cleaned = _strip_names_arrow(array)
+        return pd.Series(pd.array(cleaned, dtype=texts.dtype), index=texts.index, name=texts.name)
+    values = texts.to_numpy(dtype=object, copy=True)
+    is_text = np.fromiter((isinstance(value, str) for value in values), bool, len(values))
+    if is_text.any():
+        values[is_text] = _strip_names_arrow(pa.array(values[is_text], type=pa.large_string())).to_pylist()
+    return pd.Series(values, index=texts.index, name=texts.name, dtype=texts.dtype)
 
-if __name__ == "__main__":
-    for f in FILES:
-        if os.path.exists(f):
-            clean_csv(f)
-        else:
-            print(f"File not found: {f}")
+
+def output_path(src: str, output_dir: str) -> str:
+    """iphone15_before_name_clean.csv -> <output_dir>/iphone15.csv; other names are kept"""
+    name = os.path.basename(src)
+    stem, ext = os.path.splitext(name)
+    if stem.endswith(RAW_SUFFIX):
+        name = stem[:-len(RAW_SUFFIX)] + ext
+    return os.path.join(output_dir, name)
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def clean_file(src: str, dst: str, chunksize: int = CHUNK_ROWS, examples: int = 10):
+    """Stream src to dst in chunks of `chunksize` rows, stripping names from the text column.
+
+    Every column is read and written back as the original strings, so only
+    the text column can differ. dst is replaced atomically once complete.
+    Returns {'rows', 'changed', 'examples'}, or None when src has no text column.
+    """
+    tmp = dst + '.tmp'
+    rows = changed = 0
+    shown = []
+    try:
+        with open(tmp, 'w', encoding='utf-8', newline='') as out:
+            reader = pd.read_csv(src, chunksize=chunksize, dtype=str, keep_default_na=False)
+            for i, chunk in enumerate(reader):
+                if TEXT_COL not in chunk.columns:
+                    return None
+                original = chunk[TEXT_COL]
+                cleaned = strip_trailing_names(original)
+                mask = (original != cleaned).to_numpy()
+                changed += int(mask.sum())
+                rows += len(chunk)
+                if len(shown) < examples and mask.any():
+                    shown.extend(zip(original[mask][:examples - len(shown)], cleaned[mask]))
+                chunk[TEXT_COL] = cleaned
+                chunk.to_csv(out, index=False, header=i == 0)
+        os.replace(tmp, dst)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return {'rows': rows, 'changed': changed, 'examples': shown}
+
+
+def _clean_job(job):
+    src, dst, chunksize, examples = job
+    return clean_file(src, dst, chunksize, examples)
+
+
+def expand_inputs(patterns):
+    """Files matching each path or glob, in order, without duplicates"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        if not matches:
+            print(f"File not found: {pattern}")
+        for path in matches:
+            path = os.path.abspath(path)
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def load_manifest(path: str) -> dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(path: str, manifest: dict):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Strip trailing reviewer names from review CSVs")
+    parser.add_argument('inputs', nargs='*', default=DEFAULT_INPUTS,
+                        help=f"CSV files or globs (default: *{RAW_SUFFIX}.csv next to this script)")
+    parser.add_argument('--output-dir', default=HERE,
+                        help=f"where cleaned files go; {RAW_SUFFIX} is dropped from their names")
+    parser.add_argument('--chunksize', type=int, default=CHUNK_ROWS, help="rows held in memory per file")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help="files cleaned in parallel")
+    parser.add_argument('--examples', type=int, default=10, help="changed rows shown per file")
+    parser.add_argument('--force', action='store_true', help="re-clean files even if unchanged")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest_path = os.path.join(args.output_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+
+    jobs, digests = [], {}
+    for src in expand_inputs(args.inputs):
+        dst = output_path(src, args.output_dir)
+        if os.path.abspath(dst) == src:
+            print(f"⚠ {os.path.basename(src)} would overwrite itself -- pass --output-dir (skipped)")
+            continue
+        digests[src] = file_digest(src)
+        entry = manifest.get(src, {})
+        if (not args.force and entry.get('sha256') == digests[src]
+                and entry.get('cleaner_version') == CLEANER_VERSION
+                and entry.get('lexicon') == LEXICON.digest and os.path.exists(dst)):
+            print(f"⏭ {os.path.basename(src)} unchanged since last run -> {os.path.basename(dst)}")
+            continue
+        jobs.append((src, dst, args.chunksize, args.examples))
+
+    if len(jobs) > 1 and args.processes > 1:
+        with ProcessPoolExecutor(max_workers=min(args.processes, len(jobs))) as pool:
+            results = list(pool.map(_clean_job, jobs))
+    else:
+        results = list(map(_clean_job, jobs))
+
+    for (src, dst, _, _), result in zip(jobs, results):
+        print(f"\n{'='*60}")
+        print(f"Processing: {os.path.basename(src)} -> {dst}")
+        if result is None:
+            print(f"  Column '{TEXT_COL}' not found -- skipping.")
+            continue
+        print(f"  Rows modified: {result['changed']} / {result['rows']}")
+        for before, after in result['examples']:
+            print(f"    BEFORE: {before!r}")
+            print(f"    AFTER : {after!r}")
+            print()
+        manifest[src] = {'sha256': digests[src], 'cleaner_version': CLEANER_VERSION,
+                         'lexicon': LEXICON.digest, 'output': dst,
+                         'rows': result['rows'], 'changed': result['changed']}
+        print(f"  Saved.")
+    if jobs:
+        save_manifest(manifest_path, manifest)
     print("\nAll done!")
+
+
+if __name__ == "__main__":
+    # UTF-8 console output only when run as a script, so importing
+    # strip_trailing_name (e.g. from the streaming scorer) leaves stdout alone
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    main()
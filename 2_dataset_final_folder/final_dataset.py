@@ -0,0 +1,73 @@
+"""
+The final dataset as every analysis stage reads it (compare_methods_v2.py,
+predict_next_month.py, create_dashboard.py): one typed frame instead of four
+copies of read_csv / rename / to_numeric / .apply(parse_month).
+
+  review_id    int64, stable per review (joins scores and results back to reviews)
+  device       categorical, in DEVICES order
+  month        first of the month; NaT where the date did not parse
+  rating       int8, 1-5 (always: rows without one are quarantined)
+  title, review_text
+  date, city   as scraped ("" where the product's CSV has no such column)
+
+Rows the quality gate quarantined (quality_gate.py: summary banners, header
+rows, ratings outside 1-5, empty text, repeats) are not in it. Reviews
+without a month are: they count for sentiment scoring and the
+ensembles, and only monthly_ratings (the forecast, the dashboard's time
+series) leaves them out.
+
+Parsing happens once, into the review store (review_store.py), which is
+reused by every later or parallel run until a CSV's contents change.
+Within a process, frames are memoized on the store's digest, so a second
+call costs a stat of each CSV. Rows keep their CSV order, devices in the
+order asked for.
+
+Usage:
+    from final_dataset import load_reviews, monthly_ratings
+    df = load_reviews(["device", "rating", "review_text"])
+"""
+
+from functools import lru_cache
+
+import pandas as pd
+
+from review_store import DEVICES, REVIEW_COLUMNS, ReviewStore, open_store
+
+LABELS = list(DEVICES.values())
+COLUMNS = [("review_text" if c == "text" else c) for c in REVIEW_COLUMNS]
+
+
+def load_reviews(columns=None, devices=None) -> pd.DataFrame:
+    """Reviews of `devices` (labels, default all) with only `columns` (default COLUMNS)
+
+    The frame is the caller's: adding or changing columns does not touch the
+    memoized copy.
+    """
+    columns = tuple(COLUMNS if columns is None else columns)
+    devices = tuple(LABELS if devices is None else devices)
+    store = open_store()
+    return _load(store.store_dir, store.digest, columns, devices).copy(deep=False)
+
+
+@lru_cache(maxsize=16)
+def _load(store_dir, digest, columns, devices):
+    store = ReviewStore(store_dir)
+    wanted = [("text" if c == "review_text" else c) for c in columns]
+    frames = []
+    for device in devices:
+        df = store.read(list(dict.fromkeys(wanted + ["row"])), devices=[device])
+        df = df.sort_values("row", kind="stable")
+        frames.append(df[wanted])
+    df = pd.concat(frames, ignore_index=True) if frames else store.read(wanted, devices=[])
+    if "device" in df.columns:
+        df["device"] = pd.Categorical(df["device"].astype(str), categories=list(devices))
+    return df.rename(columns={"text": "review_text"})
+
+
+def monthly_ratings(devices=None) -> pd.DataFrame:
+    """device, month, n, mean_rating, pct_positive (share of 4-5 stars, %) for every dated month"""
+    df = load_reviews(["device", "month", "rating"], devices).dropna(subset=["month"])
+    df["is_pos"] = (df["rating"] >= 4) * 100.0
+    return (df.groupby(["device", "month"], observed=True, sort=True)
+            .agg(n=("rating", "size"), mean_rating=("rating", "mean"), pct_positive=("is_pos", "mean"))
+            .reset_index())
@@ -0,0 +1,232 @@
+"""
+Word lists shared by the name cleaner (clean_names.py) and the keyword
+scorer (3_sentimental_analysis/YS/sentiment_methods.py), served from one
+prebuilt, memory-mapped binary.
+
+SOURCES (lexicon_data/, one lowercase word per line, '#' comments):
+  english_core.txt    hand-curated review vocabulary (~700 words)
+  english_scowl.txt   full dictionary (~113k word forms), built by scowl_wordlist.py
+  english_*.txt       any other dictionary dropped in (/usr/share/dict/words, ...)
+  names*.txt          name gazetteer: removed from every english_*.txt except english_core.txt
+  positive*.txt       Word Cloud scorer keywords
+  negative*.txt
+
+english_scowl.txt is the Hunspell en_US dictionary (generated from SCOWL)
+expanded to its word forms. Without a full dictionary (100k+ words) the
+english section is just the core vocabulary, and `python lexicon.py` warns.
+
+BINARY (lexicon_data/lexicon.bin, rebuilt automatically when a source changes):
+  b'LEXICON1' | uint32 header length | JSON header | sections
+Each section is a sorted array of fixed-width, null-padded ASCII words, so a
+lookup is a binary search (np.searchsorted) straight on the mapped file and
+every process that loads the lexicon shares the same pages of the OS cache.
+Only the header is parsed at startup; the word arrays are never copied.
+
+Usage:
+    python lexicon.py                      # build if stale, print sizes and load time
+    python lexicon.py --rebuild
+    python lexicon.py sarath worth superb  # which lists hold these words
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import time
+from functools import lru_cache
+
+import numpy as np
+
+# LEXICON_DATA_DIR points every importer (cleaner, scorer, pool workers) at another set of lists
+DATA_DIR = os.environ.get("LEXICON_DATA_DIR",
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), "lexicon_data"))
+BINARY_NAME = "lexicon.bin"
+MAGIC = b"LEXICON1"
+SECTIONS = ("english", "names", "positive", "negative")
+WORD_RE = re.compile(r"^[a-z]+$")
+FULL_DICTIONARY = 100_000  # english words below which no full dictionary is loaded
+
+
+class WordList:
+    """Sorted fixed-width words: `word in words` and words.contains([...]) in O(log n)"""
+
+    CACHE_SIZE = 100_000  # scalar results remembered per process (review words repeat a lot)
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+        self.width = array.dtype.itemsize
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.array)
+
+    def __iter__(self):
+        return (word.decode() for word in self.array)
+
+    def __contains__(self, word) -> bool:
+        found = self._cache.get(word)
+        if found is None:
+            found = self._lookup(word)
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.clear()
+            self._cache[word] = found
+        return found
+
+    def _lookup(self, word) -> bool:
+        key = word.encode() if isinstance(word, str) else word
+        if not key or len(key) > self.width or not len(self.array):
+            return False
+        index = self.array.searchsorted(key)
+        return bool(index < len(self.array) and self.array[index] == key)
+
+    def contains(self, words) -> np.ndarray:
+        """Membership mask for a sequence of words, one searchsorted for all of them"""
+        keys = np.array([w.encode() if isinstance(w, str) else w for w in words], dtype=bytes)
+        if not keys.size or not len(self.array):
+            return np.zeros(keys.size, dtype=bool)
+        fits = np.char.str_len(keys) <= self.width if keys.dtype.itemsize > self.width else True
+        keys = keys.astype(self.array.dtype)  # longer words were truncated; `fits` masks them
+        index = np.minimum(self.array.searchsorted(keys), len(self.array) - 1)
+        return (self.array[index] == keys) & fits & (keys != b"")
+
+
+class Lexicon:
+    """The mapped binary: one WordList per section plus a digest of their contents"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a lexicon binary")
+        (length,) = struct.unpack_from("<I", self._map, len(MAGIC))
+        self.header = json.loads(self._map[len(MAGIC) + 4:len(MAGIC) + 4 + length])
+        self.digest = self.header["digest"]
+        for name, (offset, count, width) in self.header["sections"].items():
+            array = np.frombuffer(self._map, dtype=f"S{width}", count=count, offset=offset)
+            setattr(self, name, WordList(array))
+
+    def __repr__(self):
+        sizes = ", ".join(f"{name}={len(getattr(self, name))}" for name in SECTIONS)
+        return f"Lexicon({sizes}, digest={self.digest})"
+
+
+def _source_files(data_dir: str):
+    return sorted(glob.glob(os.path.join(data_dir, "*.txt")))
+
+
+def _source_signature(data_dir: str) -> dict:
+    signature = {}
+    for path in _source_files(data_dir):
+        stat = os.stat(path)
+        signature[os.path.basename(path)] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+
+
+def read_words(path: str, lower: bool = False) -> set:
+    """Words of one source file; lines that are not a single a-z word (proper nouns, phrases) are skipped"""
+    words = set()
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            word = line.strip()
+            if lower:
+                word = word.lower()
+            if WORD_RE.match(word):
+                words.add(word)
+    return words
+
+
+def build(data_dir: str = DATA_DIR, path: str = None) -> str:
+    """Compile the source lists of data_dir into the binary; returns its path"""
+    path = path or os.path.join(data_dir, BINARY_NAME)
+    words = {name: set() for name in SECTIONS}
+    dictionaries = set()
+    for source in _source_files(data_dir):
+        name = os.path.basename(source)
+        if name == "english_core.txt":
+            words["english"] |= read_words(source)
+        elif name.startswith("english"):
+            dictionaries |= read_words(source)
+        else:
+            section = next((s for s in SECTIONS[1:] if name.startswith(s)), None)
+            if section is not None:
+                words[section] |= read_words(source, lower=section == "names")
+    # Large dictionaries list many given names as words; the gazetteer wins over them
+    words["english"] |= dictionaries - words["names"]
+
+    arrays = {name: np.array(sorted(words[name]), dtype=f"S{max(map(len, words[name]), default=1)}")
+              for name in SECTIONS}
+    digest = hashlib.sha256()
+    for name in SECTIONS:
+        digest.update(name.encode() + arrays[name].tobytes())
+    header = {"sources": _source_signature(data_dir), "digest": digest.hexdigest()[:16], "sections": {}}
+
+    # Offsets depend on the header length, which depends on the offsets: size it with a placeholder
+    prefix = len(MAGIC) + 4 + len(json.dumps({**header, "sections": {
+        name: [10 ** 12, len(arrays[name]), arrays[name].itemsize] for name in SECTIONS}})) + 8
+    offset = prefix
+    for name in SECTIONS:
+        header["sections"][name] = [offset, len(arrays[name]), arrays[name].itemsize]
+        offset += arrays[name].nbytes
+    encoded = json.dumps(header).encode()
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        f.write(b"\0" * (prefix - f.tell()))
+        for name in SECTIONS:
+            f.write(arrays[name].tobytes())
+    os.replace(tmp, path)  # concurrent builders (a process pool) each write a whole file
+    return path
+
+
+def _is_current(path: str, data_dir: str) -> bool:
+    if not os.path.exists(path):
+        return False
+    if not _source_files(data_dir):
+        return True  # binary shipped without its sources
+    with open(path, "rb") as f:
+        head = f.read(len(MAGIC) + 4)
+        if head[:len(MAGIC)] != MAGIC:
+            return False
+        (length,) = struct.unpack_from("<I", head, len(MAGIC))
+        return json.loads(f.read(length))["sources"] == _source_signature(data_dir)
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(data_dir: str = DATA_DIR) -> Lexicon:
+    """The lexicon of data_dir, rebuilt first if any source changed; one mapping per process"""
+    path = os.path.join(data_dir, BINARY_NAME)
+    if not _is_current(path, data_dir):
+        build(data_dir, path)
+    return Lexicon(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and inspect the shared lexicon")
+    parser.add_argument("words", nargs="*", help="words to look up")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        start = time.perf_counter()
+        build(args.data_dir)
+        print(f"🔨 Built in {(time.perf_counter() - start) * 1000:.0f} ms")
+    start = time.perf_counter()
+    lexicon = load_lexicon(args.data_dir)
+    print(f"📖 {lexicon} loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+    if len(lexicon.english) < FULL_DICTIONARY:
+        print(f"⚠️  english has {len(lexicon.english):,} words: no full dictionary, build "
+              f"{os.path.join(args.data_dir, 'english_scowl.txt')} with scowl_wordlist.py")
+    for word in args.words:
+        found = [name for name in SECTIONS if word.lower() in getattr(lexicon, name)]
+        print(f"  {word}: {', '.join(found) or 'not found'}")
+
+
+if __name__ == "__main__":
+    main()
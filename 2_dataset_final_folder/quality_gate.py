@@ -0,0 +1,195 @@
+"""
+Data-quality gate between scraping and analysis: whole-column rules over a
+final CSV. Rows that are not reviews at all or carry no usable rating
+(QUARANTINE_RULES) are moved to a side file instead of reaching sentiment
+scoring, the ensembles and the forecast; the other rules only count their
+rows in the report.
+
+RULES (a row can fail several; * = quarantined)
+  summary_row *  the listing banner scraped as a review: text "6,583 Reviews 1,63,435 24,703",
+                 title "2,05,719 Ratings"
+  header_row  *  a CSV header appended as a row (rating "rating", text "text")
+  numeric_text   review text of digits and separators only
+  rating_range * rating missing or not an integer 1-5
+  bad_date       date parse_months cannot read ("", "3 months ago", year outside 2000-2100):
+                 a real review without a month, kept out of the monthly series only
+  empty_text  *  no review text
+  duplicate   *  every column equal to an earlier row (the same review scraped twice); the first is kept
+
+Every rule is evaluated once per distinct value of its column (pd.factorize),
+not once per row: ratings, dates and titles take a handful of values, and
+repeated texts collapse too. Duplicates are found on the factorize codes, so
+no row is hashed twice. review_store.py runs the gate on every build and
+keeps the quarantine files and the report next to the store.
+
+Usage:
+    python quality_gate.py                     # the final CSVs, into review_store/quality/
+    python quality_gate.py scraped.csv --out-dir /tmp/quality
+"""
+
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+RULES = ["summary_row", "header_row", "numeric_text", "rating_range", "bad_date", "empty_text", "duplicate"]
+QUARANTINE_RULES = ["summary_row", "header_row", "rating_range", "empty_text", "duplicate"]
+REPORT_NAME = "quality_report.csv"
+
+# One pass over the distinct texts finds every candidate; the few matches are then told apart
+SUSPECT_TEXT = r"\s*(?:[\d\s,.]*|[\d,]+\s+Reviews?\b.*|text|review_text)\s*"
+SUMMARY_TEXT = r"\s*[\d,]+\s+Reviews?(?:\s+[\d,]+)*\s*"
+SUMMARY_TITLE = r"\s*[\d,]+\s+Ratings?(?:\s+&\s+[\d,]+\s+Reviews?)?\s*"
+NUMERIC_TEXT = r"[\s,.]*\d[\d\s,.]*"
+HEADER_VALUES = ["rating", "text", "review_text", "title", "date"]
+
+
+def parse_months(dates: pd.Series) -> pd.Series:
+    """'Nov 2025' -> 2025-11-01 over the whole column; anything else (or a year outside 2000-2100) -> NaT"""
+    months = pd.to_datetime(dates.str.strip(), format="%b %Y", errors="coerce")
+    return months.where(months.dt.year.between(2000, 2100))
+
+
+def _factorize(column: pd.Series):
+    """(codes, distinct values as a str Series); a missing value (NaN) counts as ''"""
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    values = np.asarray(uniques, dtype=object)
+    values[pd.isna(values)] = ""
+    return codes, pd.Series(values, dtype=object)
+
+
+def _spread(flags, codes) -> np.ndarray:
+    """Per-distinct-value flags back onto the rows"""
+    return np.asarray(flags, dtype=bool)[codes]
+
+
+def _text_rules(texts: pd.Series) -> pd.DataFrame:
+    flags = pd.DataFrame(False, index=texts.index, columns=["summary_row", "header_row", "numeric_text",
+                                                            "empty_text"])
+    # map() over the distinct texts: the str accessor's per-value overhead doubles this pass
+    matches = np.fromiter(map(re.compile(SUSPECT_TEXT).fullmatch, texts.to_numpy()), object, len(texts))
+    hits = np.flatnonzero(matches.astype(bool))
+    suspect = texts.iloc[hits].astype(str)
+    flags.iloc[hits] = np.column_stack([suspect.str.fullmatch(SUMMARY_TEXT),
+                                        suspect.str.strip().str.lower().isin(HEADER_VALUES),
+                                        suspect.str.fullmatch(NUMERIC_TEXT),
+                                        suspect.str.strip() == ""]).astype(bool)
+    return flags
+
+
+def _duplicates(codes_and_sizes, n: int) -> np.ndarray:
+    """Rows equal to an earlier row in every column, from the columns' factorize codes"""
+    key = np.zeros(n, dtype=np.int64)
+    size = 1
+    for codes, count in codes_and_sizes:
+        if size * (count + 1) >= 2 ** 62:
+            key, uniques = pd.factorize(key)  # renumber the combined key before it overflows
+            size = len(uniques)
+        key = key * (count + 1) + (codes + 1)
+        size *= count + 1
+    return pd.Series(key).duplicated(keep="first").to_numpy()
+
+
+def check(df: pd.DataFrame) -> pd.DataFrame:
+    """One boolean column per rule for the raw (all-string) rows of a final CSV"""
+    missing = pd.Series("", index=df.index)
+    text_name = "text" if "text" in df.columns else "review_text"
+    flags = pd.DataFrame(False, index=df.index, columns=RULES)
+
+    rating_codes, ratings = _factorize(df.get("rating", missing))
+    rating = pd.to_numeric(ratings, errors="coerce")
+    flags["rating_range"] = _spread(~(rating.between(1, 5) & (rating % 1 == 0)), rating_codes)
+    header_rating = _spread(ratings.str.strip().str.lower() == "rating", rating_codes)
+
+    date_codes, dates = _factorize(df.get("date", missing))
+    flags["bad_date"] = _spread(parse_months(dates).isna(), date_codes)
+
+    title_codes, titles = _factorize(df.get("title", missing))
+    summary_title = _spread(titles.str.fullmatch(SUMMARY_TITLE), title_codes)
+
+    text_codes, texts = _factorize(df.get(text_name, missing))
+    text_flags = _text_rules(texts)
+    for rule in text_flags.columns:
+        flags[rule] = _spread(text_flags[rule], text_codes)
+    flags["summary_row"] |= summary_title
+    flags["header_row"] |= header_rating
+
+    codes = [(rating_codes, len(ratings)), (date_codes, len(dates)), (title_codes, len(titles)),
+             (text_codes, len(texts))]
+    for name in df.columns.difference(["rating", "date", "title", text_name]):
+        other_codes, others = pd.factorize(df[name], use_na_sentinel=False)
+        codes.append((other_codes, len(others)))
+    flags["duplicate"] = _duplicates(codes, len(df))
+    return flags
+
+
+def split(df: pd.DataFrame):
+    """(rows that pass, quarantined rows with a 'reasons' column, counts per rule)
+
+    Only QUARANTINE_RULES keep a row out; 'reasons' lists every rule it fails.
+    """
+    flags = check(df)
+    bad = flags[QUARANTINE_RULES].any(axis=1).to_numpy()
+    quarantined = df[bad].copy()
+    # Rows failing the same rules share a bit pattern; the reasons are spelled once per pattern
+    pattern = flags[bad].to_numpy() @ (1 << np.arange(len(RULES)))
+    reasons = {p: ";".join(rule for i, rule in enumerate(RULES) if p >> i & 1) for p in np.unique(pattern)}
+    quarantined.insert(0, "reasons", pd.Series(pattern, index=quarantined.index).map(reasons))
+    counts = {"rows": len(df), "passed": int((~bad).sum()), "quarantined": int(bad.sum()),
+              **{rule: int(flags[rule].sum()) for rule in RULES}}
+    return df[~bad], quarantined, counts
+
+
+def quarantine_path(out_dir: str, stem: str) -> str:
+    return os.path.join(out_dir, f"{stem}_quarantine.csv")
+
+
+def write_quarantine(out_dir: str, stem: str, quarantined: pd.DataFrame):
+    """Quarantined rows (with their CSV row number) to <out_dir>/<stem>_quarantine.csv; removed if none"""
+    os.makedirs(out_dir, exist_ok=True)
+    path = quarantine_path(out_dir, stem)
+    if quarantined.empty:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    quarantined.rename_axis("row").reset_index().to_csv(path, index=False, encoding="utf-8")
+
+
+def write_report(out_dir: str, counts: dict):
+    """One row per source: rows, passed, quarantined and the count of every rule"""
+    os.makedirs(out_dir, exist_ok=True)
+    report = pd.DataFrame.from_dict(counts, orient="index").rename_axis("source").reset_index()
+    report.to_csv(os.path.join(out_dir, REPORT_NAME), index=False)
+    return report
+
+
+def main():
+    from review_store import STORE_DIR, default_sources
+
+    parser = argparse.ArgumentParser(description="Validate final-format review CSVs and quarantine bad rows")
+    parser.add_argument("paths", nargs="*", help="CSVs to check (default: the final dataset)")
+    parser.add_argument("--out-dir", default=os.path.join(STORE_DIR, "quality"),
+                        help="where the quarantine files and the report go")
+    args = parser.parse_args()
+
+    sources = ({os.path.splitext(os.path.basename(p))[0]: p for p in args.paths} if args.paths
+               else default_sources())
+    counts = {}
+    for stem, path in sources.items():
+        raw = pd.read_csv(path, dtype=str, keep_default_na=False)
+        start = time.perf_counter()
+        _, quarantined, counts[stem] = split(raw)
+        seconds = time.perf_counter() - start
+        write_quarantine(args.out_dir, stem, quarantined)
+        print(f"🔎 {stem}: {counts[stem]['quarantined']} of {counts[stem]['rows']} rows quarantined "
+              f"({seconds * 1000:.0f} ms)")
+    report = write_report(args.out_dir, counts)
+    print(report.to_string(index=False))
+    print(f"📝 Report and quarantine files in {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
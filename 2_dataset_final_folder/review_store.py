@@ -0,0 +1,362 @@
+"""
+Columnar review store: the final dataset, partitioned by device and month,
+so each stage reads only the columns and partitions it needs instead of
+re-parsing every CSV.
+
+LAYOUT (review_store/ next to the CSVs, git-ignored, rebuilt automatically
+when a source CSV changes):
+  store.json                                   sources, digest, partitions and row counts
+  reviews-<digest>/device=iphone16/month=2026-02/part.parquet
+                                               review_id int64, row int32, rating int8,
+                                               title, text, date, city
+  reviews-<digest>/device=iphone16/month=none/ dates that did not parse (month NaT on read)
+  scores/<name>/part.parquet                   review_id + score columns, joined by id on read
+  quality/                                     quality_report.csv and <stem>_quarantine.csv
+                                               (rows the quality gate kept out, see quality_gate.py)
+
+A source counts as changed when its size or mtime differs and its sha256
+does too (a touched or re-copied CSV does not trigger a rebuild). The
+partition tree is named after the digest of the sources, so processes
+building the same data at once (parallel stage runs) each write their own
+copy and the first one to finish wins; none of them sees a half-written tree.
+
+Device and month are not stored in the files, they come from the partition
+(device: categorical of the DEVICES labels, month: first of the month as a
+date). date and city are kept as scraped ("" where a CSV has no such
+column). Each partition is one Parquet file (pyarrow), memory-mapped on read.
+
+review_id is a hash of device, date, title and text (plus the occurrence
+number of identical reviews), so it does not change when the store is
+rebuilt or rows are added or removed around a review. row is the review's
+position in its CSV, for readers that need the original order. Rows the
+quality gate quarantines (summary banners, header rows, ratings outside
+1-5, empty text, repeats) never reach the partitions; the manifest counts
+them, and the rows its other rules flag (numeric text, bad dates), per
+source.
+
+Usage:
+    python review_store.py                 # build if stale, print the partitions
+    python review_store.py --rebuild
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from quality_gate import REPORT_NAME, parse_months, split, write_quarantine, write_report
+
+# FINAL_DATASET_DIR points every reader (stages, pool workers) at another folder of final CSVs
+DATA_DIR = os.environ.get("FINAL_DATASET_DIR", os.path.dirname(os.path.abspath(__file__)))
+STORE_DIR = os.path.join(DATA_DIR, "review_store")
+STORE_VERSION = 6  # bump when the layout or the quality gate changes: it is part of the tree digest
+MANIFEST_NAME = "store.json"
+
+# File stem of the final CSV -> device label used by every analysis stage
+DEVICES = {
+    "iphone16": "iPhone 16",
+    "iphone15": "iPhone 15",
+    "iqoo_z10": "iQOO Z10",
+}
+NO_MONTH = "none"
+REVIEW_COLUMNS = ["review_id", "device", "month", "rating", "title", "text", "date", "city"]
+STORED_COLUMNS = ["review_id", "row", "rating", "title", "text", "date", "city"]
+PART_NAME = "part.parquet"
+MAX_CATEGORIES = 256  # string score columns with at most this many values become categoricals
+DTYPES = {"review_id": np.int64, "row": np.int32, "rating": np.int8}
+
+
+def review_ids(frame: pd.DataFrame) -> np.ndarray:
+    """Stable int64 id per row of (device, date, title, text); repeats get their occurrence number"""
+    content = pd.util.hash_pandas_object(frame[["device", "date", "title", "text"]], index=False)
+    occurrence = content.groupby(content.values).cumcount()
+    combined = pd.util.hash_pandas_object(pd.DataFrame({"content": content.values, "n": occurrence.values}),
+                                          index=False)
+    return combined.values.view(np.int64)
+
+
+def read_raw_csv(path: str) -> pd.DataFrame:
+    """A final CSV as scraped: every column str, nothing treated as missing"""
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def typed_reviews(raw: pd.DataFrame, device: str) -> pd.DataFrame:
+    """Typed columns of raw final-CSV rows; row is the CSV row (the raw index), a rating that is not 1-5 becomes 0 (the gate quarantines it)"""
+    df = raw.rename(columns={"review_text": "text"})
+    for column in ("rating", "title", "text", "date", "city"):
+        if column not in df.columns:
+            df[column] = ""
+    df["device"] = device
+    df["review_id"] = review_ids(df)
+    rating = pd.to_numeric(df["rating"], errors="coerce")
+    df["rating"] = rating.where(rating.between(1, 5) & (rating % 1 == 0), 0).astype(np.int8)
+    df["month"] = parse_months(df["date"])
+    df["row"] = df.index.to_numpy(dtype=np.int32)
+    return df[REVIEW_COLUMNS + ["row"]].reset_index(drop=True)
+
+
+def read_final_csv(path: str, device: str) -> pd.DataFrame:
+    """The rows of one final CSV that pass the quality gate, as typed columns"""
+    passed, _, _ = split(read_raw_csv(path))
+    return typed_reviews(passed, device)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Partition files: one Parquet file per directory
+# ─────────────────────────────────────────────────────────────────────────────
+def write_part(directory: str, frame: pd.DataFrame):
+    os.makedirs(directory, exist_ok=True)
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), os.path.join(directory, PART_NAME))
+
+
+def read_part(directory: str, columns=None) -> pd.DataFrame:
+    """`columns` (default all) of one partition; categoricals come back as categoricals"""
+    columns = None if columns is None else list(columns)
+    table = pq.read_table(os.path.join(directory, PART_NAME), columns=columns, memory_map=True)
+    return table.to_pandas()
+
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(f) for f in glob.glob(os.path.join(path, "**", "*"), recursive=True)
+               if os.path.isfile(f))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Store
+# ─────────────────────────────────────────────────────────────────────────────
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_signature(sources: dict, known: dict = None) -> dict:
+    """stem -> [size, mtime_ns, sha256]; hashes in `known` are reused for files whose size and mtime match"""
+    signature = {}
+    for stem, path in sorted(sources.items()):
+        stat = os.stat(path)
+        previous = (known or {}).get(stem)
+        if previous and previous[:2] == [stat.st_size, stat.st_mtime_ns]:
+            signature[stem] = previous
+        else:
+            signature[stem] = [stat.st_size, stat.st_mtime_ns, file_digest(path)]
+    return signature
+
+
+def store_digest(signature: dict) -> str:
+    contents = json.dumps([STORE_VERSION, {stem: sig[2] for stem, sig in signature.items()}])
+    return hashlib.sha256(contents.encode()).hexdigest()[:16]
+
+
+def default_sources(data_dir: str = DATA_DIR) -> dict:
+    """File stem -> path of every final CSV of a tracked device that exists"""
+    return {stem: os.path.join(data_dir, f"{stem}.csv") for stem in DEVICES
+            if os.path.exists(os.path.join(data_dir, f"{stem}.csv"))}
+
+
+def partition_dir(root: str, stem: str, month: str) -> str:
+    return os.path.join(root, f"device={stem}", f"month={month}")
+
+
+def build(store_dir: str = STORE_DIR, sources: dict = None) -> dict:
+    """Write the store from the final CSVs (sources: file stem -> path)
+
+    Score tables already in the store are kept; the review partitions of
+    older sources are removed. Rows that fail the quality gate go to
+    quality/ instead of the partitions. Returns the manifest.
+    """
+    sources = default_sources() if sources is None else sources
+    signature = source_signature(sources)
+    digest = store_digest(signature)
+    root = os.path.join(store_dir, f"reviews-{digest}")
+    staging = f"{root}.{os.getpid()}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+
+    partitions, quality = [], {}
+    for stem in sorted(sources):
+        passed, quarantined, quality[stem] = split(read_raw_csv(sources[stem]))
+        write_quarantine(os.path.join(store_dir, "quality"), stem, quarantined)
+        df = typed_reviews(passed, DEVICES.get(stem, stem))
+        keys = df["month"].dt.strftime("%Y-%m").fillna(NO_MONTH)
+        for label, part in df.groupby(keys, sort=True):
+            write_part(partition_dir(staging, stem, label), part[STORED_COLUMNS].reset_index(drop=True))
+            partitions.append({"device": stem, "month": label, "rows": len(part)})
+
+    try:
+        os.replace(staging, root)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)  # a concurrent build of the same sources finished first
+    write_report(os.path.join(store_dir, "quality"), quality)
+    manifest = {
+        "version": STORE_VERSION,
+        "sources": signature,
+        "digest": digest,
+        "devices": {stem: DEVICES.get(stem, stem) for stem in sorted({p["device"] for p in partitions})},
+        "partitions": partitions,
+        "quality": quality,
+    }
+    save_manifest(store_dir, manifest)
+    for old in glob.glob(os.path.join(store_dir, "reviews-*")):
+        if old != root and not old.endswith(".tmp"):
+            shutil.rmtree(old, ignore_errors=True)
+    return manifest
+
+
+def save_manifest(store_dir: str, manifest: dict):
+    path = os.path.join(store_dir, MANIFEST_NAME)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, path)
+
+
+def load_manifest(store_dir: str):
+    try:
+        with open(os.path.join(store_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class ReviewStore:
+    """Read side of the store; open_store() builds or refreshes it first"""
+
+    def __init__(self, store_dir: str = STORE_DIR):
+        self.store_dir = store_dir
+        self.manifest = load_manifest(store_dir)
+        if self.manifest is None:
+            raise FileNotFoundError(f"no review store in {store_dir} (run review_store.py)")
+        self.devices = self.manifest["devices"]
+        self.digest = self.manifest["digest"]
+        self.root = os.path.join(store_dir, f"reviews-{self.digest}")
+
+    def __len__(self):
+        return sum(p["rows"] for p in self.manifest["partitions"])
+
+    def __repr__(self):
+        return f"ReviewStore({len(self)} reviews, {len(self.manifest['partitions'])} partitions)"
+
+    def _select(self, devices, months):
+        wanted_devices = None if devices is None else {self._stem(d) for d in devices}
+        wanted_months = None if months is None else {pd.Timestamp(m).strftime("%Y-%m") for m in months}
+        return [p for p in self.manifest["partitions"]
+                if (wanted_devices is None or p["device"] in wanted_devices)
+                and (wanted_months is None or p["month"] in wanted_months)]
+
+    def _stem(self, device):
+        if device in self.devices:
+            return device
+        return next((stem for stem, label in self.devices.items() if label == device), device)
+
+    def read(self, columns=None, devices=None, months=None, scores=()) -> pd.DataFrame:
+        """Reviews of the given devices (stem or label) and months, only `columns`
+
+        `scores` names score tables to left-join by review_id; their columns
+        are added after the review columns.
+        """
+        columns = list(REVIEW_COLUMNS if columns is None else columns)
+        stored = [c for c in columns if c not in ("device", "month")]
+        if scores and "review_id" not in stored:
+            stored.append("review_id")
+        parts = self._select(devices, months)
+        if parts:
+            df = pd.concat([read_part(partition_dir(self.root, p["device"], p["month"]), stored) for p in parts],
+                           ignore_index=True)
+        else:
+            df = pd.DataFrame({name: np.array([], dtype=DTYPES.get(name, object)) for name in stored})
+        sizes = [p["rows"] for p in parts]
+        if "device" in columns:
+            labels = [self.devices[p["device"]] for p in parts]
+            df["device"] = pd.Categorical(np.repeat(labels, sizes) if parts else [],
+                                          categories=list(self.devices.values()))
+        if "month" in columns:
+            months = [None if p["month"] == NO_MONTH else p["month"] for p in parts]
+            df["month"] = pd.to_datetime(np.repeat(np.array(months, dtype="datetime64[D]"), sizes)
+                                         ).astype("datetime64[s]")
+        for name in scores:
+            df = df.merge(self.read_scores(name), on="review_id", how="left")
+        keep = columns + [c for c in df.columns if c not in columns and c not in stored]
+        return df[keep]
+
+    # Score tables ─────────────────────────────────────────────────────────────
+    def write_scores(self, name: str, frame: pd.DataFrame):
+        """Store per-review scores (review_id plus any columns) as table `name`, replacing it"""
+        if "review_id" not in frame.columns:
+            raise ValueError("score tables are keyed by review_id")
+        frame = frame.reset_index(drop=True)
+        for column in frame.columns:
+            # Labels ("Positive", "Unknown", ...) are stored once per distinct value
+            if frame[column].dtype.kind in "OT" and frame[column].nunique() <= MAX_CATEGORIES:
+                frame[column] = frame[column].astype("category")
+        directory = os.path.join(self.store_dir, "scores", name)
+        staging = f"{directory}.{os.getpid()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        write_part(staging, frame)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(staging, directory)
+
+    def read_scores(self, name: str, columns=None) -> pd.DataFrame:
+        if columns is not None:
+            columns = ["review_id"] + [c for c in columns if c != "review_id"]
+        return read_part(os.path.join(self.store_dir, "scores", name), columns)
+
+
+def is_current(store_dir: str = STORE_DIR, sources: dict = None) -> bool:
+    manifest = load_manifest(store_dir)
+    if manifest is None or manifest.get("version") != STORE_VERSION:
+        return False
+    sources = default_sources() if sources is None else sources
+    if not sources:
+        return True  # store shipped without its CSVs
+    signature = source_signature(sources, manifest["sources"])
+    if signature == manifest["sources"]:
+        return True
+    # Size or mtime moved: still current if the contents hash the same
+    if store_digest(signature) != manifest["digest"]:
+        return False
+    save_manifest(store_dir, {**manifest, "sources": signature})
+    return True
+
+
+def open_store(store_dir: str = STORE_DIR, sources: dict = None) -> ReviewStore:
+    """The store of the final dataset, rebuilt first if any source CSV changed"""
+    if not is_current(store_dir, sources):
+        build(store_dir, sources)
+    return ReviewStore(store_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and inspect the columnar review store")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    if args.rebuild or not is_current(args.store_dir):
+        start = time.perf_counter()
+        build(args.store_dir)
+        print(f"🔨 Built in {(time.perf_counter() - start) * 1000:.0f} ms")
+    store = ReviewStore(args.store_dir)
+    csv_bytes = sum(os.path.getsize(path) for path in default_sources().values())
+    print(f"📦 {store}: {directory_size(store.root) / 1e6:.2f} MB "
+          f"(final CSVs: {csv_bytes / 1e6:.2f} MB)")
+    counts = pd.DataFrame(store.manifest["partitions"]).pivot_table(
+        index="month", columns="device", values="rows", aggfunc="sum", fill_value=0)
+    print(counts.to_string())
+    quarantined = {stem: q["quarantined"] for stem, q in store.manifest["quality"].items() if q["quarantined"]}
+    if quarantined:
+        print(f"🚧 Quarantined by the quality gate: {quarantined} "
+              f"(see {os.path.join(args.store_dir, 'quality', REPORT_NAME)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Builds lexicon_data/english_scowl.txt, the full English dictionary of the
+shared lexicon (lexicon.py), from a Hunspell en_US dictionary. Hunspell's
+en_US is generated from SCOWL (http://wordlist.aspell.net/) and ships with
+most Linux distributions (hunspell-en-us), LibreOffice and Enchant.
+
+The .dic file lists stems with affix flags ("review/MDRSZG"); every stem is
+expanded with the .aff rules into its word forms (reviews, reviewed,
+reviewer, ...), a prefix on top of a suffix where both rules allow it. Only
+lowercase a-z forms are kept: capitalized stems are proper nouns, and the
+lexicon holds no apostrophes or digits. The lexicon rebuilds its binary on
+the next load, since the file is one of its sources.
+
+Usage:
+    python scowl_wordlist.py                              # first en_US.dic found in DICT_DIRS
+    python scowl_wordlist.py --dic /path/to/en_US.dic     # its .aff next to it
+"""
+
+import argparse
+import os
+import re
+
+from lexicon import DATA_DIR, WORD_RE
+
+DICT_DIRS = ["/usr/share/hunspell", "/usr/share/myspell", "/usr/share/myspell/dicts",
+             "/usr/local/share/hunspell", "/Library/Spelling", os.path.expanduser("~/Library/Spelling")]
+OUTPUT_NAME = "english_scowl.txt"
+
+
+class AffixRule:
+    """One PFX/SFX line: strip `strip`, add `add` where `condition` matches the word's start/end"""
+
+    __slots__ = ("strip", "add", "condition")
+
+    def __init__(self, kind, strip, add, condition):
+        self.strip = "" if strip == "0" else strip
+        add = add.split("/")[0]  # continuation classes are not expanded
+        self.add = "" if add == "0" else add
+        self.condition = re.compile(f"{condition}$" if kind == "SFX" else f"^{condition}")
+
+    def suffix(self, word):
+        if word.endswith(self.strip) and self.condition.search(word):
+            return word[:len(word) - len(self.strip)] + self.add
+        return None
+
+    def prefix(self, word):
+        if word.startswith(self.strip) and self.condition.search(word):
+            return self.add + word[len(self.strip):]
+        return None
+
+
+class Affixes:
+    """The parts of a .aff file word expansion needs"""
+
+    def __init__(self, path):
+        self.flag_type = "short"
+        self.rules = {}  # flag -> (kind, cross_product, [AffixRule])
+        self.skip = set()  # ONLYINCOMPOUND / FORBIDDENWORD: never a word on its own
+        self.need_affix = None
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = [line.split() for line in f]
+        i = 0
+        while i < len(lines):
+            fields = lines[i]
+            i += 1
+            if not fields:
+                continue
+            if fields[0] == "FLAG":
+                self.flag_type = fields[1]
+            elif fields[0] in ("ONLYINCOMPOUND", "FORBIDDENWORD"):
+                self.skip.add(fields[1])
+            elif fields[0] == "NEEDAFFIX":
+                self.need_affix = fields[1]
+            elif fields[0] in ("PFX", "SFX") and len(fields) >= 4 and fields[2] in "YN":
+                kind, flag, cross, count = fields[0], fields[1], fields[2] == "Y", int(fields[3])
+                entries = [AffixRule(kind, e[2], e[3], e[4] if len(e) > 4 else ".") for e in lines[i:i + count]]
+                self.rules[flag] = (kind, cross, entries)
+                i += count
+
+    def flags(self, text):
+        if self.flag_type == "long":
+            return [text[i:i + 2] for i in range(0, len(text), 2)]
+        if self.flag_type == "num":
+            return text.split(",")
+        return list(text)
+
+    def expand(self, stem, flags):
+        """Every word form of one .dic entry"""
+        flags = self.flags(flags)
+        if self.skip.intersection(flags):
+            return []
+        forms = [] if self.need_affix in flags else [stem]
+        suffixed = [stem]  # suffixed forms that still take a cross-product prefix
+        prefixes = []
+        for flag in flags:
+            kind, cross, entries = self.rules.get(flag, (None, False, ()))
+            if kind == "SFX":
+                for rule in entries:
+                    form = rule.suffix(stem)
+                    if form is not None:
+                        forms.append(form)
+                        if cross:
+                            suffixed.append(form)
+            elif kind == "PFX":
+                prefixes.append((cross, entries))
+        for cross, entries in prefixes:
+            for base in (suffixed if cross else [stem]):
+                for rule in entries:
+                    form = rule.prefix(base)
+                    if form is not None:
+                        forms.append(form)
+        return forms
+
+
+def find_dictionary():
+    for directory in DICT_DIRS:
+        path = os.path.join(directory, "en_US.dic")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def expand_dictionary(dic_path, aff_path):
+    """Lowercase a-z word forms of a Hunspell dictionary"""
+    affixes = Affixes(aff_path)
+    words = set()
+    with open(dic_path, encoding="utf-8", errors="replace") as f:
+        next(f)  # approximate entry count
+        for line in f:
+            entry = line.split(None, 1)[0] if line.strip() else ""
+            stem, _, flags = entry.partition("/")
+            if stem:
+                words.update(form for form in affixes.expand(stem, flags) if WORD_RE.match(form))
+    return words
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build lexicon_data/english_scowl.txt from Hunspell en_US")
+    parser.add_argument("--dic", help="en_US.dic (default: the first one in DICT_DIRS)")
+    parser.add_argument("--aff", help="affix file (default: the .dic path with .aff)")
+    parser.add_argument("--output", default=os.path.join(DATA_DIR, OUTPUT_NAME))
+    args = parser.parse_args()
+
+    dic_path = args.dic or find_dictionary()
+    if dic_path is None:
+        print("❌ No en_US.dic found in " + ", ".join(DICT_DIRS))
+        print("   Install hunspell-en-us (or take en_US.dic/.aff from LibreOffice) and pass --dic")
+        return
+    aff_path = args.aff or os.path.splitext(dic_path)[0] + ".aff"
+    words = expand_dictionary(dic_path, aff_path)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(f"# English word forms from the Hunspell en_US dictionary, which is generated from\n"
+                f"# SCOWL (http://wordlist.aspell.net/): {len(words):,} words, expanded by\n"
+                f"# scowl_wordlist.py. SCOWL and en_US are copyright Kevin Atkinson and the\n"
+                f"# contributors named in SCOWL's README, used under its permissive license.\n"
+                f"# Rebuild: python scowl_wordlist.py --dic <path to en_US.dic>\n")
+        f.writelines(f"{word}\n" for word in sorted(words))
+    print(f"📖 {len(words):,} words from {dic_path} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,8 @@ Quantitative comparison of three sentiment analysis approaches:
   3. Word Cloud category proxy       — TF-IDF keyword scoring
 
 Ground truth: Flipkart star ratings (1-5) for iPhone 15, iPhone 16, iQOO Z10.
-Data source : 2_dataset_final_folder (name-cleaned final CSVs).
+Data source : 2_dataset_final_folder (name-cleaned final CSVs, read through
+              the shared loader final_dataset.py).
 
 Metrics produced
 ----------------
@@ -30,7 +31,7 @@ Outputs  (written next to this script in YS/)
 """
 
 import os
-import re
+import sys
 import math
 import warnings
 import numpy as np
@@ -49,188 +50,49 @@ from sklearn.metrics import (
     mean_squared_error,
 )
 
+# Reviews come from the loader shared by every stage (parsed once, cached on disk)
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                 "../../2_dataset_final_folder")))
+from final_dataset import load_reviews
+from review_store import open_store
+
+# Scorers shared with the scrapers' streaming mode
+from sentiment_methods import (
+    METHODS,
+    rating_to_label,
+    run_bert,
+    run_vader,
+    run_wordcloud_proxy,
+)
+
 warnings.filterwarnings("ignore")
 
 # ─────────────────────────────────────────────────────────────────────────────
 # CONFIGURATION
 # ─────────────────────────────────────────────────────────────────────────────
 BASE = os.path.dirname(os.path.abspath(__file__))   # …/3_sentimental_analysis/YS
-FINAL_DATA = os.path.normpath(os.path.join(BASE, "../../2_dataset_final_folder"))
 
-DATASETS = {
-    "iPhone 16": os.path.join(FINAL_DATA, "iphone16.csv"),
-    "iPhone 15": os.path.join(FINAL_DATA, "iphone15.csv"),
-    "iQOO Z10":  os.path.join(FINAL_DATA, "iqoo_z10.csv"),
-}
+DEVICES = ["iPhone 16", "iPhone 15", "iQOO Z10"]
 
 OUTPUT_DIR   = BASE
 RESULTS_CSV  = os.path.join(OUTPUT_DIR, "comparison_results_v2.csv")
 SUMMARY_CSV  = os.path.join(OUTPUT_DIR, "comparison_summary_v2.csv")
 
-# Rating -> sentiment label mapping (ground truth)
-def rating_to_label(r):
-    if r >= 4:  return "Positive"
-    if r == 3:  return "Neutral"
-    return "Negative"
-
-# Sentiment label -> numeric mid-point for RMSE
-LABEL_TO_RATING = {"Positive": 4.5, "Neutral": 3.0, "Negative": 1.5}
-
 # ─────────────────────────────────────────────────────────────────────────────
 # STEP 1 -- LOAD & CLEAN DATA
 # ─────────────────────────────────────────────────────────────────────────────
 def load_data():
-    frames = []
-    for device, path in DATASETS.items():
-        if not os.path.exists(path):
-            print(f"  [SKIP] {device}: file not found -> {path}")
-            continue
-        df = pd.read_csv(path)
-
-        # The final dataset uses column 'text'; rename to 'review_text' for compatibility
-        if "text" in df.columns and "review_text" not in df.columns:
-            df = df.rename(columns={"text": "review_text"})
-
-        required = {"rating", "review_text"}
-        if not required.issubset(df.columns):
-            print(f"  [SKIP] {device}: missing columns {required - set(df.columns)}")
-            continue
-
-        df = df[["rating", "review_text"]].dropna()
-        df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
-        df = df.dropna(subset=["rating"])
-        df["rating"] = df["rating"].astype(int).clip(1, 5)
-        df = df[df["review_text"].str.strip() != ""]
-        df["device"]     = device
-        df["true_label"] = df["rating"].apply(rating_to_label)
-        frames.append(df)
-        print(f"  Loaded {device}: {len(df)} reviews")
-    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
-
-
-# ─────────────────────────────────────────────────────────────────────────────
-# STEP 2a -- VADER
-# ─────────────────────────────────────────────────────────────────────────────
-def run_vader(df):
-    try:
-        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    except ImportError:
-        print("  [WARN] vaderSentiment not installed (pip install vaderSentiment)")
-        df["vader_compound"]    = np.nan
-        df["vader_label"]       = "Unknown"
-        df["vader_pred_rating"] = np.nan
-        return df
-
-    sia = SentimentIntensityAnalyzer()
-    def score(text):
-        try:
-            return sia.polarity_scores(str(text))["compound"]
-        except Exception:
-            return 0.0
-
-    df["vader_compound"]    = df["review_text"].apply(score)
-    df["vader_label"]       = df["vader_compound"].apply(
-        lambda c: "Positive" if c >= 0.05 else ("Negative" if c <= -0.05 else "Neutral")
-    )
-    # Map compound (-1...+1) to rating scale (1...5)
-    df["vader_pred_rating"] = (3.0 + 2.0 * df["vader_compound"]).clip(1, 5)
+    df = load_reviews(["rating", "review_text", "device", "review_id"], devices=DEVICES)
+    df = df[df["review_text"].str.strip() != ""].reset_index(drop=True)
+    df.insert(3, "true_label", df["rating"].apply(rating_to_label))
+    for device, n in df["device"].value_counts(sort=False).items():
+        print(f"  Loaded {device}: {n} reviews" if n else f"  [SKIP] {device}: no reviews")
     return df
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# STEP 2b -- BERT (distilbert-base-uncased-finetuned-sst-2-english)
+# STEP 2 -- SCORING: run_vader / run_bert / run_wordcloud_proxy (sentiment_methods.py)
 # ─────────────────────────────────────────────────────────────────────────────
-def run_bert(df):
-    try:
-        from transformers import pipeline
-        print("  Loading BERT pipeline ...")
-        clf = pipeline(
-            "sentiment-analysis",
-            model="distilbert-base-uncased-finetuned-sst-2-english",
-            truncation=True,
-            max_length=512,
-        )
-    except ImportError:
-        print("  [WARN] transformers not installed (pip install transformers torch)")
-        df["bert_label"]       = "Unknown"
-        df["bert_score"]       = np.nan
-        df["bert_pred_rating"] = np.nan
-        return df
-
-    BATCH = 64
-    labels, scores = [], []
-    texts = df["review_text"].fillna("").astype(str).tolist()
-
-    for i in range(0, len(texts), BATCH):
-        batch = texts[i : i + BATCH]
-        try:
-            results = clf(batch)
-        except Exception as e:
-            print(f"  [WARN] BERT batch {i}-{i+BATCH} failed: {e}")
-            results = [{"label": "POSITIVE", "score": 0.5}] * len(batch)
-        for r in results:
-            lbl = r["label"].upper()
-            sc  = r["score"]
-            if lbl == "POSITIVE":
-                labels.append("Positive")
-                scores.append(sc)
-            else:
-                labels.append("Negative")
-                scores.append(1.0 - sc)
-        if (i // BATCH) % 10 == 0:
-            print(f"    BERT progress: {min(i+BATCH, len(texts))}/{len(texts)}")
-
-    def bert_to_3class(pos_prob):
-        if pos_prob >= 0.60:  return "Positive"
-        if pos_prob <= 0.40:  return "Negative"
-        return "Neutral"
-
-    df["bert_label"]       = [bert_to_3class(s) for s in scores]
-    df["bert_score"]       = scores
-    df["bert_pred_rating"] = (1.0 + 4.0 * np.array(scores)).clip(1, 5)
-    return df
-
-
-# ─────────────────────────────────────────────────────────────────────────────
-# STEP 2c -- Word Cloud / keyword proxy
-# ─────────────────────────────────────────────────────────────────────────────
-POSITIVE_WORDS = {
-    "amazing", "excellent", "awesome", "fantastic", "perfect", "love", "great",
-    "superb", "outstanding", "best", "wonderful", "brilliant", "super",
-    "fabulous", "good", "nice", "smooth", "fast", "powerful", "premium",
-    "recommend", "happy", "satisfied", "worth", "beautiful", "impressive",
-    "terrific", "classy", "lovely", "compact",
-    # domain-specific positives
-    "crisp", "clear", "vivid", "responsive", "accurate", "reliable", "efficient",
-    "stunning", "remarkable", "incredible", "unbelievable", "breathtaking",
-}
-NEGATIVE_WORDS = {
-    "bad", "poor", "terrible", "worst", "horrible", "useless", "disappointed",
-    "disappointing", "slow", "lag", "laggy", "overheating", "hot", "heating",
-    "drain", "draining", "blinking", "hanging", "freeze", "crash", "defective",
-    "waste", "overrated", "boring", "problem", "issue",
-    # domain-specific negatives
-    "scratched", "broken", "damaged", "fake", "refurbished", "overprice",
-    "pathetic", "dreadful", "awful", "horrendous", "abysmal",
-}
-
-def wc_score(text):
-    """Return a signed score in [-1, +1] based on keyword counting."""
-    words = re.findall(r"[a-z]+", str(text).lower())
-    pos = sum(1 for w in words if w in POSITIVE_WORDS)
-    neg = sum(1 for w in words if w in NEGATIVE_WORDS)
-    total = pos + neg
-    if total == 0:
-        return 0.0
-    return (pos - neg) / total   # ranges -1 to +1
-
-def run_wordcloud_proxy(df):
-    df["wc_score"]       = df["review_text"].apply(wc_score)
-    df["wc_label"]       = df["wc_score"].apply(
-        lambda s: "Positive" if s > 0.1 else ("Negative" if s < -0.1 else "Neutral")
-    )
-    df["wc_pred_rating"] = (3.0 + 2.0 * df["wc_score"]).clip(1, 5)
-    return df
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -280,12 +142,6 @@ def per_device_metrics(df, pred_label_col, pred_rating_col, method_name):
 # ─────────────────────────────────────────────────────────────────────────────
 # STEP 4 -- PLOTS
 # ─────────────────────────────────────────────────────────────────────────────
-METHODS = [
-    ("VADER",      "vader_label",  "vader_pred_rating"),
-    ("BERT",       "bert_label",   "bert_pred_rating"),
-    ("Word Cloud", "wc_label",     "wc_pred_rating"),
-]
-
 def plot_confusion(df, label_col, method_name):
     labels = ["Positive", "Neutral", "Negative"]
     valid  = df[[label_col, "true_label"]].dropna()
@@ -391,7 +247,7 @@ def main():
     print("[1] Loading cleaned final datasets ...")
     df = load_data()
     if df.empty:
-        print("  No data found. Check DATASETS paths.")
+        print("  No data found. Check 2_dataset_final_folder.")
         return
     print(f"  Total reviews: {len(df)}\n")
 
@@ -410,9 +266,10 @@ def main():
     print("[2c] Running Word Cloud proxy ...")
     df = run_wordcloud_proxy(df)
 
-    # 3. Save full results
+    # 3. Save full results (and the scores alone, keyed by review_id, in the review store)
     df.to_csv(RESULTS_CSV, index=False)
     print(f"\n  Full results saved -> {os.path.basename(RESULTS_CSV)}")
+    open_store().write_scores("comparison", df.drop(columns=["rating", "review_text", "device", "true_label"]))
 
     # 4. Compute summary metrics (all devices combined)
     print("\n[3] Computing metrics ...\n")
@@ -0,0 +1,193 @@
+"""
+sentiment_methods.py
+====================
+The three sentiment scorers compared in compare_methods_v2.py, importable on
+their own (no plotting or sklearn imports) so the scrapers' streaming mode
+(1_data_scrapping/stream_scoring.py) scores reviews exactly the same way:
+
+  1. VADER (vaderSentiment)          — lexicon-based, no training
+  2. BERT  (transformers pipeline)   — deep-learning, pre-trained
+  3. Word Cloud category proxy       — keyword scoring
+
+Each run_* function takes a DataFrame with a 'review_text' column and adds
+<method>_label / <method>_pred_rating columns. The VADER analyzer and the BERT
+pipeline are built once per process, so calling run_* on many small batches
+costs no more than one call on the whole dataset.
+"""
+
+import os
+import re
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+# The keyword lists live in the lexicon shared with the name cleaner
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                 "../../2_dataset_final_folder")))
+from lexicon import load_lexicon
+
+LABELS = ["Positive", "Neutral", "Negative"]
+
+# Rating -> sentiment label mapping (ground truth)
+def rating_to_label(r):
+    if r >= 4:  return "Positive"
+    if r == 3:  return "Neutral"
+    return "Negative"
+
+# Sentiment label -> numeric mid-point for RMSE
+LABEL_TO_RATING = {"Positive": 4.5, "Neutral": 3.0, "Negative": 1.5}
+
+# (display name, label column, predicted-rating column)
+METHODS = [
+    ("VADER",      "vader_label",  "vader_pred_rating"),
+    ("BERT",       "bert_label",   "bert_pred_rating"),
+    ("Word Cloud", "wc_label",     "wc_pred_rating"),
+]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# VADER
+# ─────────────────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=None)
+def vader_analyzer():
+    """Shared SentimentIntensityAnalyzer, or None if vaderSentiment is missing"""
+    try:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    except ImportError:
+        print("  [WARN] vaderSentiment not installed (pip install vaderSentiment)")
+        return None
+    return SentimentIntensityAnalyzer()
+
+
+def run_vader(df):
+    sia = vader_analyzer()
+    if sia is None:
+        df["vader_compound"]    = np.nan
+        df["vader_label"]       = "Unknown"
+        df["vader_pred_rating"] = np.nan
+        return df
+
+    def score(text):
+        try:
+            return sia.polarity_scores(str(text))["compound"]
+        except Exception:
+            return 0.0
+
+    df["vader_compound"]    = df["review_text"].apply(score)
+    df["vader_label"]       = df["vader_compound"].apply(
+        lambda c: "Positive" if c >= 0.05 else ("Negative" if c <= -0.05 else "Neutral")
+    )
+    # Map compound (-1...+1) to rating scale (1...5)
+    df["vader_pred_rating"] = (3.0 + 2.0 * df["vader_compound"]).clip(1, 5)
+    return df
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BERT (distilbert-base-uncased-finetuned-sst-2-english)
+# ─────────────────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=None)
+def bert_pipeline():
+    """Shared sentiment pipeline, or None if transformers is missing"""
+    try:
+        from transformers import pipeline
+    except ImportError:
+        print("  [WARN] transformers not installed (pip install transformers torch)")
+        return None
+    print("  Loading BERT pipeline ...")
+    return pipeline(
+        "sentiment-analysis",
+        model="distilbert-base-uncased-finetuned-sst-2-english",
+        truncation=True,
+        max_length=512,
+    )
+
+
+def bert_to_3class(pos_prob):
+    if pos_prob >= 0.60:  return "Positive"
+    if pos_prob <= 0.40:  return "Negative"
+    return "Neutral"
+
+
+def run_bert(df, progress=True):
+    clf = bert_pipeline()
+    if clf is None:
+        df["bert_label"]       = "Unknown"
+        df["bert_score"]       = np.nan
+        df["bert_pred_rating"] = np.nan
+        return df
+
+    BATCH = 64
+    labels, scores = [], []
+    texts = df["review_text"].fillna("").astype(str).tolist()
+
+    for i in range(0, len(texts), BATCH):
+        batch = texts[i : i + BATCH]
+        try:
+            results = clf(batch)
+        except Exception as e:
+            print(f"  [WARN] BERT batch {i}-{i+BATCH} failed: {e}")
+            results = [{"label": "POSITIVE", "score": 0.5}] * len(batch)
+        for r in results:
+            lbl = r["label"].upper()
+            sc  = r["score"]
+            if lbl == "POSITIVE":
+                labels.append("Positive")
+                scores.append(sc)
+            else:
+                labels.append("Negative")
+                scores.append(1.0 - sc)
+        if progress and (i // BATCH) % 10 == 0:
+            print(f"    BERT progress: {min(i+BATCH, len(texts))}/{len(texts)}")
+
+    df["bert_label"]       = [bert_to_3class(s) for s in scores]
+    df["bert_score"]       = scores
+    df["bert_pred_rating"] = (1.0 + 4.0 * np.array(scores)).clip(1, 5)
+    return df
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Word Cloud / keyword proxy
+# ─────────────────────────────────────────────────────────────────────────────
+# lexicon_data/positive.txt and negative.txt, memory-mapped (see lexicon.py)
+POSITIVE_WORDS = load_lexicon().positive
+NEGATIVE_WORDS = load_lexicon().negative
+WORD_RE = re.compile(r"[a-z]+")
+
+
+def _keyword_scores(counts, pos, neg):
+    """Per-text (pos - neg) / (pos + neg), 0 without keywords, from flat per-word masks"""
+    rows = np.repeat(np.arange(len(counts)), counts)
+    pos = np.bincount(rows, weights=pos, minlength=len(counts))
+    neg = np.bincount(rows, weights=neg, minlength=len(counts))
+    total = pos + neg
+    return np.divide(pos - neg, total, out=np.zeros(len(counts)), where=total > 0)
+
+
+def wc_score(text):
+    """Return a signed score in [-1, +1] based on keyword counting."""
+    words = WORD_RE.findall(str(text).lower())
+    return float(_keyword_scores([len(words)], POSITIVE_WORDS.contains(words),
+                                 NEGATIVE_WORDS.contains(words))[0])   # ranges -1 to +1
+
+def run_wordcloud_proxy(df):
+    # Each distinct word is looked up once per keyword list, for all reviews together
+    texts = [WORD_RE.findall(str(t).lower()) for t in df["review_text"]]
+    vocab = {}
+    codes = np.array([vocab.setdefault(w, len(vocab)) for ws in texts for w in ws], dtype=np.intp)
+    vocab = list(vocab)
+    df["wc_score"]       = _keyword_scores([len(ws) for ws in texts],
+                                           POSITIVE_WORDS.contains(vocab)[codes],
+                                           NEGATIVE_WORDS.contains(vocab)[codes])
+    df["wc_label"]       = df["wc_score"].apply(
+        lambda s: "Positive" if s > 0.1 else ("Negative" if s < -0.1 else "Neutral")
+    )
+    df["wc_pred_rating"] = (3.0 + 2.0 * df["wc_score"]).clip(1, 5)
+    return df
+
+
+RUNNERS = {
+    "VADER":      run_vader,
+    "BERT":       run_bert,
+    "Word Cloud": run_wordcloud_proxy,
+}
@@ -11,7 +11,7 @@ Predict next-month rating for each device using:
   4. Weighted ensemble of all three signals
 
 Data sources:
-  - 2_dataset_final_folder/*.csv          (cleaned reviews with dates)
+  - 2_dataset_final_folder/*.csv          (cleaned reviews with dates, via final_dataset.py)
   - 4_enemble_analysis/ensemble_results_v2.csv  (per-review ensemble scores)
   - 4_enemble_analysis/ensemble_summary_v2.csv  (method accuracy weights)
 
@@ -22,7 +22,6 @@ Outputs (in 5_next_month/):
 """
 
 import os
-import re
 import math
 import warnings
 import numpy as np
@@ -34,6 +33,11 @@ import matplotlib.patches as mpatches
 import seaborn as sns
 from datetime import datetime
 
+# Monthly series come from the loader shared by every stage (parsed once, cached on disk)
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                 "../2_dataset_final_folder")))
+from final_dataset import monthly_ratings
+
 warnings.filterwarnings("ignore")
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -41,39 +45,15 @@ warnings.filterwarnings("ignore")
 # ─────────────────────────────────────────────────────────────────────────────
 HERE         = os.path.dirname(os.path.abspath(__file__))
 ROOT         = os.path.normpath(os.path.join(HERE, ".."))
-DATA_DIR     = os.path.join(ROOT, "2_dataset_final_folder")
 ENSEMBLE_CSV = os.path.join(ROOT, "4_enemble_analysis", "ensemble_results_v2.csv")
 SUMMARY_CSV  = os.path.join(ROOT, "4_enemble_analysis", "ensemble_summary_v2.csv")
 OUT_DIR      = HERE
 
-DATASETS = {
-    "iPhone 16": os.path.join(DATA_DIR, "iphone16.csv"),
-    "iPhone 15": os.path.join(DATA_DIR, "iphone15.csv"),
-    "iQOO Z10":  os.path.join(DATA_DIR, "iqoo_z10.csv"),
-}
+DEVICES = ["iPhone 16", "iPhone 15", "iQOO Z10"]
 
 # ─────────────────────────────────────────────────────────────────────────────
 # HELPERS
 # ─────────────────────────────────────────────────────────────────────────────
-MONTH_MAP = {
-    "jan":1,"feb":2,"mar":3,"apr":4,"may":5,"jun":6,
-    "jul":7,"aug":8,"sep":9,"oct":10,"nov":11,"dec":12
-}
-
-def parse_month(val):
-    """Parse 'Nov 2025' -> pd.Timestamp(2025-11-01). Returns NaT on failure."""
-    if not isinstance(val, str):
-        return pd.NaT
-    val = val.strip()
-    m = re.match(r"^([A-Za-z]{3})\s+(\d{4})$", val)
-    if m:
-        mon = MONTH_MAP.get(m.group(1).lower())
-        yr  = int(m.group(2))
-        if mon and 2000 <= yr <= 2100:
-            return pd.Timestamp(yr, mon, 1)
-    return pd.NaT
-
-
 def month_str(ts):
     return ts.strftime("%b %Y")
 
@@ -123,30 +103,16 @@ def confidence_band(std, n_months, rmse_method):
 # ─────────────────────────────────────────────────────────────────────────────
 # STEP 1 — BUILD MONTHLY SERIES FROM CLEANED DATASET
 # ─────────────────────────────────────────────────────────────────────────────
-def build_monthly(device, path):
-    df = pd.read_csv(path)
-
-    # rename text column if needed
-    if "text" in df.columns and "review_text" not in df.columns:
-        df = df.rename(columns={"text": "review_text"})
-
-    df["ts"]     = df["date"].apply(parse_month)
-    df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
-    df = df.dropna(subset=["ts", "rating"])
-    df["rating"] = df["rating"].clip(1, 5)
-    df["is_pos"] = (df["rating"] >= 4).astype(int)
-
+def build_monthly(device):
     monthly = (
-        df.groupby("ts")
-        .agg(
-            n=("rating", "count"),
-            mean_rating=("rating", "mean"),
-            pct_positive=("is_pos", lambda x: x.mean() * 100),
-        )
-        .reset_index()
+        monthly_ratings([device])
+        .drop(columns="device")
+        .rename(columns={"month": "ts"})
         .sort_values("ts")
         .reset_index(drop=True)
     )
+    if monthly.empty:
+        return monthly
 
     # Filter out stray months with tiny samples (< 5 reviews) UNLESS it's recent
     max_ts = monthly["ts"].max()
@@ -461,11 +427,8 @@ def main():
     results = []
 
     print("[2] Building monthly series & predicting per device ...")
-    for device, path in DATASETS.items():
-        if not os.path.exists(path):
-            print(f"  [SKIP] {device}: file not found")
-            continue
-        monthly = build_monthly(device, path)
+    for device in DEVICES:
+        monthly = build_monthly(device)
         if monthly.empty:
             print(f"  [SKIP] {device}: no usable date data")
             continue
@@ -3,14 +3,14 @@ create_dashboard.py
 =====================
 Generates an interactive dashboard to visualize the project's results.
 
-- Replicates the monthly time-series aggregation from the prediction script.
+- Takes the monthly time series from the loader shared with the prediction script.
 - Compares individual and ensemble model performance with charts.
 - Displays final next-month predictions and their component breakdown.
 - Shows historical and predicted time-series data with confidence intervals.
 """
 
 import os
-import re
+import sys
 import pandas as pd
 import dash
 from dash import dcc, html
@@ -23,57 +23,33 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.normpath(os.path.join(BASE_DIR, ".."))
 
 DATA_DIR = os.path.join(ROOT_DIR, "2_dataset_final_folder")
+# Reviews and monthly ratings come from the loader shared by every stage (parsed once, cached on disk)
+sys.path.insert(0, DATA_DIR)
+from final_dataset import load_reviews, monthly_ratings
+from review_store import parse_months
+
 SENTIMENT_SUMMARY_PATH = os.path.join(ROOT_DIR, "3_sentimental_analysis/YS/comparison_summary_v2.csv")
 ENSEMBLE_SUMMARY_PATH = os.path.join(ROOT_DIR, "4_enemble_analysis/ensemble_summary_v2.csv")
 NEXT_MONTH_PRED_PATH = os.path.join(ROOT_DIR, "5_next_month/next_month_prediction_v2.csv")
 ENSEMBLE_RESULTS_PATH = os.path.join(ROOT_DIR, "4_enemble_analysis/ensemble_results_v2.csv")
 
-DATASETS = {
-    "iPhone 16": os.path.join(DATA_DIR, "iphone16.csv"),
-    "iPhone 15": os.path.join(DATA_DIR, "iphone15.csv"),
-    "iQOO Z10":  os.path.join(DATA_DIR, "iqoo_z10.csv"),
-}
-
-MONTH_MAP = {
-    "jan":1,"feb":2,"mar":3,"apr":4,"may":5,"jun":6,
-    "jul":7,"aug":8,"sep":9,"oct":10,"nov":11,"dec":12
-}
-
-# --- 2. Data Loading and Processing Functions ---
-
-def parse_month(val):
-    if not isinstance(val, str): return pd.NaT
-    m = re.match(r"^([A-Za-z]{3})\s+(\d{4})$", val.strip())
-    if m:
-        mon, yr = MONTH_MAP.get(m.group(1).lower()), int(m.group(2))
-        if mon and 2000 <= yr <= 2100: return pd.Timestamp(yr, mon, 1)
-    return pd.NaT
-
-def build_monthly(device, path):
-    df = pd.read_csv(path)
-    if "text" in df.columns and "review_text" not in df.columns:
-        df = df.rename(columns={"text": "review_text"})
-    df["ts"] = df["date"].apply(parse_month)
-    df["rating"] = pd.to_numeric(df["rating"], errors="coerce").clip(1, 5)
-    df = df.dropna(subset=["ts", "rating"])
-    monthly = df.groupby("ts").agg(Actual_Rating=("rating", "mean")).reset_index()
-    monthly['Device'] = device
-    return monthly
-
-# --- 3. Load All Data ---
+DEVICES = ["iPhone 16", "iPhone 15", "iQOO Z10"]
+
+# --- 2. Load All Data ---
 
 sentiment_summary_df = pd.read_csv(SENTIMENT_SUMMARY_PATH)
 ensemble_summary_df = pd.read_csv(ENSEMBLE_SUMMARY_PATH)
 next_month_pred_df = pd.read_csv(NEXT_MONTH_PRED_PATH)
 
-review_dfs = [pd.read_csv(path).rename(columns={"text": "review_text"}) for path in DATASETS.values()]
-all_reviews_df = pd.concat(review_dfs)[['review_text', 'date']].dropna()
-
-all_devices_monthly_df = pd.concat([build_monthly(dev, p) for dev, p in DATASETS.items()]).rename(columns={'ts': 'Date'})
+all_devices_monthly_df = (monthly_ratings(DEVICES)[['month', 'mean_rating', 'device']]
+                          .astype({'device': str})
+                          .rename(columns={'month': 'Date', 'mean_rating': 'Actual_Rating', 'device': 'Device'}))
 
+# Results carry the review_id of each review; ones written before it existed are matched on the text
 ensemble_results_df = pd.read_csv(ENSEMBLE_RESULTS_PATH)
-ensemble_results_df = pd.merge(ensemble_results_df, all_reviews_df, on='review_text', how='left')
-ensemble_results_df['Date'] = ensemble_results_df['date'].apply(parse_month)
+join_key = 'review_id' if 'review_id' in ensemble_results_df.columns else 'review_text'
+review_months_df = load_reviews([join_key, 'month'], DEVICES).rename(columns={'month': 'Date'})
+ensemble_results_df = pd.merge(ensemble_results_df, review_months_df, on=join_key, how='left')
 
 monthly_preds_df = ensemble_results_df.groupby(['device', 'Date']).agg(
     Soft_Voting_Pred_Rating=('soft_vote_pred_rating', 'mean')
@@ -81,7 +57,7 @@ monthly_preds_df = ensemble_results_df.groupby(['device', 'Date']).agg(
 
 time_series_df = pd.merge(all_devices_monthly_df, monthly_preds_df, on=['Device', 'Date'], how='left')
 
-# --- 4. Prepare Data for Visualization ---
+# --- 3. Prepare Data for Visualization ---
 
 # For performance charts
 perf_df = pd.concat([
@@ -99,12 +75,12 @@ pred_breakdown_df['exp_smooth_contrib'] = pred_breakdown_df['exp_smooth_pred'] *
 pred_breakdown_df['sentiment_contrib'] = pred_breakdown_df['sentiment_signal_pred'] * pred_breakdown_df['w_sentiment']
 
 # For time series with confidence interval
-next_month_pred_df['target_month_ts'] = next_month_pred_df['target_month'].apply(parse_month)
+next_month_pred_df['target_month_ts'] = parse_months(next_month_pred_df['target_month'])
 ci_df = next_month_pred_df[['device', 'target_month_ts', 'predicted_rating', 'ci_lower', 'ci_upper']].rename(
     columns={'device': 'Device', 'target_month_ts': 'Date', 'predicted_rating': 'Soft_Voting_Pred_Rating'}
 )
 
-# --- 5. Initialize and Layout Dash App ---
+# --- 4. Initialize and Layout Dash App ---
 app = dash.Dash(__name__, external_stylesheets=['https://codepen.io/chriddyp/pen/bWLwgP.css'])
 app.title = "AI Prediction System Dashboard"
 
@@ -128,7 +104,7 @@ app.layout = html.Div(children=[
     dcc.Graph(id='ratings-time-series-chart')
 ])
 
-# --- 6. Callbacks for Interactivity ---
+# --- 5. Callbacks for Interactivity ---
 
 @app.callback(Output('prediction-breakdown-chart', 'figure'), [Input('device-breakdown-dropdown', 'value')])
 def update_breakdown_chart(device):
@@ -180,6 +156,6 @@ def update_time_series_chart(device):
                       legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
     return fig
 
-# --- 7. Run the App ---
+# --- 6. Run the App ---
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,87 @@
+"""
+bench_clean_names.py
+====================
+Trailing reviewer-name stripping, per row vs whole column.
+
+  apply       : df[text].apply(clean_names.strip_trailing_name)
+  column      : clean_names.strip_trailing_names (Arrow string kernels, a regex
+                prefilter and one lexicon lookup over the distinct tokens)
+
+Inputs are the 'text' columns of the final dataset CSVs (2_dataset_final_folder,
+including the *_before_name_clean copies, which still carry the names). The
+script first checks that both variants give identical output on every file,
+then times them on all texts repeated --scale times, two ways:
+
+  repeated texts : the copies as they are (the column version works once per
+                   distinct text, so this is its cheap case)
+  distinct texts : every copy made unique by a leading "#<copy>" token (one
+                   evaluation per row: the worst case)
+
+Usage
+-----
+    python benchmarks/bench_clean_names.py [--scale 100] [--repeat 3]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "2_dataset_final_folder"))
+
+from clean_names import TEXT_COL, strip_trailing_name, strip_trailing_names
+
+CSV_GLOB = os.path.join(ROOT, "2_dataset_final_folder", "*.csv")
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row vs column name stripping")
+    parser.add_argument("--scale", type=int, default=100, help="times to repeat the corpus for timing")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    columns = []
+    for path in sorted(glob.glob(CSV_GLOB)):
+        df = pd.read_csv(path)
+        if TEXT_COL not in df.columns:
+            continue
+        texts = df[TEXT_COL]
+        expected = texts.apply(strip_trailing_name)
+        column = strip_trailing_names(texts)
+        changed = (expected != texts).sum()
+        print(f"{os.path.basename(path):34s} {len(texts):6d} rows, {changed:4d} changed, "
+              f"identical: {column.equals(expected)}")
+        columns.append(texts)
+
+    corpus = pd.concat(columns, ignore_index=True)
+    repeated = pd.concat([corpus] * args.scale, ignore_index=True)
+    distinct = pd.concat([f"#{i} " + corpus for i in range(args.scale)], ignore_index=True)
+    print(f"\nTiming on {len(repeated):,} texts ({args.scale}x the corpus)\n")
+    rows = []
+    for label, texts in [("repeated texts", repeated), ("distinct texts", distinct)]:
+        expected, apply_s = timed(lambda: texts.apply(strip_trailing_name), args.repeat)
+        column, column_s = timed(lambda: strip_trailing_names(texts), args.repeat)
+        rows += [
+            {"data": label, "variant": "apply", "rows_per_s": round(len(texts) / apply_s), "speedup": 1.0,
+             "identical": True},
+            {"data": label, "variant": "column", "rows_per_s": round(len(texts) / column_s),
+             "speedup": round(apply_s / column_s, 2), "identical": column.equals(expected)},
+        ]
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+bench_crawl.py
+==============
+End-to-end crawl throughput of FlipkartScraper against the local mock
+server (mock_flipkart.py), so fetch/parse/save changes can be measured
+offline.
+
+The mock runs in its own process; every crawl configuration runs in a fresh
+child process with its own scratch directory (CSV, journal, page store,
+checkpoint database), so CPU time and peak RSS belong to the scraper alone.
+The rate controller is swapped for one paced by --delay, so the numbers
+reflect the crawl machinery rather than the production politeness budget.
+
+Reports, per worker count (and parse-process count): pages/s, reviews/s, CPU ms per page, peak RSS.
+
+Usage
+-----
+    python benchmarks/bench_crawl.py                          # iphone15, 50 pages, workers 1 and 4
+    python benchmarks/bench_crawl.py --product iphone16 --workers 1 2 4 8 --latency 0.2
+    python benchmarks/bench_crawl.py --burst-every 40 --burst-len 3 --error-rate 0.02
+    python benchmarks/bench_crawl.py --burst-every 10 --burst-len 3 --burst-status 403   # anti-bot blocks back off too
+    python benchmarks/bench_crawl.py --workers 4 8 --parse-processes 0 2   # parse-process pipeline
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.normpath(os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT, "1_data_scrapping"))
+
+from mock_flipkart import MockFlipkartServer, add_mock_arguments, config_from_args
+from products import PRODUCTS
+
+
+def serve(args, url_queue):
+    server = MockFlipkartServer(config_from_args(args))
+    url_queue.put(server.url)
+    server.httpd.serve_forever()
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_crawl(product_key, url, workers, max_pages, delay, parse_processes=0):
+    """One crawl in a scratch directory; runs in its own process"""
+    from flipkart_scraper import FlipkartScraper
+    from polite_fetch import AdaptiveRateLimiter
+
+    with tempfile.TemporaryDirectory() as workdir:
+        scraper = FlipkartScraper(product_key, workdir=workdir, state_dir=workdir)
+        scraper.session.rate_limiter = AdaptiveRateLimiter.from_delay(*delay)
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            scraper.scrape_reviews(url, max_pages=max_pages, workers=workers, parse_processes=parse_processes)
+            scraper.save_to_csv()
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        counts = scraper.checkpoint.counts()
+        pages = sum(n for n, _ in counts.values())
+        reviews = sum(r for _, r in counts.values())
+        rate = scraper.session.rate_limiter.snapshot()
+        scraper.checkpoint.close()
+
+    return {
+        "workers": workers,
+        "parse_procs": parse_processes,
+        "pages": pages,
+        "reviews": reviews,
+        "failed": counts.get("failed", (0, 0))[0],
+        "seconds": round(wall, 2),
+        "pages_per_s": round(pages / wall, 2) if wall else 0.0,
+        "reviews_per_s": round(reviews / wall, 1) if wall else 0.0,
+        "cpu_ms_per_page": round(cpu * 1000 / pages, 1) if pages else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "final_rate_per_min": rate["rate_per_min"],
+        "throttled": rate["throttled"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl throughput against the local mock server")
+    parser.add_argument("--product", default="iphone15", choices=sorted(PRODUCTS))
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--delay", type=float, nargs=2, default=[0.01, 0.02], metavar=("MIN", "MAX"),
+                        help="starting request spacing for the rate controller")
+    parser.add_argument("--parse-processes", type=int, nargs="+", default=[0],
+                        help="parser process counts to try per worker count (0 = parse on the fetch threads)")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    url_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(args, url_queue), daemon=True)
+    server.start()
+    url = url_queue.get(timeout=30)
+
+    rows = []
+    try:
+        for workers in args.workers:
+            for parse_processes in args.parse_processes:
+                # Fresh process per run: clean peak RSS and no state carried between runs
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    rows.append(pool.submit(run_crawl, args.product, url, workers, args.pages + 10,
+                                            tuple(args.delay), parse_processes).result())
+    finally:
+        server.terminate()
+        server.join()
+
+    print(f"Product: {args.product}, mock pages: {args.pages}, latency: {args.latency}s, "
+          f"error rate: {args.error_rate}, {args.burst_status} bursts: {args.burst_len}/{args.burst_every or '-'}\n")
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+bench_dedup_index.py
+====================
+Per-page dedup cost of the scraper as the stored review CSV grows.
+
+  legacy : re-read the CSV and rebuild the key set with iterrows() on every page
+           (what scrape_page did before ReviewKeyIndex)
+  index  : ReviewKeyIndex loaded once, then membership checks + add per page
+
+Usage
+-----
+    python benchmarks/bench_dedup_index.py [--sizes 100 1000 10000 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "1_data_scrapping"))
+
+from review_index import ReviewKeyIndex, make_review_key
+
+REVIEWS_PER_PAGE = 10
+PAGES = 20
+
+WORDS = ("good camera battery display smooth premium value money heating lag "
+         "awesome worst super nice phone product delivery fast charging").split()
+
+
+def synthetic_reviews(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        rows.append({
+            "rating": rng.randint(1, 5),
+            "title": " ".join(rng.choices(WORDS, k=3)) + f" {i}",
+            "review_text": f"{i} " + " ".join(rng.choices(WORDS, k=20)),
+            "date": "Jan 2025",
+            "city": "N/A",
+        })
+    return rows
+
+
+def legacy_existing_keys(csv_filename):
+    """Copy of the old SimpleFlipkartScraper._get_existing_review_keys"""
+    df = pd.read_csv(csv_filename)
+    keys = set()
+    for _, row in df.iterrows():
+        keys.add(f"{row['rating']}_{str(row['title'])[:30]}_{str(row['review_text'])[:30]}")
+    return keys
+
+
+def bench_size(n, workdir):
+    csv_path = os.path.join(workdir, f"reviews_{n}.csv")
+    pd.DataFrame(synthetic_reviews(n)).to_csv(csv_path, index=False)
+    pages = [synthetic_reviews(REVIEWS_PER_PAGE, seed=1000 + p) for p in range(PAGES)]
+
+    # Legacy: full reload per page (capped to a few pages for large files)
+    legacy_pages = pages[: max(1, min(PAGES, 200000 // max(n, 1)))]
+    t0 = time.perf_counter()
+    for page in legacy_pages:
+        existing = legacy_existing_keys(csv_path)
+        for r in page:
+            _ = make_review_key(r["rating"], r["title"], r["review_text"]) in existing
+    legacy_ms = (time.perf_counter() - t0) * 1000 / len(legacy_pages)
+
+    # Index: startup cost (cold = from CSV, warm = from key file) + per-page cost
+    t0 = time.perf_counter()
+    ReviewKeyIndex(csv_path)
+    cold_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    index = ReviewKeyIndex(csv_path)
+    warm_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    for page in pages:
+        keys = [make_review_key(r["rating"], r["title"], r["review_text"]) for r in page]
+        index.flush([key for key in keys if index.add(key)])
+    index_ms = (time.perf_counter() - t0) * 1000 / len(pages)
+
+    return {
+        "stored_reviews": n,
+        "legacy_ms_per_page": round(legacy_ms, 3),
+        "index_ms_per_page": round(index_ms, 3),
+        "index_cold_load_ms": round(cold_ms, 1),
+        "index_warm_load_ms": round(warm_ms, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        rows = [bench_size(n, workdir) for n in args.sizes]
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
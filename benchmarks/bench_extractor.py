@@ -0,0 +1,176 @@
+"""
+bench_extractor.py
+==================
+Old vs new review-card extraction over saved HTML pages.
+
+  legacy : html.parser + div.get_text() on every <div>, cleaned with the old
+           regex chain (the pre-refactor iPhone 16 loop and its clean_text)
+  new    : FlipkartScraper.parse_page (lxml when installed, structured
+           selectors first, single-pass div text index as fallback)
+
+Reports pages/second, peak traced memory per page, whether both extractors
+found the same review cards, and how many reviews came out identical (the
+rest differ only by cleaning: pii_scrubber also strips trailing names).
+
+Usage
+-----
+    python benchmarks/bench_extractor.py                       # synthetic pages
+    python benchmarks/bench_extractor.py --fixtures "pages/*.html"
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "1_data_scrapping"))
+
+from review_index import make_review_key
+from text_cleaner import scrub_text
+
+WORDS = ("good camera battery display smooth premium value money heating lag "
+         "awesome worst super nice phone product delivery fast charging").split()
+
+
+def synthetic_page(seed, reviews=10, wrapper_depth=30):
+    """Flipkart-like page: deeply nested wrappers around text-only review cards"""
+    rng = random.Random(seed)
+    cards = []
+    for i in range(reviews):
+        title = " ".join(rng.choices(WORDS, k=2)).capitalize() + f" pick {i}"
+        body = " ".join(rng.choices(WORDS, k=rng.randint(15, 60)))
+        cards.append(
+            "<div><div><div>{r}<img/></div><p>{t}</p></div>"
+            "<div><div><div>{b}</div><span>READ MORE</span></div></div>"
+            "<div><p>Certified Buyer, Pune</p><p>3 months ago</p></div>"
+            "<div><div>Helpful</div><div>{h}</div></div></div>".format(
+                r=rng.randint(1, 5), t=title, b=body, h=rng.randint(0, 99))
+        )
+    inner = "".join(f"<div class='col'><div class='row'>{c}</div></div>" for c in cards)
+    nav = "".join(f"<div><a href='#'>Menu {i}</a></div>" for i in range(200))
+    for _ in range(wrapper_depth):
+        inner = f"<div class='wrap'>{inner}</div>"
+    return f"<html><head><title>Reviews</title></head><body>{nav}{inner}</body></html>"
+
+
+def legacy_parse_page(html):
+    """The pre-refactor iPhone 16 extraction loop (the shared engine's text
+    heuristic) with its clean_text, text_cleaner.scrub_text, kept for comparison"""
+    soup = BeautifulSoup(html, 'html.parser')
+    page_reviews = []
+    seen_reviews = set()
+    for div in soup.find_all('div'):
+        text = div.get_text(separator='\n', strip=True)
+        if not text or len(text) < 20:
+            continue
+        lines = [l.strip() for l in text.split('\n') if l.strip()]
+        if len(lines) >= 3:
+            first_line = lines[0].strip()
+            if first_line and first_line[0] in ['1', '2', '3', '4', '5']:
+                rating = first_line[0]
+                full_text = ' '.join(lines)
+                if 'ratings and' in full_text or 'User reviews sorted' in full_text:
+                    continue
+                title_candidates = []
+                review_candidates = []
+                noise_keywords = ['Certified Buyer', 'Verified Purchase', 'Report Abuse',
+                                  'Permalink', 'Helpful', 'READ MORE', 'Review for Color',
+                                  'Storage', 'ratings and', 'reviews', 'Flipkart Customer',
+                                  'by', 'reviewed', 'writes', 'says', 'posted', 'ago',
+                                  'month', 'months', 'week', 'weeks', 'day', 'days', 'year', 'years']
+                for i, line in enumerate(lines[1:], 1):
+                    has_noise = any(kw in line for kw in noise_keywords)
+                    has_time_pattern = re.search(r'\d+\s*(month|week|day|year|hour)s?\s*ago', line, re.IGNORECASE)
+                    if not has_noise and not has_time_pattern and len(line) > 5:
+                        if i == 1 or (not title_candidates and len(line) < 100):
+                            title_candidates.append(line)
+                        else:
+                            review_candidates.append(line)
+                if title_candidates and review_candidates:
+                    title = scrub_text(title_candidates[0])
+                    review_text = scrub_text(' '.join(review_candidates))
+                    name_indicators = ['flipkart customer', 'certified buyer', 'by ', 'reviewed by']
+                    has_name_indicator = any(indicator in title.lower() or indicator in review_text.lower()
+                                             for indicator in name_indicators)
+                    is_person_name_title = bool(re.match(r'^[A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?$', title))
+                    if (3 < len(title) < 150 and
+                        15 < len(review_text) < 1000 and
+                        not title.replace(' ', '').replace(',', '').isdigit() and
+                        not has_name_indicator and
+                        not is_person_name_title):
+                        review_key = make_review_key(rating, title, review_text)
+                        if review_key not in seen_reviews:
+                            seen_reviews.add(review_key)
+                            page_reviews.append({'rating': int(rating), 'title': title,
+                                                 'review_text': review_text})
+    return page_reviews
+
+
+def measure(name, extract, pages):
+    start = time.perf_counter()
+    outputs = [extract(html) for html in pages]
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    extract(pages[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return outputs, {
+        "extractor": name,
+        "pages": len(pages),
+        "pages_per_s": round(len(pages) / elapsed, 2),
+        "peak_mem_kb": round(peak / 1024, 1),
+        "reviews": sum(len(o) for o in outputs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Old vs new review-card extraction")
+    parser.add_argument("--fixtures", help="glob of saved review-page HTML files")
+    parser.add_argument("--pages", type=int, default=30, help="synthetic pages when no fixtures")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        pages = []
+        for path in sorted(glob.glob(args.fixtures)):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+    else:
+        pages = [synthetic_page(seed) for seed in range(args.pages)]
+    if not pages:
+        print("No pages to benchmark.")
+        return
+
+    from flipkart_scraper import FlipkartScraper
+    from review_extractor import HTML_PARSER
+
+    # The scraper's CSV, checkpoint database and page store all go to a scratch dir
+    with tempfile.TemporaryDirectory() as workdir:
+        scraper = FlipkartScraper("iphone15", workdir=workdir, state_dir=workdir)
+        old_out, old_row = measure("legacy", legacy_parse_page, pages)
+        new_out, new_row = measure(f"single-pass ({HTML_PARSER})", scraper.parse_page, pages)
+
+    print(pd.DataFrame([old_row, new_row]).to_string(index=False))
+    print(f"\nSpeedup: {new_row['pages_per_s'] / old_row['pages_per_s']:.1f}x")
+    # The cleaners differ on purpose (the scrubber also strips trailing names), so
+    # the extraction is compared on the cards found and the text on top of that
+    old_cards = [[(r['rating'], r['title']) for r in o] for o in old_out]
+    new_cards = [[(r['rating'], r['title']) for r in o] for o in new_out]
+    same_text = sum(a == b for o, n in zip(old_out, new_out) for a, b in zip(o, n))
+    print(f"Same cards (rating, title): {old_cards == new_cards}")
+    print(f"Identical output: {old_out == new_out} ({same_text}/{old_row['reviews']} reviews; "
+          f"the rest differ only by PII cleaning, see bench_pii_scrubber.py)")
+
+
+if __name__ == "__main__":
+    main()
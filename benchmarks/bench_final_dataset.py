@@ -0,0 +1,130 @@
+"""
+bench_final_dataset.py
+======================
+What the analysis stages spend getting the final dataset: four copies of
+read_csv / rename / to_numeric / .apply(parse_month) vs the shared loader
+(2_dataset_final_folder/final_dataset.py).
+
+--rows synthetic reviews (drawn from the real ones, as in
+bench_review_store.py) are written as final CSVs to a temporary folder that
+FINAL_DATASET_DIR points the loader at. Then:
+
+  per-stage parsing : compare_methods_v2 load_data, predict_next_month and
+                      create_dashboard build_monthly, the dashboard's review
+                      merge table, as they parsed the CSVs before the loader
+  loader, cold      : fresh interpreter, no store yet (parses and builds it)
+  loader, warm      : fresh interpreter, store on disk: the state of every
+                      stage after the first, and of parallel runs
+  loader, touched   : same after the CSVs' mtimes change but not their
+                      contents (rehashed, not reparsed)
+  loader, memoized  : second call in the same process
+
+The loader runs load the reviews the three stages ask for and the monthly
+series.
+
+Usage
+-----
+    python benchmarks/bench_final_dataset.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DATASET_DIR = os.path.join(ROOT, "2_dataset_final_folder")
+
+from bench_review_store import synthetic_csvs
+
+STAGES = """
+import sys, time
+import pandas
+sys.path.insert(0, {path!r})
+start = time.perf_counter()
+from final_dataset import load_reviews, monthly_ratings
+load_reviews(["rating", "review_text", "device", "review_id"])
+load_reviews(["review_id", "month"])
+monthly_ratings()
+first = time.perf_counter() - start
+start = time.perf_counter()
+load_reviews(["rating", "review_text", "device", "review_id"])
+load_reviews(["review_id", "month"])
+monthly_ratings()
+print(first, time.perf_counter() - start)
+"""
+
+MONTH_MAP = {m: i for i, m in enumerate(["jan", "feb", "mar", "apr", "may", "jun",
+                                          "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+
+def parse_month(val):
+    if not isinstance(val, str):
+        return pd.NaT
+    m = re.match(r"^([A-Za-z]{3})\s+(\d{4})$", val.strip())
+    if m:
+        mon, yr = MONTH_MAP.get(m.group(1).lower()), int(m.group(2))
+        if mon and 2000 <= yr <= 2100:
+            return pd.Timestamp(yr, mon, 1)
+    return pd.NaT
+
+
+def per_stage_parsing(sources):
+    """The stages' CSV handling before the shared loader, one pass per copy of it"""
+    for path in sources.values():  # compare_methods_v2.load_data
+        df = pd.read_csv(path).rename(columns={"text": "review_text"})[["rating", "review_text"]].dropna()
+        df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
+    for _ in range(2):  # predict_next_month and create_dashboard build_monthly
+        for path in sources.values():
+            df = pd.read_csv(path)
+            df["ts"] = df["date"].apply(parse_month)
+            df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
+            df.dropna(subset=["ts", "rating"]).groupby("ts")["rating"].mean()
+    reviews = pd.concat(pd.read_csv(path) for path in sources.values())  # the dashboard's merge table
+    reviews["date"].apply(parse_month)
+
+
+def loader_run(data_dir):
+    env = {**os.environ, "FINAL_DATASET_DIR": data_dir}
+    out = subprocess.run([sys.executable, "-c", STAGES.format(path=DATASET_DIR)], env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return [float(x) for x in out.split()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage CSV parsing vs the shared dataset loader")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="synthetic reviews in total")
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="final_dataset_")
+    try:
+        print(f"Writing {args.rows:,} synthetic reviews as CSV ...\n")
+        sources = synthetic_csvs(work, args.rows)
+
+        start = time.perf_counter()
+        per_stage_parsing(sources)
+        rows = [{"run": "per-stage parsing (4 copies)", "seconds": time.perf_counter() - start}]
+        cold, memo = loader_run(work)
+        warm, _ = loader_run(work)
+        for path in sources.values():
+            os.utime(path)
+        touched, _ = loader_run(work)
+        rows += [{"run": "loader, cold (builds the store)", "seconds": cold},
+                 {"run": "loader, warm (store on disk)", "seconds": warm},
+                 {"run": "loader, touched CSVs (rehash only)", "seconds": touched},
+                 {"run": "loader, memoized in-process", "seconds": memo}]
+        table = pd.DataFrame(rows)
+        table["speedup"] = table["seconds"].iloc[0] / table["seconds"]
+        print(table.round({"seconds": 3, "speedup": 1}).to_string(index=False))
+    finally:
+        shutil.rmtree(work)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+bench_lexicon.py
+================
+Startup and lookup cost of the shared lexicon (2_dataset_final_folder/lexicon.py).
+
+The repo's word lists are copied to a temporary data dir together with a
+synthetic english_large.txt of --words random lowercase words, standing in for
+a full dictionary. Then:
+
+  startup     : fresh interpreter, numpy already imported, time load_lexicon()
+                (stale check + mapping the prebuilt binary); target < 50 ms
+  cleaner     : same, time `import clean_names` after pandas
+  lookups     : `word in english` and english.contains(batch) vs a Python set
+
+Usage
+-----
+    python benchmarks/bench_lexicon.py [--words 150000] [--runs 7]
+"""
+
+import argparse
+import glob
+import os
+import random
+import shutil
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DATASET_DIR = os.path.join(ROOT, "2_dataset_final_folder")
+sys.path.insert(0, DATASET_DIR)
+
+from lexicon import DATA_DIR, build, load_lexicon
+
+STARTUP = """
+import sys, time
+import numpy{extra}
+sys.path.insert(0, {path!r})
+start = time.perf_counter()
+{statement}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def cold_ms(data_dir, statement, extra="", runs=7):
+    """Median ms of `statement` in fresh interpreters pointed at data_dir"""
+    code = STARTUP.format(extra=extra, path=DATASET_DIR, statement=statement)
+    env = {**os.environ, "LEXICON_DATA_DIR": data_dir}
+    times = [float(subprocess.run([sys.executable, "-c", code], env=env, capture_output=True,
+                                  text=True, check=True).stdout) for _ in range(runs)]
+    return statistics.median(times)
+
+
+def per_lookup_us(fn, words, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(words)
+        best = min(best, time.perf_counter() - start)
+    return best / len(words) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lexicon startup and lookup cost")
+    parser.add_argument("--words", type=int, default=150_000, help="size of the synthetic dictionary")
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters per startup timing")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="lexicon_")
+    try:
+        for path in glob.glob(os.path.join(DATA_DIR, "*.txt")):
+            shutil.copy(path, data_dir)
+        rng = random.Random(0)
+        dictionary = {"".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 22)))
+                      for _ in range(args.words)}
+        with open(os.path.join(data_dir, "english_large.txt"), "w") as f:
+            f.write("\n".join(sorted(dictionary)))
+
+        start = time.perf_counter()
+        build(data_dir)
+        build_ms = (time.perf_counter() - start) * 1000
+        lexicon = load_lexicon(data_dir)
+        print(f"{lexicon}: {os.path.getsize(lexicon.path) / 1e6:.1f} MB, built in {build_ms:.0f} ms\n")
+
+        startup = cold_ms(data_dir, "from lexicon import load_lexicon; load_lexicon()", runs=args.runs)
+        cleaner = cold_ms(data_dir, "import clean_names", extra=", pandas", runs=args.runs)
+
+        english = set(lexicon.english)
+        queries = rng.sample(sorted(english), 20_000) + ["".join(rng.choices(string.ascii_lowercase, k=8))
+                                                         for _ in range(20_000)]
+        rows = [
+            {"measure": "load_lexicon() cold start", "value": round(startup, 1), "unit": "ms"},
+            {"measure": "import clean_names (after pandas)", "value": round(cleaner, 1), "unit": "ms"},
+            {"measure": "python set: word in english", "unit": "us/word",
+             "value": round(per_lookup_us(lambda ws: [w in english for w in ws], queries), 3)},
+            {"measure": "lexicon: word in english", "unit": "us/word",
+             "value": round(per_lookup_us(lambda ws: [w in lexicon.english for w in ws], queries), 3)},
+            {"measure": "lexicon: english.contains(batch)", "unit": "us/word",
+             "value": round(per_lookup_us(lexicon.english.contains, queries), 3)},
+        ]
+        print(pd.DataFrame(rows).to_string(index=False))
+        print(f"\nStartup under 50 ms: {'yes' if startup < 50 else 'NO'}")
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    main()
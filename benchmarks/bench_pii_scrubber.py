@@ -0,0 +1,98 @@
+"""
+bench_pii_scrubber.py
+=====================
+Throughput of PII removal, the old chain vs the single-pass scrubber.
+
+  chain   : text_cleaner.scrub_cleaner.clean (rule after rule), the iPhone 16
+            scraper's former _extract_city, then clean_names.strip_trailing_name
+  scrubber: pii_scrubber.PIIScrubber.scrub (one fused scan + trailing-name rules)
+  batch   : PIIScrubber.scrub_series over the whole column
+
+Inputs are the raw review texts of the final dataset (the
+*_before_name_clean.csv files, ~4k reviews), passed over --scale times; the
+work is streamed pass by pass, so a 1000x run does not hold 4M strings. Also
+reports how often the scrubber's text and city agree with the chain's (they
+differ on purpose where the old byline rule removed whole sentences).
+
+Usage
+-----
+    python benchmarks/bench_pii_scrubber.py [--scale 1000]
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "1_data_scrapping"))
+sys.path.insert(0, os.path.join(ROOT, "2_dataset_final_folder"))
+
+import clean_names
+from clean_names import strip_trailing_name
+from pii_scrubber import PIIScrubber
+from text_cleaner import scrub_cleaner
+
+def extract_city(text):
+    """Copy of the iPhone 16 scraper's former _extract_city (the old chain's city rule)"""
+    text = re.sub(r'\d{10,}', '', text)
+    city_match = re.search(r',\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s+(?:District|Division|City))?)[\s,]*$', text)
+    if not city_match:
+        city_match = re.search(r',\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s+(?:District|Division|City))?)\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', text, re.IGNORECASE)
+    if not city_match:
+        city_match = re.search(r',\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,3}(?:\s+(?:District|Division|City))?)', text)
+    if city_match:
+        potential_city = city_match.group(1).strip()
+        potential_city = re.sub(r'\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec).*$', '', potential_city, flags=re.IGNORECASE).strip()
+        noise = ['Certified', 'Buyer', 'Verified', 'Purchase', 'READ', 'MORE',
+                 'Report', 'Abuse', 'Helpful', 'Permalink', 'Storage', 'Color',
+                 'Customer', 'Flipkart', 'Review', 'Rating', 'Seller']
+        if (potential_city and len(potential_city) > 2 and
+                not any(n.lower() in potential_city.lower() for n in noise)):
+            return potential_city
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Old PII chain vs single-pass scrubber")
+    parser.add_argument("--scale", type=int, default=1000, help="passes over the ~4k-review corpus")
+    args = parser.parse_args()
+
+    texts = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "2_dataset_final_folder", "*_before_name_clean.csv"))):
+        texts += [t for t in pd.read_csv(path)["text"] if isinstance(t, str)]
+    column = pd.Series(texts)
+    scrubber = PIIScrubber(clean_names)
+
+    def chain(text):
+        return strip_trailing_name(scrub_cleaner.clean(text)), extract_city(text)
+
+    old = [chain(t) for t in texts]
+    new = scrubber.scrub_many(texts)
+    same_text = sum(o[0] == n.text for o, n in zip(old, new))
+    same_city = sum(o[1] == n.city for o, n in zip(old, new))
+    print(f"{len(texts)} reviews: text identical to the chain for {same_text / len(texts):.1%}, "
+          f"city for {same_city / len(texts):.1%}; {sum(len(n.spans) for n in new)} spans removed")
+
+    def run(fn):
+        start = time.perf_counter()
+        for _ in range(args.scale):
+            fn()
+        return time.perf_counter() - start
+
+    total = len(texts) * args.scale
+    print(f"\nTiming {total:,} reviews ({args.scale}x the corpus)\n")
+    chain_s = run(lambda: [chain(t) for t in texts])
+    scrub_s = run(lambda: scrubber.scrub_many(texts))
+    batch_s = run(lambda: scrubber.scrub_series(column))
+    rows = [{"variant": name, "reviews_per_s": round(total / seconds), "speedup": round(chain_s / seconds, 2)}
+            for name, seconds in [("chain", chain_s), ("scrubber", scrub_s), ("batch", batch_s)]]
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
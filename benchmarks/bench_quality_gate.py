@@ -0,0 +1,112 @@
+"""
+bench_quality_gate.py
+=====================
+Time per million rows of the data-quality gate
+(2_dataset_final_folder/quality_gate.py) vs the same rules checked row by
+row.
+
+--rows raw final-CSV rows (all str, as read_csv gives them) are drawn from
+the real ones, so the summary banner, dateless and empty rows recur at
+their real rate, then checked two ways:
+
+  repeated texts : texts drawn as they are (few distinct values, many
+                   duplicates: the cheap case for per-value rules)
+  distinct texts : every text made unique (one rule evaluation per row:
+                   the worst case)
+
+  per-row loop   : each rule as a Python check on each row, a set of seen
+                   rows for duplicates
+  check          : quality_gate.check (the rule flags)
+  split          : quality_gate.split (flags, passed and quarantined frames,
+                   reasons and counts)
+
+Usage
+-----
+    python benchmarks/bench_quality_gate.py [--rows 1000000]
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DATASET_DIR = os.path.join(ROOT, "2_dataset_final_folder")
+sys.path.insert(0, DATASET_DIR)
+
+from quality_gate import HEADER_VALUES, NUMERIC_TEXT, QUARANTINE_RULES, SUMMARY_TEXT, SUMMARY_TITLE, check, split
+
+MONTHS = {m: i for i, m in enumerate(["jan", "feb", "mar", "apr", "may", "jun",
+                                      "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+
+def raw_rows(rows, seed=0):
+    """`rows` raw final-CSV rows drawn from the real ones"""
+    real = pd.concat([pd.read_csv(path, dtype=str, keep_default_na=False)
+                      for path in glob.glob(os.path.join(DATASET_DIR, "*.csv"))
+                      if not path.endswith("_before_name_clean.csv")], ignore_index=True)
+    pick = np.random.default_rng(seed).integers(0, len(real), rows)
+    return real.iloc[pick].reset_index(drop=True)
+
+
+def per_row(df):
+    """The gate's rules one row at a time; returns (rows quarantined, rows only flagged)"""
+    summary_text, summary_title = re.compile(SUMMARY_TEXT), re.compile(SUMMARY_TITLE)
+    numeric_text = re.compile(NUMERIC_TEXT)
+    seen, bad, flagged = set(), 0, 0
+    for row in df.itertuples(index=False):
+        text = row.text.strip()
+        try:
+            rating = float(row.rating)
+            rating_ok = 1 <= rating <= 5 and rating % 1 == 0
+        except ValueError:
+            rating_ok = False
+        parts = row.date.split()
+        date_ok = (len(parts) == 2 and parts[0].lower() in MONTHS and parts[1].isdigit()
+                   and 2000 <= int(parts[1]) <= 2100)
+        failed = (summary_text.fullmatch(text) or summary_title.fullmatch(row.title)
+                  or text.lower() in HEADER_VALUES or row.rating.strip().lower() == "rating"
+                  or not rating_ok or not text or tuple(row) in seen)
+        seen.add(tuple(row))
+        bad += bool(failed)
+        flagged += bool(not failed and (numeric_text.fullmatch(text) or not date_ok))
+    return bad, flagged
+
+
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized quality gate vs per-row checks")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="raw rows per run")
+    args = parser.parse_args()
+
+    repeated = raw_rows(args.rows)
+    distinct = repeated.assign(text=repeated["text"] + " #" + pd.Series(np.arange(args.rows)).astype(str))
+    results = []
+    for label, df in [("repeated texts", repeated), ("distinct texts", distinct)]:
+        (bad, flagged), loop_s = timed(per_row, df)
+        flags, check_s = timed(check, df)
+        (_, quarantined, _), split_s = timed(split, df)
+        quarantine = flags[QUARANTINE_RULES].any(axis=1)
+        assert int(quarantine.sum()) == len(quarantined) == bad
+        assert int((flags.any(axis=1) & ~quarantine).sum()) == flagged
+        for run, seconds in [("per-row loop", loop_s), ("check", check_s), ("split", split_s)]:
+            results.append({"data": label, "run": run, "s / 1M rows": seconds * 1e6 / args.rows,
+                            "speedup": loop_s / seconds, "quarantined": len(quarantined) if run != "per-row loop"
+                            else bad})
+
+    print(f"{args.rows:,} raw rows per run\n")
+    print(pd.DataFrame(results).round({"s / 1M rows": 3, "speedup": 1}).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
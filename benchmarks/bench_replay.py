@@ -0,0 +1,74 @@
+"""
+bench_replay.py
+===============
+Offline re-extraction from the raw page store, one process vs all cores.
+
+Synthetic Flipkart-like pages (see bench_extractor.py) are written to a
+scratch PageStore as if crawled, then FlipkartScraper.replay re-parses
+them with --processes 1 and with every core. Reports pages/second for each
+and whether both runs wrote the same CSV.
+
+Usage
+-----
+    python benchmarks/bench_replay.py [--pages 330] [--product iphone15]
+"""
+
+import argparse
+import filecmp
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.normpath(os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT, "1_data_scrapping"))
+
+from bench_extractor import synthetic_page
+from flipkart_scraper import FlipkartScraper
+from products import PRODUCTS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay throughput from the raw page store")
+    parser.add_argument("--pages", type=int, default=330, help="~10 reviews per page (330 ~ the iPhone 15 corpus)")
+    parser.add_argument("--product", default="iphone15", choices=sorted(PRODUCTS))
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            scraper = FlipkartScraper(args.product, workdir=workdir, state_dir=workdir)
+
+            start = time.perf_counter()
+            for page in range(1, args.pages + 1):
+                scraper.page_store.put(args.product, page, f"https://example.invalid/?page={page}",
+                                       synthetic_page(page))
+            store_s = time.perf_counter() - start
+
+            rows = []
+            for processes in (1, args.processes):
+                output = f"replay_{processes}.csv"
+                start = time.perf_counter()
+                reviews = scraper.replay(output, processes)
+                secs = time.perf_counter() - start
+                rows.append({"processes": processes, "pages": args.pages, "reviews": reviews,
+                             "seconds": round(secs, 2), "pages_per_s": round(args.pages / secs, 1)})
+            identical = filecmp.cmp("replay_1.csv", f"replay_{args.processes}.csv", shallow=False)
+        finally:
+            os.chdir(cwd)
+
+    print()
+    print(f"Stored {args.pages} pages in {store_s:.2f}s")
+    print(pd.DataFrame(rows).to_string(index=False))
+    print(f"\nSpeedup: {rows[0]['seconds'] / rows[1]['seconds']:.1f}x")
+    print(f"Identical output: {identical}")
+
+
+if __name__ == "__main__":
+    main()
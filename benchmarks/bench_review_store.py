@@ -0,0 +1,131 @@
+"""
+bench_review_store.py
+=====================
+On-disk size and load time of the final dataset as CSVs vs the columnar
+review store (2_dataset_final_folder/review_store.py).
+
+--rows synthetic reviews are drawn from the real ones (text, title), spread
+over the three devices and 24 months with random ratings, and written as
+final-format CSVs in a temporary directory. The store (Parquet partitions)
+is built from those CSVs, then:
+
+  csv          : pd.read_csv of every device file (what each stage does today),
+                 and the same plus typing as the store has it (ids, int8, months)
+  store, all   : every review column
+  store, rating: rating + month only (the forecast's needs)
+  store, 1 dev : rating + text of one device (one partition family)
+  scores       : comparison_results-style CSV (review columns repeated next to
+                 9 score columns) vs a score table keyed by review_id
+
+Usage
+-----
+    python benchmarks/bench_review_store.py [--rows 10000000]
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DATASET_DIR = os.path.join(ROOT, "2_dataset_final_folder")
+sys.path.insert(0, DATASET_DIR)
+
+from review_store import DEVICES, ReviewStore, build, directory_size, read_final_csv
+
+SCORE_COLUMNS = ["vader_compound", "vader_pred_rating", "bert_score", "bert_pred_rating",
+                 "wc_score", "wc_pred_rating"]
+LABEL_COLUMNS = ["vader_label", "bert_label", "wc_label"]
+
+
+def synthetic_csvs(directory, rows, seed=0):
+    """Final-format CSVs with `rows` reviews in total; returns {stem: path}"""
+    real = pd.concat([pd.read_csv(path, dtype=str, keep_default_na=False)
+                      for path in glob.glob(os.path.join(DATASET_DIR, "*.csv"))
+                      if not path.endswith("_before_name_clean.csv")])
+    rng = np.random.default_rng(seed)
+    months = pd.date_range("2024-03-01", periods=24, freq="MS").strftime("%b %Y").to_numpy()
+    sources = {}
+    for i, stem in enumerate(DEVICES):
+        n = rows // len(DEVICES) + (i < rows % len(DEVICES))
+        pick = rng.integers(0, len(real), n)
+        pd.DataFrame({
+            "rating": rng.integers(1, 6, n),
+            "text": real["text"].to_numpy()[pick],
+            "title": real["title"].to_numpy()[pick],
+            "date": months[rng.integers(0, len(months), n)],
+        }).to_csv(os.path.join(directory, f"{stem}.csv"), index=False)
+        sources[stem] = os.path.join(directory, f"{stem}.csv")
+    return sources
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV vs columnar review store")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="synthetic reviews in total")
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="review_store_")
+    try:
+        print(f"Writing {args.rows:,} synthetic reviews as CSV ...")
+        sources = synthetic_csvs(work, args.rows)
+        store_dir = os.path.join(work, "store")
+        _, build_s = timed(lambda: build(store_dir, sources))
+        store = ReviewStore(store_dir)
+        print(f"{store}, built in {build_s:.1f} s\n")
+
+        rows = []
+        csv_bytes = sum(os.path.getsize(path) for path in sources.values())
+        frames, seconds = timed(lambda: [pd.read_csv(path) for path in sources.values()])
+        del frames
+        rows.append({"load": "csv, all files", "seconds": seconds, "MB": csv_bytes / 1e6})
+        frames, seconds = timed(lambda: [read_final_csv(path, DEVICES[stem]) for stem, path in sources.items()])
+        del frames
+        rows.append({"load": "csv + typed columns", "seconds": seconds, "MB": csv_bytes / 1e6})
+        store_bytes = directory_size(store.root)
+        for label, kwargs in [("store, all columns", {}),
+                              ("store, rating + month", {"columns": ["rating", "month"]}),
+                              ("store, 1 device rating + text", {"columns": ["rating", "text"],
+                                                                 "devices": ["iPhone 16"]})]:
+            df, seconds = timed(lambda: store.read(**kwargs))
+            rows.append({"load": label, "seconds": seconds, "MB": store_bytes / 1e6, "rows": len(df)})
+            del df
+
+        # Per-review results: today's CSV repeats the review columns next to the scores
+        ids = store.read(["review_id", "device", "rating", "text"])
+        rng = np.random.default_rng(1)
+        scores = ids[["review_id"]].assign(**{c: rng.random(len(ids)) for c in SCORE_COLUMNS},
+                                           **{c: "Positive" for c in LABEL_COLUMNS})
+        results_csv = os.path.join(work, "comparison_results.csv")
+        pd.concat([ids.drop(columns="review_id").rename(columns={"text": "review_text"}),
+                   scores.drop(columns="review_id")], axis=1).to_csv(results_csv, index=False)
+        del ids
+        _, seconds = timed(lambda: pd.read_csv(results_csv))
+        rows.append({"load": "results csv (text repeated)", "seconds": seconds,
+                     "MB": os.path.getsize(results_csv) / 1e6, "rows": len(scores)})
+        store.write_scores("comparison", scores)
+        del scores
+        _, seconds = timed(lambda: store.read_scores("comparison"))
+        rows.append({"load": "score table by review_id", "seconds": seconds,
+                     "MB": directory_size(os.path.join(store_dir, "scores")) / 1e6, "rows": len(store)})
+
+        table = pd.DataFrame(rows).fillna({"rows": args.rows})  # the CSVs: every row, before the quality gate
+        table["rows"] = table["rows"].astype(int)
+        print(table.round({"seconds": 2, "MB": 1}).to_string(index=False))
+    finally:
+        shutil.rmtree(work)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+bench_scheduler.py
+==================
+Combined crawl throughput of crawl_scheduler.CrawlScheduler as the number of
+products crawled in one process grows, against the local mock server
+(mock_flipkart.py).
+
+Every product shares the host's one rate controller, started at --delay, so
+the host sees a single scraper's load however many products are crawled:
+pages/s should stay near one product's while the products share one
+keep-alive pool and hide each other's parse/save time. Each product count
+runs in a fresh child process with its own scratch directory.
+
+Reports, per product count: pages, pages/s, reviews/s, CPU ms per page,
+connections opened.
+
+Usage
+-----
+    python benchmarks/bench_scheduler.py                       # 1, 2 and 3 products, 30 pages each
+    python benchmarks/bench_scheduler.py --delay 0.2 0.3 --pages 20 --latency 0.05
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.normpath(os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT, "1_data_scrapping"))
+
+from bench_crawl import serve
+from mock_flipkart import add_mock_arguments
+
+
+def run_scheduler(url, n_products, workers, delay, max_pages):
+    """One scheduler run over the first n registered products; runs in its own process"""
+    from crawl_scheduler import CrawlScheduler
+    from page_store import PageStore
+    from products import PRODUCTS, Product
+    from urllib3.connectionpool import HTTPConnectionPool
+
+    # Count new TCP connections: a shared keep-alive pool should open few
+    opened = [0]
+    new_conn = HTTPConnectionPool._new_conn
+
+    def counting_new_conn(pool):
+        opened[0] += 1
+        return new_conn(pool)
+
+    HTTPConnectionPool._new_conn = counting_new_conn
+
+    products = [Product(**dict(vars(p), url=url, max_pages=max_pages)) for p in list(PRODUCTS.values())[:n_products]]
+    with tempfile.TemporaryDirectory() as workdir:
+        scheduler = CrawlScheduler(products, workers=workers, delay=delay,
+                                   workdir=workdir, checkpoint_path=os.path.join(workdir, "crawl_state.sqlite"),
+                                   page_store=PageStore(os.path.join(workdir, "page_store")))
+        cpu_start = time.process_time()
+        crawls = scheduler.run(status_every=3600, out=open(os.devnull, "w"))
+        cpu = time.process_time() - cpu_start
+        progress = [crawl.progress() for crawl in crawls]
+        errors = [str(crawl.error) for crawl in crawls if crawl.error]
+        for crawl in crawls:
+            crawl.scraper.checkpoint.close()
+
+    pages = sum(p for p, _ in progress)
+    reviews = sum(r for _, r in progress)
+    wall = scheduler.seconds
+    return {
+        "products": n_products,
+        "pages": pages,
+        "reviews": reviews,
+        "seconds": round(wall, 2),
+        "pages_per_s": round(pages / wall, 2) if wall else 0.0,
+        "reviews_per_s": round(reviews / wall, 1) if wall else 0.0,
+        "cpu_ms_per_page": round(cpu * 1000 / pages, 1) if pages else None,
+        "connections": opened[0],
+        "errors": "; ".join(errors) or "-",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduler throughput vs number of products")
+    parser.add_argument("--products", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--workers", type=int, default=1, help="pages in flight per product")
+    parser.add_argument("--delay", type=float, nargs=2, default=[0.1, 0.15], metavar=("MIN", "MAX"),
+                        help="starting request spacing of the host's shared rate controller")
+    add_mock_arguments(parser)
+    parser.set_defaults(pages=30)
+    args = parser.parse_args()
+
+    url_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(args, url_queue), daemon=True)
+    server.start()
+    url = url_queue.get(timeout=30)
+
+    rows = []
+    try:
+        for n in args.products:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                rows.append(pool.submit(run_scheduler, url, n, args.workers, tuple(args.delay),
+                                        args.pages + 10).result())
+    finally:
+        server.terminate()
+        server.join()
+
+    print(f"Mock pages: {args.pages}, latency: {args.latency}s, delay: {args.delay[0]}-{args.delay[1]}s, "
+          "one shared host budget\n")
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
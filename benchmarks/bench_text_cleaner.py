@@ -0,0 +1,113 @@
+"""
+bench_text_cleaner.py
+=====================
+Throughput of the scraper text cleaning, old vs compiled pipeline.
+
+  legacy      : the former SimpleFlipkartScraper.clean_text (string patterns, re.sub per rule)
+  compiled    : text_cleaner.scrub_text, one call per field
+  batch list  : scrub_cleaner.clean_many over all fields at once
+  batch series: scrub_cleaner.clean_series (pandas .str.replace per rule)
+
+Every title/review text found in the repo's CSVs is used as input, and the
+script first checks that all variants produce exactly the legacy output.
+
+Usage
+-----
+    python benchmarks/bench_text_cleaner.py [--repeat 3]
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "1_data_scrapping"))
+
+from text_cleaner import scrub_cleaner, scrub_text
+
+CSV_GLOBS = [
+    os.path.join(ROOT, "1_data_scrapping", "*", "*.csv"),
+    os.path.join(ROOT, "2_dataset_final_folder", "*.csv"),
+]
+TEXT_COLUMNS = ("title", "review_text", "text")
+
+
+def legacy_clean_text(text, remove_dates=True):
+    """The iPhone 16 scraper's clean_text before the compiled pipeline"""
+    text = re.sub(r'[^\x00-\x7F]+', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    text = re.sub(r'\b\d{10,}\b', '', text)
+    text = re.sub(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[,\s]+\d{4}', '', text, flags=re.IGNORECASE)
+    if remove_dates:
+        text = re.sub(r'\d+\s*(month|months|week|weeks|day|days|year|years|hour|hours)\s*ago', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}\s*,\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s+(?:District|Division|City))?', '', text)
+    text = re.sub(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\b', '', text)
+    text = re.sub(r'\b[A-Z][A-Z]+(?:\s+[A-Z]+)*\b', '', text)
+    text = re.sub(r',\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s+(?:District|Division|City))?\s*$', '', text)
+    text = re.sub(r'\b(by|reviewed by|posted by|from)\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'Flipkart\s+Customer', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\s*,\s*,\s*', ', ', text)
+    text = re.sub(r',\s*$', '', text)
+    text = re.sub(r'^\s*,', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def load_texts():
+    texts = []
+    for pattern in CSV_GLOBS:
+        for path in sorted(glob.glob(pattern)):
+            df = pd.read_csv(path)
+            for col in TEXT_COLUMNS:
+                if col in df.columns:
+                    texts.extend(v for v in df[col].tolist() if isinstance(v, str))
+    return texts
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Old vs compiled text cleaning")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = load_texts()
+    print(f"Inputs: {len(texts)} fields from the repo CSVs\n")
+
+    expected, legacy_s = timed(lambda: [legacy_clean_text(t) for t in texts], args.repeat)
+    variants = {
+        "compiled": lambda: [scrub_text(t) for t in texts],
+        "batch list": lambda: scrub_cleaner.clean_many(texts),
+        "batch series": lambda: scrub_cleaner.clean_series(pd.Series(texts)).tolist(),
+    }
+
+    rows = [{"variant": "legacy", "fields_per_s": round(len(texts) / legacy_s), "speedup": 1.0, "matches_legacy": True}]
+    for name, fn in variants.items():
+        out, secs = timed(fn, args.repeat)
+        rows.append({
+            "variant": name,
+            "fields_per_s": round(len(texts) / secs),
+            "speedup": round(legacy_s / secs, 2),
+            "matches_legacy": out == expected,
+        })
+
+    keep_relative_ok = all(legacy_clean_text(t, False) == scrub_text(t, False) for t in texts)
+    print(pd.DataFrame(rows).to_string(index=False))
+    print(f"\nremove_dates=False also matches legacy: {keep_relative_ok}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+mock_flipkart.py
+================
+Local stand-in for Flipkart's review pages, for exercising and benchmarking
+the scrapers without touching flipkart.com.
+
+Any path is served; the page number comes from the ``page`` query parameter
+(default 1). Pages are either saved HTML fixtures (page N = Nth file in sorted
+order) or synthetic pages from bench_extractor.synthetic_page with a
+"<ratings> Ratings & <reviews> Reviews" header. Past the last page the last
+page is served again, as Flipkart does.
+
+Knobs:
+  --latency / --jitter   seconds added before every response (uniform jitter)
+  --error-rate           fraction of responses that are HTTP 500
+  --burst-every/-len     every N requests, the next K get 429 + Retry-After
+  --burst-status         status of those responses instead of 429 (403: an anti-bot block)
+  --state                embed reviews as window.__INITIAL_STATE__ JSON too
+
+Usage
+-----
+    python benchmarks/mock_flipkart.py --port 8765 --pages 50 --latency 0.05
+    python benchmarks/mock_flipkart.py --fixtures "pages/*.html"
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_extractor import WORDS, synthetic_page
+
+REVIEWS_PER_PAGE = 10
+
+
+def state_script(page):
+    """window.__INITIAL_STATE__ with the same kind of reviews the synthetic page shows"""
+    rng = random.Random(page)
+    reviews = []
+    for i in range(REVIEWS_PER_PAGE):
+        reviews.append({
+            "type": "ReviewValue",
+            "id": f"R{page}-{i}",
+            "rating": rng.randint(1, 5),
+            "title": " ".join(rng.choices(WORDS, k=2)).capitalize() + f" pick {i}",
+            "text": " ".join(rng.choices(WORDS, k=rng.randint(15, 60))),
+            "created": "Mar, 2025",
+            "location": {"city": "Pune"},
+        })
+    state = {"pageDataV4": {"page": {"data": {"reviews": reviews}}}}
+    return f"<script>window.__INITIAL_STATE__ = {json.dumps(state)};</script>"
+
+
+class MockConfig:
+    def __init__(self, pages=50, latency=0.0, jitter=0.0, error_rate=0.0,
+                 burst_every=0, burst_len=0, retry_after=1, state=False, fixtures=None, burst_status=429):
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_len = burst_len
+        self.retry_after = retry_after
+        self.burst_status = burst_status
+        self.state = state
+        self.fixtures = sorted(glob.glob(fixtures)) if fixtures else []
+        if self.fixtures:
+            self.pages = len(self.fixtures)
+
+
+class MockFlipkartServer:
+    """Threaded mock server; use start()/stop() or as a context manager"""
+
+    def __init__(self, config, host="127.0.0.1", port=0):
+        self.config = config
+        self.requests = 0
+        self.status_counts = {}
+        self._lock = threading.Lock()
+        self._cache = {}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/product-reviews/itmMOCK?pid=MOCK&marketplace=FLIPKART"
+
+    def page_html(self, page):
+        page = min(max(page, 1), self.config.pages)
+        html = self._cache.get(page)
+        if html is None:
+            if self.config.fixtures:
+                with open(self.config.fixtures[page - 1], encoding="utf-8", errors="replace") as f:
+                    html = f.read()
+            else:
+                total = self.config.pages * REVIEWS_PER_PAGE
+                header = (f"<div><span>{total * 31:,} Ratings &amp; </span>"
+                          f"<span>{total:,} Reviews</span></div>")
+                html = synthetic_page(page).replace("<body>", "<body>" + header, 1)
+                if self.config.state:
+                    html = html.replace("</body>", state_script(page) + "</body>", 1)
+            self._cache[page] = html
+        return html
+
+    def _next_status(self):
+        """Decide this request's status: burst (429 by default), random 500, or 200"""
+        config = self.config
+        with self._lock:
+            self.requests += 1
+            n = self.requests
+        if config.burst_every and config.burst_len and n % config.burst_every < config.burst_len and n > config.burst_len:
+            return config.burst_status
+        if config.error_rate and random.random() < config.error_rate:
+            return 500
+        return 200
+
+    def _count(self, status):
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+
+            def do_GET(self):
+                config = server.config
+                delay = config.latency + random.uniform(-config.jitter, config.jitter)
+                if delay > 0:
+                    time.sleep(delay)
+
+                status = server._next_status()
+                server._count(status)
+                if status == 200:
+                    query = parse_qs(urlparse(self.path).query)
+                    try:
+                        page = int(query.get("page", ["1"])[0])
+                    except ValueError:
+                        page = 1
+                    body = server.page_html(page).encode("utf-8")
+                else:
+                    body = b"<html><body>Try again later</body></html>"
+
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if status == config.burst_status:
+                    self.send_header("Retry-After", str(config.retry_after))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_mock_arguments(parser):
+    parser.add_argument("--pages", type=int, default=50, help="review pages before the last one repeats")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+- uniform jitter on --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP 500 responses")
+    parser.add_argument("--burst-every", type=int, default=0, help="start a burst (429 by default) every N requests")
+    parser.add_argument("--burst-len", type=int, default=0, help="burst responses per burst")
+    parser.add_argument("--burst-status", type=int, default=429, help="status of the burst responses (e.g. 403)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on burst responses")
+    parser.add_argument("--state", action="store_true", help="embed the JSON state as well as the DOM")
+    parser.add_argument("--fixtures", help="glob of saved review-page HTML files to serve instead")
+
+
+def config_from_args(args):
+    return MockConfig(pages=args.pages, latency=args.latency, jitter=args.jitter,
+                      error_rate=args.error_rate, burst_every=args.burst_every,
+                      burst_len=args.burst_len, retry_after=args.retry_after, burst_status=args.burst_status,
+                      state=args.state, fixtures=args.fixtures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of Flipkart review pages")
+    parser.add_argument("--port", type=int, default=8765)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockFlipkartServer(config_from_args(args), port=args.port)
+    print(f"Serving {server.config.pages} review pages at {server.url}&page=N  (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n{server.requests} requests served: {server.status_counts}")
+
+
+if __name__ == "__main__":
+    main()